@@ -300,9 +300,9 @@ export default function DashboardPage() {
                   </Badge>
                 </div>
               ))}
-              {tasks.length > 5 && (
+              {totalTasks > 5 && (
                 <p className="text-sm text-muted-foreground">
-                  And {tasks.length - 5} more tasks...
+                  And {totalTasks - 5} more tasks...
                 </p>
               )}
             </div>
@@ -7,6 +7,8 @@ const useNotificationStore = create(
       notifications: [], // Array of notification objects
       isConnected: false,
       error: null,
+      lastEventId: null, // Resume point sent on reconnect
+      resyncRequired: false, // Set when missed events are gone; refetch, then clear
 
       // Add a new notification
       addNotification: (notification) =>
@@ -23,13 +25,23 @@ const useNotificationStore = create(
       // Set error
       setError: (error) => set({ error }),
 
-      // Connect to WebSocket
-      connect: (userId) => {
+      // Call after refetching state in response to resyncRequired
+      clearResync: () => set({ resyncRequired: false }),
+
+      // Connect to WebSocket (the access token selects the user's topics)
+      connect: (userId, token) => {
         if (get().isConnected) return; // Already connected
 
+        // Resume after the last event seen so the server replays what we missed
+        const { lastEventId } = get();
+        const resume = lastEventId
+          ? `&last_event_id=${encodeURIComponent(lastEventId)}`
+          : "";
         const wsUrl = `${
           process.env.NEXT_PUBLIC_WS_URL || ""
-        }/ws/notifications?user_id=${userId}`;
+        }/ws/notifications/${userId}?token=${encodeURIComponent(
+          token
+        )}&batch=1${resume}`;
         const ws = new WebSocket(wsUrl);
 
         ws.onopen = () => {
@@ -40,7 +52,16 @@ const useNotificationStore = create(
         ws.onmessage = (event) => {
           try {
             const data = JSON.parse(event.data);
-            get().addNotification(data); // Add to store
+            // Batched frames carry several events, already collapsed per task
+            const events = data.type === "batch" ? data.events : [data];
+            events.forEach((item) => {
+              if (item.type === "resync_required") {
+                set({ resyncRequired: true });
+                return;
+              }
+              if (item.event_id) set({ lastEventId: item.event_id });
+              get().addNotification(item); // Add to store
+            });
           } catch (err) {
             console.error("Failed to parse WebSocket message:", err);
           }
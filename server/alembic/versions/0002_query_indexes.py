@@ -0,0 +1,51 @@
+"""secondary indexes for service-layer query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+Covers the filters used by TaskService/ProjectService and the
+(created_at, id) keyset used by cursor pagination. On large existing
+tables consider creating these CONCURRENTLY by hand before upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Project board / progress: WHERE project_id = ? [AND status = ?]
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'])
+    # Member task lists and workload: WHERE assigned_to = ? [AND status = ?]
+    op.create_index(
+        'ix_tasks_assigned_to_status', 'tasks', ['assigned_to', 'status'],
+        postgresql_where=sa.text('assigned_to IS NOT NULL'),
+    )
+    # Member task lists in keyset order
+    op.create_index(
+        'ix_tasks_assigned_to_created_at_id', 'tasks', ['assigned_to', 'created_at', 'id'],
+        postgresql_where=sa.text('assigned_to IS NOT NULL'),
+    )
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'])
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'])
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+    # Project.members.any(User.id == ?) probes by user_id; the PK leads with project_id
+    op.create_index('ix_project_members_user_id', 'project_members', ['user_id', 'project_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_members_user_id', table_name='project_members')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_status', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
@@ -0,0 +1,64 @@
+"""denormalized task counter tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status = postgresql.ENUM('todo', 'in_progress', 'done', name='taskstatus', create_type=False)
+task_priority = postgresql.ENUM('low', 'medium', 'high', name='taskpriority', create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_counts_project_status',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('status', task_status, primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'task_counts_assignee_status',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('status', task_status, primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'task_counts_assignee_priority',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('priority', task_priority, primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+
+    # Backfill from existing tasks
+    op.execute(
+        "INSERT INTO task_counts_project_status (project_id, status, count) "
+        "SELECT project_id, COALESCE(status, 'todo'), count(*) FROM tasks GROUP BY 1, 2"
+    )
+    op.execute(
+        "INSERT INTO task_counts_assignee_status (user_id, status, count) "
+        "SELECT assigned_to, COALESCE(status, 'todo'), count(*) FROM tasks "
+        "WHERE assigned_to IS NOT NULL GROUP BY 1, 2"
+    )
+    op.execute(
+        "INSERT INTO task_counts_assignee_priority (user_id, priority, count) "
+        "SELECT assigned_to, COALESCE(priority, 'medium'), count(*) FROM tasks "
+        "WHERE assigned_to IS NOT NULL GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_counts_assignee_priority')
+    op.drop_table('task_counts_assignee_status')
+    op.drop_table('task_counts_project_status')
@@ -0,0 +1,89 @@
+"""monthly-partitioned activity log
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions from the oldest existing row (or this month) through
+# three months ahead; later ones are created by the activity log writer.
+CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    first_day date := date_trunc('month', LEAST(
+        (SELECT min("timestamp") FROM activity_logs_legacy), now()
+    ) AT TIME ZONE 'UTC')::date;
+    last_day date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+BEGIN
+    WHILE first_day <= last_day LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF activity_logs FOR VALUES FROM (%L) TO (%L)',
+            'activity_logs_y' || to_char(first_day, 'YYYY"m"MM'),
+            first_day::text || ' 00:00:00+00',
+            (first_day + interval '1 month')::date::text || ' 00:00:00+00'
+        );
+        first_day := (first_day + interval '1 month')::date;
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    op.rename_table('activity_logs', 'activity_logs_legacy')
+    # Free the primary key's index name for the new table
+    op.execute("ALTER INDEX activity_logs_pkey RENAME TO activity_logs_legacy_pkey")
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('entity_type', sa.String()),
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True)),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True)),
+        sa.Column('details', postgresql.JSONB()),
+        sa.PrimaryKeyConstraint('id', 'timestamp'),
+        postgresql_partition_by='RANGE (timestamp)',
+    )
+    op.create_index('ix_activity_logs_user_id_timestamp', 'activity_logs', ['user_id', 'timestamp'])
+    op.create_index('ix_activity_logs_project_id_timestamp', 'activity_logs', ['project_id', 'timestamp'])
+    op.create_index('ix_activity_logs_entity_id_timestamp', 'activity_logs', ['entity_id', 'timestamp'])
+    # Catches rows outside every monthly partition so inserts never fail
+    op.execute("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT")
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute(
+        "INSERT INTO activity_logs (id, \"timestamp\", user_id, action) "
+        "SELECT id, COALESCE(\"timestamp\", now()), user_id, action FROM activity_logs_legacy"
+    )
+    op.drop_table('activity_logs_legacy')
+
+
+def downgrade() -> None:
+    op.rename_table('activity_logs', 'activity_logs_partitioned')
+    op.execute("ALTER INDEX activity_logs_pkey RENAME TO activity_logs_partitioned_pkey")
+    op.create_table(
+        'activity_logs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True)),
+    )
+    op.execute(
+        "INSERT INTO activity_logs (id, user_id, action, \"timestamp\") "
+        "SELECT l.id, l.user_id, l.action, l.\"timestamp\" FROM activity_logs_partitioned l "
+        "JOIN users u ON u.id = l.user_id"
+    )
+    # Dropping the parent drops every partition
+    op.drop_table('activity_logs_partitioned')
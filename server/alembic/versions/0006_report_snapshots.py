@@ -0,0 +1,59 @@
+"""task status transition times and daily report snapshots
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_status = postgresql.ENUM('todo', 'in_progress', 'done', name='taskstatus', create_type=False)
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    # Best estimate for existing tasks: the last update is when they reached
+    # their current status. Done tasks have no known start.
+    op.execute("UPDATE tasks SET completed_at = COALESCE(updated_at, created_at) WHERE status = 'done'")
+    op.execute("UPDATE tasks SET started_at = COALESCE(updated_at, created_at) WHERE status = 'in_progress'")
+    op.create_index(
+        'ix_tasks_completed_at', 'tasks', ['completed_at'],
+        postgresql_where=sa.text('completed_at IS NOT NULL'),
+    )
+
+    op.create_table(
+        'report_project_status_daily',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('status', task_status, primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        'report_assignee_cycle_daily',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('completed', sa.Integer(), nullable=False),
+        sa.Column('cycle_seconds', sa.Float(), nullable=False),
+        sa.Column('active_completed', sa.Integer(), nullable=False),
+        sa.Column('active_seconds', sa.Float(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('report_assignee_cycle_daily')
+    op.drop_table('report_project_status_daily')
+    op.drop_index('ix_tasks_completed_at', table_name='tasks')
+    op.drop_column('tasks', 'completed_at')
+    op.drop_column('tasks', 'started_at')
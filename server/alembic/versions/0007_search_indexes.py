@@ -0,0 +1,61 @@
+"""full-text search documents and trigram indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match the Computed() expressions on Task and Project
+TASK_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+PROJECT_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+TRIGRAM_INDEXES = [
+    ('ix_tasks_title_trgm', 'tasks', 'title'),
+    ('ix_projects_name_trgm', 'projects', 'name'),
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Stored generated columns: filled for existing rows here, then kept
+    # current by Postgres on every write
+    op.add_column('tasks', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(TASK_DOCUMENT, persisted=True)
+    ))
+    op.add_column('projects', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(PROJECT_DOCUMENT, persisted=True)
+    ))
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_projects_search_vector', 'projects', ['search_vector'], postgresql_using='gin')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(name, table, [column], postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_index('ix_projects_search_vector', table_name='projects')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('projects', 'search_vector')
+    op.drop_column('tasks', 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it
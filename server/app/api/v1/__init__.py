@@ -2,7 +2,7 @@ from fastapi import APIRouter
 
 router = APIRouter()
 
-from . import auth, users, projects, tasks, reports, dashboard
+from . import auth, users, projects, tasks, reports, dashboard, search
 
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(users.router, prefix="/users", tags=["users"])
@@ -10,3 +10,4 @@ router.include_router(projects.router, prefix="/projects", tags=["projects"])
 router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 router.include_router(reports.router, prefix="/reports", tags=["reports"])
 router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+router.include_router(search.router, prefix="/search", tags=["search"])
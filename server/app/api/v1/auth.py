@@ -1,9 +1,13 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.database import get_db
 from app.schemas.auth import UserCreate, UserLogin, Token
 from app.services.auth_service import AuthService
+from app.core.security import decode_token
+from app.core.token_cache import token_cache
 
 router = APIRouter()
 
@@ -53,8 +57,16 @@ async def refresh_token( request : Request,response : Response, db: AsyncSession
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-async def logout():
-    """Logout user by clearing the refresh token cookie."""
+async def logout(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+):
+    """Logout user by revoking the presented tokens and clearing the refresh token cookie."""
+    tokens = [credentials.credentials if credentials else None, request.cookies.get("refresh_token")]
+    for token in filter(None, tokens):
+        payload = decode_token(token)
+        if payload and payload.get("id") and payload.get("exp"):
+            await token_cache.revoke_token(token, payload)
     response = Response(status_code=status.HTTP_204_NO_CONTENT)
     response.delete_cookie(
     key="refresh_token",
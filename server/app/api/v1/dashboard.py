@@ -1,15 +1,14 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
 from app.models.user import User
 from app.services.dashboard_service import DashboardService
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, get_read_db
 
 router = APIRouter()
 
 @router.get("/")
 async def get_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get dashboard data for the current user."""
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.project import (
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectProgressRequest,
+    ProjectMembersRequest, ProjectMembersAddResult, ProjectMembersRemoveResult
+)
+from app.schemas.report import ProjectProgressReport
+from app.schemas.pagination import CursorPage
 from app.services.project_service import ProjectService
-from app.dependencies import get_current_user, get_admin_user
+from app.services.task_service import TaskService
+from app.core.pagination import next_cursor
+from app.core.cache import response_cache
+from app.core.export import EXPORT_MEDIA_TYPES
+from app.dependencies import get_current_user, get_admin_user, get_read_db, read_session_factory
 
 router = APIRouter()
 
@@ -24,35 +34,61 @@ async def create_project(
     return project
 
 
-@router.get("/", response_model=List[ProjectResponse])
+@router.get("/", response_model=Union[List[ProjectResponse], CursorPage[ProjectResponse]])
 async def list_projects(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status_filter: Optional[str] = None,
     query: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List projects: Users see only their projects, Admins see all."""
-    projects = await ProjectService.get_projects(
-        db,
-        current_user=current_user,
-        skip=skip,
-        limit=limit,
-        status=status_filter,
-        query=query
-    )
-    return projects
+    """List projects: Users see only their projects, Admins see all.
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination
+    and returns `{items, next_cursor}`; otherwise `skip`/`limit` apply.
+    """
+    async def load():
+        projects = await ProjectService.get_projects(
+            db,
+            current_user=current_user,
+            skip=skip,
+            limit=limit,
+            status=status_filter,
+            query=query,
+            cursor=cursor
+        )
+        if cursor is not None:
+            return CursorPage[ProjectResponse](items=projects, next_cursor=next_cursor(projects, limit))
+        return projects
+
+    params = {"skip": skip, "limit": limit, "cursor": cursor, "status": status_filter, "query": query}
+    return await response_cache.get_or_set("projects", current_user, params, load, tags=["projects"])
+
+
+@router.post("/progress", response_model=List[ProjectProgressReport])
+async def get_projects_progress(
+    request: ProjectProgressRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get progress for many projects at once; inaccessible projects are omitted."""
+    return await ProjectService.get_projects_progress(db, request.project_ids, current_user)
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get project details: Users can only access their projects, Admins access all."""
-    project = await ProjectService.get_project(db, project_id, current_user)
+    project = await response_cache.get_or_set(
+        "project", current_user, {"project_id": project_id},
+        lambda: ProjectService.get_project(db, project_id, current_user),
+        tags=[f"project:{project_id}"]
+    )
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,7 +133,7 @@ async def delete_project(
 @router.get("/{project_id}/progress")
 async def get_project_progress(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get project progress: Users can only access their projects, Admins access all."""
@@ -110,6 +146,65 @@ async def get_project_progress(
     return progress
 
 
+@router.get("/{project_id}/export")
+async def export_project_tasks(
+    project_id: UUID,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the project's tasks as NDJSON (default) or CSV.
+
+    Users can only export their projects and, as in the task list, only
+    the tasks assigned to them; Admins export everything.
+    """
+    if not await ProjectService.get_project(db, project_id, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found or access denied"
+        )
+    factory = await read_session_factory(current_user)
+    return StreamingResponse(
+        TaskService.export_tasks(factory, current_user, format, project_id=project_id),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.{format}"'}
+    )
+
+
+@router.post("/{project_id}/members", response_model=ProjectMembersAddResult)
+async def add_members_to_project(
+    project_id: UUID,
+    request: ProjectMembersRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Add many members to a project in one statement (Admin only)."""
+    result = await ProjectService.add_members(db, project_id, request.user_ids, current_user)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    return result
+
+
+@router.post("/{project_id}/members/remove", response_model=ProjectMembersRemoveResult)
+async def remove_members_from_project(
+    project_id: UUID,
+    request: ProjectMembersRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Remove many members from a project in one statement (Admin only)."""
+    result = await ProjectService.remove_members(db, project_id, request.user_ids, current_user)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    return result
+
+
 @router.post("/{project_id}/members/{user_id}", status_code=status.HTTP_201_CREATED)
 async def add_member_to_project(
     project_id: UUID,
@@ -148,9 +243,13 @@ async def remove_member_from_project(
 async def get_project_members(
     project_id: UUID,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get members of a project with optional search (Admin or project member)."""
-    members = await ProjectService.get_project_members(db, project_id, current_user, search)
+    members = await response_cache.get_or_set(
+        "project_members", current_user, {"project_id": project_id, "search": search},
+        lambda: ProjectService.get_project_members(db, project_id, current_user, search),
+        tags=[f"project:{project_id}"]
+    )
     return members
\ No newline at end of file
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, case
+from sqlalchemy import select, func
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from app.database import get_db
+
 from app.models.user import User
-from app.models.project import Project
-from app.models.task import Task
-from app.schemas.report import ProjectProgressReport, TeamPerformanceReport, WorkloadReport
+from app.models.task_counter import AssigneeStatusCount, AssigneePriorityCount
+from app.schemas.report import (
+    ProjectProgressReport, TeamPerformanceReport, WorkloadReport, BurndownReport, CycleTimeReport, SnapshotResult
+)
 from app.services.project_service import ProjectService
-from app.dependencies import get_current_user, get_admin_user
+from app.services.report_service import ReportService
+from app.dependencies import get_current_user, get_admin_user, get_read_db
 
 router = APIRouter()
 
@@ -18,46 +21,76 @@ router = APIRouter()
 @router.get("/project/{project_id}", response_model=ProjectProgressReport)
 async def get_project_progress(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get project progress report."""
-    # Check if project exists
-    project = await ProjectService.get_project(db, project_id, current_user)
-    if not project:
+    progress = await ProjectService.get_project_progress(db, project_id, current_user)
+    if not progress:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
-    
-    # Get progress data
-    progress = await ProjectService.get_project_progress(db, project_id, current_user)
-    
-    return {
-        "project_id": project_id,
-        "project_name": project.name,
-        **progress
-    }
+    return progress
+
+
+@router.get("/project/{project_id}/burndown", response_model=BurndownReport)
+async def get_project_burndown(
+    project_id: UUID,
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get daily task counts by status for burndown and cumulative-flow charts."""
+    burndown = await ReportService.get_burndown(db, project_id, current_user, days)
+    if not burndown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    return burndown
+
+
+@router.get("/cycle-time", response_model=List[CycleTimeReport])
+async def get_cycle_time(
+    days: int = Query(30, ge=1, le=365),
+    project_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get average cycle time per assignee (admins see everyone, others themselves)."""
+    return await ReportService.get_cycle_times(db, current_user, days, project_id)
+
+
+@router.post("/snapshots", response_model=SnapshotResult)
+async def take_report_snapshot(
+    cycle_days: int = Query(2, ge=1, le=365),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """Take today's report snapshot now (Admin only)."""
+    return await ReportService.take_snapshot(db, cycle_days)
 
 
 @router.get("/team-performance", response_model=List[TeamPerformanceReport])
 async def get_team_performance(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get team performance report (Admin only)."""
-    # Get all users with their task counts
+    # Get all users with their task counts from the per-(assignee, status) counters
+    count = AssigneeStatusCount.count
     result = await db.execute(
         select(
             User.id,
             User.name,
             User.email,
-            func.count(Task.id).label("total_tasks"),
-            func.sum(case((Task.status == "done", 1), else_=0)).label("completed_tasks"),
-            func.sum(case((Task.status == "in_progress", 1), else_=0)).label("in_progress_tasks"),
-            func.sum(case((Task.status == "todo", 1), else_=0)).label("todo_tasks")
+            func.sum(count).label("total_tasks"),
+            func.sum(count).filter(AssigneeStatusCount.status == "done").label("completed_tasks"),
+            func.sum(count).filter(AssigneeStatusCount.status == "in_progress").label("in_progress_tasks"),
+            func.sum(count).filter(AssigneeStatusCount.status == "todo").label("todo_tasks")
         )
-        .outerjoin(Task, User.id == Task.assigned_to)
+        .outerjoin(AssigneeStatusCount, User.id == AssigneeStatusCount.user_id)
         .group_by(User.id)
     )
     
@@ -84,21 +117,22 @@ async def get_team_performance(
 
 @router.get("/workload", response_model=List[WorkloadReport])
 async def get_workload_distribution(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get workload distribution report (Admin only)."""
-    # Get task distribution by user
+    # Get task distribution by user from the per-(assignee, priority) counters
+    count = AssigneePriorityCount.count
     result = await db.execute(
         select(
             User.id,
             User.name,
-            func.count(Task.id).label("assigned_tasks"),
-            func.sum(case((Task.priority == "high", 1), else_=0)).label("high_priority"),
-            func.sum(case((Task.priority == "medium", 1), else_=0)).label("medium_priority"),
-            func.sum(case((Task.priority == "low", 1), else_=0)).label("low_priority")
+            func.sum(count).label("assigned_tasks"),
+            func.sum(count).filter(AssigneePriorityCount.priority == "high").label("high_priority"),
+            func.sum(count).filter(AssigneePriorityCount.priority == "medium").label("medium_priority"),
+            func.sum(count).filter(AssigneePriorityCount.priority == "low").label("low_priority")
         )
-        .outerjoin(Task, User.id == Task.assigned_to)
+        .outerjoin(AssigneePriorityCount, User.id == AssigneePriorityCount.user_id)
         .group_by(User.id)
     )
     
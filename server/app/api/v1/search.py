@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.models.user import User
+from app.schemas.search import SearchResult
+from app.schemas.pagination import CursorPage
+from app.services.search_service import SearchService
+from app.core.pagination import next_rank_cursor
+from app.dependencies import get_current_user, get_read_db
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CursorPage[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(task|project|user)$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search tasks, projects and users, best matches first.
+
+    Only what the caller can see is returned. Pass `next_cursor` back as
+    `cursor` for the next page.
+    """
+    results = await SearchService.search(db, current_user, q, type, limit, cursor)
+    return CursorPage[SearchResult](items=results, next_cursor=next_rank_cursor(results, limit))
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskMoveRequest
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskMoveRequest,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkResult
+)
+from app.schemas.pagination import CursorPage
 from app.services.task_service import TaskService
-from app.dependencies import get_current_user
+from app.core.pagination import next_cursor
+from app.core.cache import response_cache
+from app.core.export import EXPORT_MEDIA_TYPES
+from app.dependencies import get_current_user, get_read_db, read_session_factory
 
 router = APIRouter()
 
@@ -24,41 +32,112 @@ async def create_task(
     return task
 
 
-@router.get("/", response_model=List[TaskResponse])
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_create_tasks(
+    data: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create up to 500 tasks in one transaction; invalid items are returned in `errors`."""
+    return await TaskService.bulk_create_tasks(db, data.tasks, current_user)
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    data: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update or move up to 500 tasks in one transaction; invalid items are returned in `errors`."""
+    return await TaskService.bulk_update_tasks(db, data.tasks, current_user)
+
+
+@router.get("/", response_model=Union[List[TaskResponse], CursorPage[TaskResponse]])
 async def list_tasks(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     project_id: Optional[str] = None,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     assigned_to: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List tasks: Users see only assigned tasks, Admins see all."""
+    """List tasks: Users see only assigned tasks, Admins see all.
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination
+    and returns `{items, next_cursor}`; otherwise `skip`/`limit` apply.
+    """
     project_uuid = UUID(project_id) if project_id else None
     assigned_uuid = UUID(assigned_to) if assigned_to else None
-    tasks = await TaskService.get_tasks(
-        db,
-        current_user=current_user,
-        skip=skip,
-        limit=limit,
-        project_id=project_uuid,
-        status=status,
-        priority=priority,
-        assigned_to=assigned_uuid
+
+    async def load():
+        tasks = await TaskService.get_tasks(
+            db,
+            current_user=current_user,
+            skip=skip,
+            limit=limit,
+            project_id=project_uuid,
+            status=status,
+            priority=priority,
+            assigned_to=assigned_uuid,
+            cursor=cursor
+        )
+        if cursor is not None:
+            return CursorPage[TaskResponse](items=tasks, next_cursor=next_cursor(tasks, limit))
+        return tasks
+
+    # Tag by the narrowest set of writes that can change this listing
+    if project_uuid:
+        tags = [f"project:{project_uuid}:tasks"]
+    elif current_user['role'] != "admin":
+        tags = [f"user:{current_user['id']}:tasks"]
+    else:
+        tags = ["tasks"]
+    params = {
+        "skip": skip, "limit": limit, "cursor": cursor, "project_id": project_uuid,
+        "status": status, "priority": priority, "assigned_to": assigned_uuid,
+    }
+    return await response_cache.get_or_set("tasks", current_user, params, load, tags=tags)
+
+
+@router.get("/export")
+async def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    project_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assigned_to: Optional[UUID] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream every visible task as NDJSON (default) or CSV.
+
+    Same filters and visibility as the task list, without pagination.
+    """
+    factory = await read_session_factory(current_user)
+    return StreamingResponse(
+        TaskService.export_tasks(
+            factory, current_user, format,
+            project_id=project_id, status=status, priority=priority, assigned_to=assigned_to
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
     )
-    return tasks
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get task by ID: Users can only access assigned tasks, Admins access all."""
-    task = await TaskService.get_task(db, task_id, current_user)
+    task = await response_cache.get_or_set(
+        "task", current_user, {"task_id": task_id},
+        lambda: TaskService.get_task(db, task_id, current_user),
+        tags=lambda t: [f"task:{task_id}", f"project:{t.project_id}:tasks"]
+    )
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
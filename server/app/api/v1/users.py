@@ -1,19 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.schemas.pagination import CursorPage
 from app.services.user_service import UserService
-from app.dependencies import get_current_user, get_admin_user
+from app.core.pagination import next_cursor
+from app.dependencies import get_current_user, get_admin_user, get_read_db
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info( db: AsyncSession = Depends(get_db),user = Depends(get_current_user)):
+async def get_current_user_info( db: AsyncSession = Depends(get_read_db),user = Depends(get_current_user)):
     """Get current user profile."""
     result = await UserService.get_user_by_id(db, UUID(user['id']))
     if not result:
@@ -24,24 +26,31 @@ async def get_current_user_info( db: AsyncSession = Depends(get_db),user = Depen
     return result
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[List[UserResponse], CursorPage[UserResponse]])
 async def list_users(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     search: Optional[str] = None,
     role: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
-    """List all users (Admin only)."""
-    users = await UserService.get_users(db, skip=skip, limit=limit, search=search, role=role)
+    """List all users (Admin only).
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination
+    and returns `{items, next_cursor}`; otherwise `skip`/`limit` apply.
+    """
+    users = await UserService.get_users(db, skip=skip, limit=limit, search=search, role=role, cursor=cursor)
+    if cursor is not None:
+        return CursorPage[UserResponse](items=users, next_cursor=next_cursor(users, limit))
     return users
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_admin_user)
 ):
     """Get user by ID (Admin only)."""
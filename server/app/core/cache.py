@@ -0,0 +1,120 @@
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+
+class ResponseCache:
+    """Read-through cache for GET responses with tag-based invalidation.
+
+    Entries are keyed by endpoint name, the caller's visibility scope (all
+    admins share one scope, each member has their own) and the request
+    parameters. Every entry key is also added to one Redis set per tag, so
+    a write can drop exactly the entries that carry the tags it touched.
+    """
+
+    def __init__(self, prefix: str = "cache"):
+        self.prefix = prefix
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def scope(current_user: dict) -> str:
+        if current_user['role'] == "admin":
+            return "admin"
+        return f"user:{current_user['id']}"
+
+    def make_key(self, name: str, current_user: dict, params: dict) -> str:
+        raw = json.dumps(jsonable_encoder(params), sort_keys=True)
+        digest = hashlib.sha256(raw.encode()).hexdigest()[:32]
+        return f"{self.prefix}:{name}:{self.scope(current_user)}:{digest}"
+
+    def tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get_or_set(
+        self,
+        name: str,
+        current_user: dict,
+        params: dict,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Tags,
+    ) -> Any:
+        """Return the cached response for these params, or load and cache it.
+
+        `tags` is a list of tags or a function computing them from the loaded
+        result. `None` results are never cached.
+        """
+        redis = redis_client.redis
+        if redis is None or settings.RESPONSE_CACHE_TTL <= 0:
+            return await loader()
+
+        key = self.make_key(name, current_user, params)
+        try:
+            cached = await redis.get(key)
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            self.hits[name] += 1
+            return json.loads(cached)
+
+        self.misses[name] += 1
+        result = await loader()
+        if result is None:
+            return result
+
+        data = jsonable_encoder(result)
+        tag_list = list(tags(result) if callable(tags) else tags)
+        ttl = settings.RESPONSE_CACHE_TTL
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.set(key, json.dumps(data), ex=ttl)
+            for tag in tag_list:
+                pipe.sadd(self.tag_key(tag), key)
+                pipe.expire(self.tag_key(tag), ttl)
+            await pipe.execute()
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+        return data
+
+    async def invalidate(self, *tags: Optional[str]):
+        """Drop every entry carrying any of the given tags."""
+        redis = redis_client.redis
+        tag_keys = [self.tag_key(t) for t in tags if t]
+        if redis is None or not tag_keys:
+            return
+        try:
+            keys = await redis.sunion(tag_keys)
+            await redis.delete(*keys, *tag_keys)
+        except Exception as e:
+            print(f"Response cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint hit/miss counters for this process."""
+        names = sorted(set(self.hits) | set(self.misses))
+        endpoints = {}
+        for name in names:
+            total = self.hits[name] + self.misses[name]
+            endpoints[name] = {
+                "hits": self.hits[name],
+                "misses": self.misses[name],
+                "hit_ratio": round(self.hits[name] / total, 4) if total else 0.0,
+            }
+        return {
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "endpoints": endpoints,
+        }
+
+
+# Global response cache instance
+response_cache = ResponseCache()
+
@@ -0,0 +1,44 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence
+
+from pydantic import BaseModel, TypeAdapter
+
+# Supported export formats and their media types
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def encode_rows(
+    partitions: AsyncIterator[Sequence],
+    adapter: TypeAdapter,
+    model: type,
+    fmt: str,
+) -> AsyncIterator[bytes]:
+    """Encode streamed row partitions as NDJSON or CSV, one chunk per partition.
+
+    Each partition is validated with `adapter` (a TypeAdapter of List[model])
+    and released before the next is fetched, so memory depends on the
+    partition size, not on the result size. CSV output starts with a header
+    row of the model's fields.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(model.model_fields)
+        async for rows in partitions:
+            items: Sequence[BaseModel] = adapter.validate_python(rows, from_attributes=True)
+            for item in items:
+                writer.writerow(item.model_dump(mode="json").values())
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+
+    async for rows in partitions:
+        items = adapter.validate_python(rows, from_attributes=True)
+        yield b"".join(item.model_dump_json().encode() + b"\n" for item in items)
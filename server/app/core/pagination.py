@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+
+def _pack(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _unpack(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encode a (created_at, id) sort key into an opaque cursor string."""
+    return _pack([created_at.isoformat(), str(id)])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode an opaque cursor string back into its (created_at, id) sort key."""
+    try:
+        created_at, id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def encode_rank_cursor(rank: float, kind: str, id: UUID) -> str:
+    """Encode a (rank, kind, id) sort key of a ranked result into a cursor."""
+    return _pack([rank, kind, str(id)])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, str, UUID]:
+    """Decode a cursor from `encode_rank_cursor`."""
+    try:
+        rank, kind, id = _unpack(cursor)
+        return float(rank), str(kind), UUID(id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def apply_keyset(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """Order a query by (created_at, id) and seek past the cursor.
+
+    An empty cursor starts from the first page.
+    """
+    query = query.order_by(model.created_at, model.id)
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) > tuple_(created_at, id))
+    return query.limit(limit)
+
+
+def next_cursor(items: list, limit: int) -> Optional[str]:
+    """Build the cursor for the page after `items`, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def next_rank_cursor(items: list, limit: int) -> Optional[str]:
+    """Like `next_cursor`, for ranked results with `rank`, `type` and `id`."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_rank_cursor(last.rank, last.type, last.id)
@@ -33,11 +33,11 @@ class RedisClient:
                 message = json.dumps(message)
             await self.redis.publish(channel, message)
 
-    async def subscribe(self, channel: str):
-        """Subscribe to a Redis channel."""
+    async def subscribe(self, *channels: str):
+        """Subscribe to one or more Redis channels."""
         if self.redis:
             self.pubsub = self.redis.pubsub()
-            await self.pubsub.subscribe(channel)
+            await self.pubsub.subscribe(*channels)
             return self.pubsub
 
     async def get_message(self, timeout: float = 1.0):
@@ -50,10 +50,10 @@ class RedisClient:
             return message
         return None
 
-    async def unsubscribe(self, channel: str):
-        """Unsubscribe from a channel."""
+    async def unsubscribe(self, *channels: str):
+        """Unsubscribe from one or more channels."""
         if self.pubsub:
-            await self.pubsub.unsubscribe(channel)
+            await self.pubsub.unsubscribe(*channels)
 
     # Cache operations
     async def set(self, key: str, value: Any, expire: Optional[int] = None):
@@ -69,10 +69,10 @@ class RedisClient:
             return await self.redis.get(key)
         return None
 
-    async def delete(self, key: str):
-        """Delete a key from Redis."""
-        if self.redis:
-            await self.redis.delete(key)
+    async def delete(self, *keys: str):
+        """Delete one or more keys from Redis."""
+        if self.redis and keys:
+            await self.redis.delete(*keys)
 
 
 # Global Redis client instance
@@ -0,0 +1,260 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+# Shared revocation records (kept until the tokens they cover expire) and
+# the channel that announces new ones to every worker
+REVOKED_BEFORE_KEY = "auth:revoked_before:{}"
+REVOKED_TOKEN_KEY = "auth:revoked_token:{}"
+REVOCATION_CHANNEL = "auth:revocations"
+
+
+class TokenCache:
+    """Bounded in-process LRU of verified JWT claims.
+
+    Entries are keyed by a digest of the raw token (the token itself is never
+    stored) and expire at the token's `exp`.
+
+    Revocations are applied in memory: a per-user "revoked before" time
+    compared with the token's `iat`, and a denylist of logged-out token
+    digests. Each revocation is also written to Redis and published on
+    REVOCATION_CHANNEL; a listener task per worker applies what the others
+    publish and reloads every record on subscribe and every
+    TOKEN_REVOCATION_SYNC_INTERVAL seconds. Checks therefore never leave the
+    process while the listener is in sync. While it is not, each check asks
+    Redis directly and a token is refused if Redis cannot answer. Without
+    Redis revocation is local to the worker.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[bytes]] = {}
+        self._revoked_before: Dict[str, float] = {}
+        self._denied: Dict[bytes, float] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self.in_sync = False
+        self.hits = 0
+        self.misses = 0
+        self.syncs = 0
+        self.direct_checks = 0
+        self.feed_errors = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if self.max_size <= 0:
+            return None
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                self._evict(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, token: str, payload: dict):
+        """Cache claims that have already been verified."""
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not exp:
+            return
+        key = self._digest(token)
+        self._entries[key] = (payload, float(exp))
+        self._entries.move_to_end(key)
+        self._by_user.setdefault(str(payload["id"]), set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: bytes):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = str(entry[0]["id"])
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+    def discard(self, token: str):
+        """Evict one token from this process only."""
+        self._evict(self._digest(token))
+
+    def _apply(self, record: dict):
+        """Apply a revocation record from this or another worker."""
+        if "user_id" in record:
+            user_id = str(record["user_id"])
+            before = float(record["before"])
+            if before > self._revoked_before.get(user_id, 0):
+                self._revoked_before[user_id] = before
+            for key in list(self._by_user.get(user_id, ())):
+                self._evict(key)
+        else:
+            key = bytes.fromhex(record["digest"])
+            self._denied[key] = float(record["exp"])
+            self._evict(key)
+
+    def _revoked_locally(self, key: bytes, payload: dict) -> bool:
+        if key in self._denied:
+            return True
+        before = self._revoked_before.get(str(payload["id"]))
+        # Tokens issued before `iat` was added count as issued at the epoch
+        return before is not None and float(payload.get("iat", 0)) <= before
+
+    async def is_revoked(self, token: str, payload: dict) -> bool:
+        """Whether any worker revoked the token.
+
+        Answered from memory unless Redis is configured and the listener is
+        out of sync; then Redis is asked, and no answer counts as revoked.
+        """
+        key = self._digest(token)
+        if self._revoked_locally(key, payload):
+            return True
+        if redis_client.redis is None or self.in_sync:
+            return False
+        self.direct_checks += 1
+        try:
+            before, exp = await redis_client.redis.mget(
+                REVOKED_BEFORE_KEY.format(payload["id"]), REVOKED_TOKEN_KEY.format(key.hex())
+            )
+        except Exception as e:
+            print(f"Could not check token revocation, refusing the token: {e}")
+            return True
+        if before is not None:
+            self._apply({"user_id": payload["id"], "before": before})
+        if exp is not None:
+            self._apply({"digest": key.hex(), "exp": exp})
+        return self._revoked_locally(key, payload)
+
+    async def _publish(self, key: str, record: dict, ttl: int):
+        """Store a revocation record until `ttl` and announce it to the other workers."""
+        if redis_client.redis is None:
+            # No periodic sync runs without Redis; forget expired records here
+            self._prune()
+            return
+        value = record.get("before", record.get("exp"))
+        try:
+            pipe = redis_client.redis.pipeline(transaction=False)
+            pipe.set(key, str(value), ex=ttl)
+            pipe.publish(REVOCATION_CHANNEL, json.dumps(record))
+            await pipe.execute()
+        except Exception as e:
+            print(f"Could not share revocation {record}: {e}")
+
+    async def revoke_token(self, token: str, payload: dict):
+        """Revoke one token until its `exp`, e.g. on logout."""
+        record = {"digest": self._digest(token).hex(), "exp": float(payload["exp"])}
+        self._apply(record)
+        ttl = int(record["exp"] - time.time()) + 1
+        if ttl > 0:
+            await self._publish(REVOKED_TOKEN_KEY.format(record["digest"]), record, ttl)
+
+    async def revoke_user(self, user_id):
+        """Revoke every token issued to a user so far, e.g. after a role change.
+
+        Kept for the refresh token lifetime, the longest any of them stays valid.
+        """
+        record = {"user_id": str(user_id), "before": time.time()}
+        self._apply(record)
+        await self._publish(REVOKED_BEFORE_KEY.format(user_id), record, settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60)
+
+    async def sync(self):
+        """Reload every revocation record from Redis and forget expired ones."""
+        redis = redis_client.redis
+        for pattern, field in ((REVOKED_BEFORE_KEY, "user_id"), (REVOKED_TOKEN_KEY, "digest")):
+            prefix = pattern.format("")
+            keys = [k async for k in redis.scan_iter(match=prefix + "*", count=1000)]
+            values = await redis.mget(*keys) if keys else []
+            for key, value in zip(keys, values):
+                if value is not None:
+                    value_field = "before" if field == "user_id" else "exp"
+                    self._apply({field: key[len(prefix):], value_field: value})
+        self._prune()
+        self.syncs += 1
+
+    def _prune(self):
+        now = time.time()
+        oldest = now - settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+        self._denied = {k: exp for k, exp in self._denied.items() if exp > now}
+        self._revoked_before = {u: t for u, t in self._revoked_before.items() if t > oldest}
+
+    async def start(self):
+        if self._listener is None and redis_client.redis is not None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.in_sync = False
+
+    async def _listen(self):
+        """Apply revocations published by other workers; resubscribe and resync on errors."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                # Subscribe before loading, so nothing published meanwhile is missed
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                await self.sync()
+                self.in_sync = True
+                next_sync = loop.time() + settings.TOKEN_REVOCATION_SYNC_INTERVAL
+                while True:
+                    item = await pubsub.get_message(timeout=max(0.0, min(1.0, next_sync - loop.time())))
+                    if item and item.get("type") == "message":
+                        self._apply(json.loads(item["data"]))
+                    if loop.time() >= next_sync:
+                        await self.sync()
+                        next_sync = loop.time() + settings.TOKEN_REVOCATION_SYNC_INTERVAL
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Token revocation feed error, resubscribing: {e}")
+                self.feed_errors += 1
+            finally:
+                self.in_sync = False
+                await pubsub.aclose()
+            await asyncio.sleep(1)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_user.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        if redis_client.redis is None:
+            feed = "local"
+        else:
+            feed = "in_sync" if self.in_sync else "down"
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "revocation_feed": feed,
+            "revoked_users": len(self._revoked_before),
+            "denied_tokens": len(self._denied),
+            "syncs": self.syncs,
+            "direct_checks": self.direct_checks,
+            "feed_errors": self.feed_errors,
+        }
+
+
+# Global verified-token cache
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
@@ -1,48 +1,262 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+from fastapi import Request
 from app.core.config import settings
+from app.core.redis import redis_client
 
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    connect_args={"statement_cache_size": 0},
-    future=True,
-)
 
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+class PoolWaitStats:
+    """Time checkouts spent blocked on an exhausted pool."""
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def record(self, wait_ms: float):
+        self.waits += 1
+        self.total_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+        for i, bound in enumerate(self.BUCKETS_MS):
+            if wait_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+
+class TimedAsyncQueue(AsyncAdaptedQueue):
+    """Pool queue that times blocking gets.
+
+    QueuePool only blocks on its queue once size + overflow connections are
+    checked out, so this measures waiting for a connection to be returned,
+    not opening new ones.
+    """
+
+    wait_stats: PoolWaitStats
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            self.wait_stats.record((time.perf_counter() - start) * 1000)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkouts and time blocked waiting for one."""
+
+    _queue_class = TimedAsyncQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+        self._pool.wait_stats = self.wait_stats
+
+    def connect(self):
+        self.wait_stats.checkouts += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+
+    def snapshot(self) -> dict:
+        stats = self.wait_stats
+        labels = [f"le_{b}ms" for b in stats.BUCKETS_MS] + [f"gt_{stats.BUCKETS_MS[-1]}ms"]
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": stats.checkouts,
+            "waits": stats.waits,
+            "timeouts": stats.timeouts,
+            "avg_wait_ms": round(stats.total_ms / stats.waits, 3) if stats.waits else 0.0,
+            "max_wait_ms": round(stats.max_ms, 3),
+            "wait_histogram": dict(zip(labels, stats.buckets)),
+        }
+
+
+def _connect_args() -> dict:
+    if settings.DB_BEHIND_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args=_connect_args(),
+        future=True,
+    )
+
+
+class TrackedSession(Session):
+    """Session that records whether it has written anything.
+
+    `info["pending_writes"]` is set by flushes and by non-SELECT statements
+    and cleared by commit/rollback; `info["committed_writes"]` is set once a
+    commit actually carried writes.
+    """
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _note_statement(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["pending_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _note_flush(session, flush_context):
+    session.info["pending_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _note_commit(session):
+    if session.info.pop("pending_writes", False):
+        session.info["committed_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _note_rollback(session):
+    session.info.pop("pending_writes", None)
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Whether ending this session with a commit would change anything."""
+    return bool(
+        session.info.get("pending_writes")
+        or session.new or session.dirty or session.deleted
+    )
+
+
+def _create_sessionmaker(bind):
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        sync_session_class=TrackedSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Create async engines: the primary, and an optional read replica
+engine = _create_engine(settings.DATABASE_URL)
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+
+# Create async session factories. Sessions only check out a connection on
+# their first statement. The read-only factories begin every transaction
+# with BEGIN READ ONLY (asyncpg's readonly transaction flag), so a stray
+# write on a GET route fails instead of landing on the primary.
+AsyncSessionLocal = _create_sessionmaker(engine)
+ReadOnlySessionLocal = _create_sessionmaker(engine.execution_options(postgresql_readonly=True))
+ReadSessionLocal = (
+    _create_sessionmaker(read_engine.execution_options(postgresql_readonly=True))
+    if read_engine is not engine else ReadOnlySessionLocal
 )
 
+
+def pool_metrics() -> dict:
+    """Connection pool statistics for the primary and (if configured) replica."""
+    metrics = {"primary": engine.sync_engine.pool.snapshot()}
+    if read_engine is not engine:
+        metrics["replica"] = read_engine.sync_engine.pool.snapshot()
+    return metrics
+
 # Base class for models
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Timestamp column default, called for each row (not once at import)."""
+    return datetime.now(timezone.utc)
+
+
+async def mark_recent_write(user_id: str):
+    """Pin a user's reads to the primary for READ_YOUR_WRITES_WINDOW seconds."""
+    if read_engine is engine or settings.READ_YOUR_WRITES_WINDOW <= 0:
+        return
+    try:
+        await redis_client.set(f"recent_write:{user_id}", "1", expire=settings.READ_YOUR_WRITES_WINDOW)
+    except Exception as e:
+        print(f"Could not record recent write for {user_id}: {e}")
+
+
+async def has_recent_write(user_id: str) -> bool:
+    try:
+        return bool(await redis_client.get(f"recent_write:{user_id}"))
+    except Exception:
+        # Without the marker we cannot prove the replica is fresh enough
+        return True
+
+
 # Dependency for getting database session
-async def get_db():
+async def get_db(request: Request):
+    """Read-write session for the request.
+
+    Commits at the end only if something was written since the last commit
+    (services usually commit themselves), so read-only use costs no COMMIT.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+    user_id = getattr(request.state, "user_id", None)
+    if user_id and session.info.get("committed_writes"):
+        await mark_recent_write(user_id)
+
+
+def _run_migrations(connection):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
 
 
-# Initialize database
+# Initialize database: bring the schema up to the latest Alembic revision
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_run_migrations)
 
 
 # Close database connections
 async def close_db():
-    await engine.dispose()
\ No newline at end of file
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
\ No newline at end of file
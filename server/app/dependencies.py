@@ -1,43 +1,55 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.database import get_db
+from app.database import (
+    engine, read_engine, ReadOnlySessionLocal, ReadSessionLocal, has_recent_write
+)
 from app.models.user import User
 from app.core.security import decode_token
+from app.core.token_cache import token_cache
 
 # Security scheme
 security = HTTPBearer()
 
 
+async def authenticate_token(token: str) -> Optional[dict]:
+    """Return the verified claims of an access token, or None if invalid.
+
+    Verified claims are cached until the token's `exp`, so repeat requests
+    skip the signature check. Cached or not, the claims are checked against
+    the revocations every worker has applied in memory before they are used.
+    """
+    cached = token_cache.get(token)
+    payload = cached if cached is not None else decode_token(token)
+    if payload is None:
+        return None
+    if payload.get("email") is None or payload.get("role") is None or payload.get("id") is None:
+        return None
+
+    if await token_cache.is_revoked(token, payload):
+        token_cache.discard(token)
+        return None
+    if cached is None:
+        token_cache.put(token, payload)
+    return payload
+
+
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
     """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    
-    # Decode token
-    payload = decode_token(token)
+    payload = await authenticate_token(credentials.credentials)
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    id = payload["id"]
     
-    # Get user email from token
-    email: Optional[str] = payload.get("email")
-    role: Optional[str] = payload.get("role")
-    id: Optional[str] = payload.get("id")
-    if email is None or role is None or id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+    # Lets get_db pin this user's next reads to the primary after a write
+    request.state.user_id = id
     return payload
 
 
@@ -54,4 +66,29 @@ async def get_admin_user(current_user: User = Depends(get_current_active_user))
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions. Admin access required."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def read_session_factory(current_user: dict):
+    """Session factory for a read on behalf of `current_user`.
+
+    The read replica when DATABASE_READ_URL is set, unless the caller wrote
+    within READ_YOUR_WRITES_WINDOW seconds; the read-only primary otherwise.
+    """
+    if read_engine is not engine and await has_recent_write(current_user['id']):
+        return ReadOnlySessionLocal
+    return ReadSessionLocal
+
+
+async def get_read_db(current_user: User = Depends(get_current_user)):
+    """Database session for read-only endpoints.
+
+    Transactions are READ ONLY. Uses the read replica when DATABASE_READ_URL
+    is set, unless the caller wrote within READ_YOUR_WRITES_WINDOW seconds.
+    """
+    factory = await read_session_factory(current_user)
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -1,12 +1,20 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.api.v1 import router
-from app.database import init_db, close_db
+from app.database import init_db, close_db, pool_metrics
 from app.core.config import settings
 from app.core.redis import redis_client
+from app.core.cache import response_cache
+from app.core.security import shutdown_password_hasher
+from app.core.token_cache import token_cache
+from app.dependencies import authenticate_token
 from app.services.notification_service import notification_service
+from app.services.outbox_service import outbox_relay
+from app.services.activity_log_service import activity_log_writer
+from app.services.report_service import snapshot_scheduler
 
 
 @asynccontextmanager
@@ -15,15 +23,26 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting FlowTrack API...")
     await redis_client.connect()
+    await token_cache.start()
     await init_db()
+    await notification_service.start()
+    await outbox_relay.start()
+    await activity_log_writer.start()
+    await snapshot_scheduler.start()
     print("✅ Application started successfully")
     
     yield
     
     # Shutdown
     print("🛑 Shutting down FlowTrack API...")
+    await snapshot_scheduler.stop()
+    await activity_log_writer.stop()
+    await outbox_relay.stop()
+    await notification_service.stop()
+    await token_cache.stop()
     await redis_client.disconnect()
     await close_db()
+    shutdown_password_hasher()
     print("✅ Application shut down successfully")
 
 
@@ -51,19 +70,41 @@ app.include_router(router, prefix="/api/v1")
 
 # WebSocket endpoint for real-time notifications
 @app.websocket("/ws/notifications/{user_id}")
-async def websocket_notifications(websocket: WebSocket, user_id: str):
-    """WebSocket endpoint for real-time notifications via Redis Pub/Sub."""
-    await notification_service.connect(websocket, user_id)
+async def websocket_notifications(
+    websocket: WebSocket,
+    user_id: str,
+    token: Optional[str] = None,
+    batch: bool = False,
+    last_event_id: Optional[str] = None
+):
+    """WebSocket endpoint for real-time notifications via Redis Streams.
+
+    Requires the user's access token as `?token=`; the socket is subscribed
+    to the user's own topic and the projects they belong to. `?batch=1`
+    switches to batched frames (see WS_BATCH_WINDOW_MS). On reconnect, pass
+    the last `event_id` received as `?last_event_id=` to get the missed
+    events, or a `resync_required` message if they are no longer retained.
+    """
+    current_user = await authenticate_token(token) if token else None
+    if current_user is None or str(current_user['id']) != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await notification_service.connect(
+        websocket, current_user, batch=batch, last_event_id=last_event_id
+    )
     
     try:
-        # Start listening to Redis Pub/Sub
-        await notification_service.listen_to_redis(websocket, user_id)
+        # Messages arrive through the worker's shared subscriber; just keep
+        # reading so disconnects are noticed.
+        while True:
+            await websocket.receive_text()
     except WebSocketDisconnect:
-        notification_service.disconnect(user_id)
-        print(f"WebSocket disconnected: {user_id}")
+        pass
     except Exception as e:
         print(f"WebSocket error for {user_id}: {e}")
-        notification_service.disconnect(user_id)
+    finally:
+        await notification_service.disconnect(websocket, user_id)
 
 
 # Health check endpoint
@@ -77,6 +118,21 @@ async def health_check():
     }
 
 
+# Runtime metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    """Per-process cache, outbox relay, websocket queue and connection pool statistics."""
+    return {
+        "response_cache": response_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "outbox": outbox_relay.stats(),
+        "websockets": notification_service.stats(),
+        "activity_log": activity_log_writer.stats(),
+        "report_snapshots": snapshot_scheduler.stats(),
+        "db_pool": pool_metrics()
+    }
+
+
 # Root endpoint
 @app.get("/")
 async def root():
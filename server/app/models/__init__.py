@@ -4,3 +4,6 @@ from .user import User
 from .project import Project
 from .task import Task
 from .activity_log import ActivityLog
+from .task_counter import ProjectStatusCount, AssigneeStatusCount, AssigneePriorityCount
+from .outbox import OutboxEvent
+from .report_snapshot import ProjectStatusDaily, AssigneeCycleDaily
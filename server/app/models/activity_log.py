@@ -1,16 +1,39 @@
-from sqlalchemy import Column, String, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from uuid import uuid4
-from datetime import datetime, timezone
-from app.database import Base
+from app.database import Base, utcnow
+
 
 class ActivityLog(Base):
+    """Append-only record of task, project and membership changes.
+
+    The table is range-partitioned by month on `timestamp` (see
+    alembic/versions/0005_activity_log_partitions.py), so the primary key
+    includes it. `user_id` carries no foreign key: rows are written in
+    batches after the change commits and outlive deleted users.
+    """
     __tablename__ = "activity_logs"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, default=utcnow, server_default=func.now())
+    user_id = Column(UUID(as_uuid=True), nullable=False)
     action = Column(String, nullable=False)
-    timestamp = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    entity_type = Column(String, nullable=True)
+    entity_id = Column(UUID(as_uuid=True), nullable=True)
+    project_id = Column(UUID(as_uuid=True), nullable=True)
+    details = Column(JSONB(none_as_null=True), nullable=True)
+
+    user = relationship(
+        "User",
+        back_populates="activity_logs",
+        primaryjoin="foreign(ActivityLog.user_id) == User.id",
+    )
 
-    user = relationship("User", back_populates="activity_logs")
\ No newline at end of file
+    # Kept in sync with alembic/versions/0005_activity_log_partitions.py
+    __table_args__ = (
+        Index('ix_activity_logs_user_id_timestamp', 'user_id', 'timestamp'),
+        Index('ix_activity_logs_project_id_timestamp', 'project_id', 'timestamp'),
+        Index('ix_activity_logs_entity_id_timestamp', 'entity_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
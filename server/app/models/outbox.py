@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, func
+from sqlalchemy.dialects.postgresql import JSONB
+from app.database import Base
+
+
+# Domain events written in the same transaction as the change they describe
+# and published to Redis by the outbox relay (app/services/outbox_service.py).
+
+class OutboxEvent(Base):
+    __tablename__ = 'outbox_events'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    channel = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,14 +1,14 @@
-from sqlalchemy import Column, String, Date, Enum, ForeignKey, DateTime, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Date, Enum, ForeignKey, DateTime, Table, Index
+from sqlalchemy.orm import relationship, deferred
 from uuid import uuid4
-from datetime import datetime, timezone
-from sqlalchemy.dialects.postgresql import UUID
-from app.database import Base
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from app.database import Base, utcnow
 from app.models.enums import ProjectStatus
 
 project_members = Table('project_members', Base.metadata,
     Column('project_id', UUID(as_uuid=True), ForeignKey('projects.id'), primary_key=True),
-    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True)
+    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True),
+    Index('ix_project_members_user_id', 'user_id', 'project_id')
 )
 
 class Project(Base):
@@ -20,10 +20,26 @@ class Project(Base):
     deadline = Column(Date, nullable=True)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.pending)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc) , onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    # Full-text search document maintained by Postgres; never loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True,
+    )))
 
     # Relationships
     creator = relationship("User", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    members = relationship("User", secondary=project_members, back_populates="member_projects")
\ No newline at end of file
+    members = relationship("User", secondary=project_members, back_populates="member_projects")
+
+    # Kept in sync with alembic/versions/0007_search_indexes.py; the name
+    # trigram index also serves the ILIKE filter in ProjectService.get_projects
+    __table_args__ = (
+        Index('ix_projects_created_at_id', 'created_at', 'id'),
+        Index('ix_projects_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_projects_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+    # The search document is computed by the database; don't fetch it back on INSERT
+    __mapper_args__ = {"eager_defaults": False}
\ No newline at end of file
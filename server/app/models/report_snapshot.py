@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Date, Enum, Float, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+from app.models.enums import TaskStatus
+
+
+# Daily series behind the burndown, cumulative-flow and cycle-time reports,
+# written by ReportService.take_snapshot (app/services/report_service.py).
+# Reports read these instead of the tasks table.
+
+class ProjectStatusDaily(Base):
+    """Tasks per project and status as of the last snapshot taken on `day`."""
+    __tablename__ = 'report_project_status_daily'
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AssigneeCycleDaily(Base):
+    """Tasks an assignee completed in a project on `day` (UTC) and their summed durations.
+
+    `cycle_seconds` runs from creation (todo) to done; `active_seconds` from
+    the first move to in_progress to done, over the `active_completed` tasks
+    that have a start time.
+    """
+    __tablename__ = 'report_assignee_cycle_daily'
+
+    day = Column(Date, primary_key=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    completed = Column(Integer, nullable=False, default=0)
+    cycle_seconds = Column(Float, nullable=False, default=0)
+    active_completed = Column(Integer, nullable=False, default=0)
+    active_seconds = Column(Float, nullable=False, default=0)
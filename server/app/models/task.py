@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, Enum, ForeignKey, Date, Text, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, String, Enum, ForeignKey, Date, Text, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from uuid import uuid4
-from datetime import datetime, timezone
-from app.database import Base
+from app.database import Base, utcnow
 from app.models.enums import TaskStatus, TaskPriority
 
 
@@ -19,10 +18,34 @@ class Task(Base):
     project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id'), nullable=False)
     assigned_to = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    # Status transitions, kept by TaskService: first move out of todo, and
+    # the move to done (cleared again if the task leaves done)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Full-text search document maintained by Postgres; never loaded with the row
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True,
+    )))
 
     # Relationships
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="tasks", foreign_keys=[assigned_to])
-    creator = relationship("User", back_populates="created_tasks", foreign_keys=[created_by])
\ No newline at end of file
+    creator = relationship("User", back_populates="created_tasks", foreign_keys=[created_by])
+
+    # Kept in sync with alembic/versions/0002_query_indexes.py, 0006_report_snapshots.py
+    # and 0007_search_indexes.py
+    __table_args__ = (
+        Index('ix_tasks_project_id_status', 'project_id', 'status'),
+        Index('ix_tasks_assigned_to_status', 'assigned_to', 'status', postgresql_where=text('assigned_to IS NOT NULL')),
+        Index('ix_tasks_assigned_to_created_at_id', 'assigned_to', 'created_at', 'id', postgresql_where=text('assigned_to IS NOT NULL')),
+        Index('ix_tasks_created_at_id', 'created_at', 'id'),
+        Index('ix_tasks_completed_at', 'completed_at', postgresql_where=text('completed_at IS NOT NULL')),
+        Index('ix_tasks_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_tasks_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+    )
+    # The search document is computed by the database; don't fetch it back on INSERT
+    __mapper_args__ = {"eager_defaults": False}
\ No newline at end of file
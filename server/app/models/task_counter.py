@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Enum, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+from app.models.enums import TaskStatus, TaskPriority
+
+
+# Denormalized task counts maintained by TaskCounterService in the same
+# transaction as every task write. Rebuild with `python -m scripts.task_counters`.
+
+class ProjectStatusCount(Base):
+    __tablename__ = 'task_counts_project_status'
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AssigneeStatusCount(Base):
+    __tablename__ = 'task_counts_assignee_status'
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class AssigneePriorityCount(Base):
+    __tablename__ = 'task_counts_assignee_priority'
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    priority = Column(Enum(TaskPriority), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, Enum, DateTime, ForeignKey
+from sqlalchemy import Column, String, Enum, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime, timezone
-from app.database import Base
+from app.database import Base, utcnow
 from app.models.task import Task
 
 class User(Base):
@@ -14,11 +13,24 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     role = Column(Enum("admin", "member", name="user_roles"),default="member"  ,nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
     projects = relationship("Project", back_populates="creator")
     tasks = relationship("Task", back_populates="assignee", foreign_keys=[Task.assigned_to])
-    activity_logs = relationship("ActivityLog", back_populates="user")
+    activity_logs = relationship(
+        "ActivityLog",
+        back_populates="user",
+        primaryjoin="User.id == foreign(ActivityLog.user_id)",
+        passive_deletes="all",
+    )
     member_projects = relationship("Project", secondary="project_members", back_populates="members")
-    created_tasks = relationship("Task", back_populates="creator", foreign_keys=[Task.created_by])
\ No newline at end of file
+    created_tasks = relationship("Task", back_populates="creator", foreign_keys=[Task.created_by])
+
+    # Kept in sync with alembic/versions/0007_search_indexes.py; the trigram
+    # indexes also serve the ILIKE filter in UserService.get_users
+    __table_args__ = (
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+        Index('ix_users_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_users_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import date, datetime
 from typing import Optional, List
@@ -49,4 +49,25 @@ class ProjectResponse(ProjectBase):
 
 
 class ProjectWithTasks(ProjectResponse):
-    tasks: List[dict] = []
\ No newline at end of file
+    tasks: List[dict] = []
+
+
+class ProjectProgressRequest(BaseModel):
+    project_ids: List[UUID] = Field(..., max_length=500)
+
+
+
+class ProjectMembersRequest(BaseModel):
+    user_ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+
+
+class ProjectMembersAddResult(BaseModel):
+    added: List[UUID] = []
+    already_members: List[UUID] = []
+    not_found: List[UUID] = []
+
+
+class ProjectMembersRemoveResult(BaseModel):
+    removed: List[UUID] = []
+    not_members: List[UUID] = []
+    not_found: List[UUID] = []
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 class TaskReport(BaseModel):
@@ -43,4 +43,29 @@ class WorkloadReport(BaseModel):
     assigned_tasks: int
     high_priority_tasks: int
     medium_priority_tasks: int
-    low_priority_tasks: int
\ No newline at end of file
+    low_priority_tasks: int
+
+class BurndownPoint(BaseModel):
+    day: date
+    todo: int
+    in_progress: int
+    done: int
+    total: int
+    remaining: int
+
+class BurndownReport(BaseModel):
+    project_id: UUID
+    project_name: str
+    points: List[BurndownPoint]
+
+class CycleTimeReport(BaseModel):
+    user_id: str
+    user_name: str
+    completed_tasks: int
+    avg_cycle_hours: Optional[float]
+    avg_active_hours: Optional[float]
+
+class SnapshotResult(BaseModel):
+    day: date
+    project_status_rows: int
+    cycle_time_rows: int
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
+
+
+class SearchResult(BaseModel):
+    type: str  # task | project | user
+    id: UUID
+    title: str
+    description: Optional[str] = None  # the email for users
+    project_id: Optional[UUID] = None
+    rank: float
+
+    class Config:
+        from_attributes = True
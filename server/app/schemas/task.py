@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import date, datetime
 from uuid import UUID
 from app.models.enums import TaskStatus, TaskPriority
@@ -53,4 +53,27 @@ class TaskResponse(TaskBase):
 
 
 class TaskMoveRequest(BaseModel):
-    new_status: TaskStatus
\ No newline at end of file
+    new_status: TaskStatus
+
+
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: UUID
+
+
+class TaskBulkUpdate(BaseModel):
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    detail: str
+
+
+class TaskBulkResult(BaseModel):
+    tasks: List[TaskResponse] = []
+    errors: List[TaskBulkError] = []
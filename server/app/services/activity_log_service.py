@@ -0,0 +1,276 @@
+import asyncio
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, event, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal, TrackedSession
+from app.models.activity_log import ActivityLog
+
+PARTITION_NAME = re.compile(r"activity_logs_y(\d{4})m(\d{2})")
+
+# Serializes partition DDL between workers and the purge script
+PARTITION_LOCK = "SELECT pg_advisory_xact_lock(hashtext('activity_logs_partitions'))"
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"activity_logs_y{month:%Y}m{month:%m}"
+
+
+class ActivityLogService:
+    """Records activity entries with the caller's transaction and maintains the table."""
+
+    @staticmethod
+    def add(
+        db: AsyncSession,
+        current_user: dict,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[UUID],
+        project_id: Optional[UUID] = None,
+        details: Optional[dict] = None,
+    ):
+        """Queue an activity entry; it is handed to the writer once the session commits."""
+        db.info.setdefault("activity", []).append({
+            "id": uuid4(),
+            "timestamp": datetime.now(timezone.utc),
+            "user_id": UUID(str(current_user['id'])),
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "project_id": project_id,
+            "details": jsonable_encoder(details) if details else None,
+        })
+
+    @staticmethod
+    async def ensure_partitions(db: AsyncSession, months_ahead: int = None) -> dict:
+        """Create the monthly partitions from this month through `months_ahead` months.
+
+        A month whose rows already landed in the default partition cannot be
+        created next to it, so the default partition is detached, the month
+        created, its rows moved over and the default re-attached, all in
+        this transaction.
+        """
+        months_ahead = settings.ACTIVITY_LOG_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+        await db.execute(text(PARTITION_LOCK))
+        this_month = datetime.now(timezone.utc).date().replace(day=1)
+        names = []
+        moved = 0
+        for n in range(months_ahead + 1):
+            start = _add_months(this_month, n)
+            name = partition_name(start)
+            names.append(name)
+            if await db.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+                continue
+            bounds = f"'{start} 00:00:00+00'", f"'{_add_months(start, 1)} 00:00:00+00'"
+            in_month = f'"timestamp" >= {bounds[0]} AND "timestamp" < {bounds[1]}'
+            stranded = await db.scalar(text(f"SELECT EXISTS (SELECT 1 FROM activity_logs_default WHERE {in_month})"))
+            if stranded:
+                await db.execute(text("ALTER TABLE activity_logs DETACH PARTITION activity_logs_default"))
+            await db.execute(text(
+                f'CREATE TABLE "{name}" PARTITION OF activity_logs FOR VALUES FROM ({bounds[0]}) TO ({bounds[1]})'
+            ))
+            if stranded:
+                result = await db.execute(text(
+                    f'WITH moved AS (DELETE FROM activity_logs_default WHERE {in_month} RETURNING *) '
+                    f'INSERT INTO "{name}" SELECT * FROM moved'
+                ))
+                moved += result.rowcount
+                await db.execute(text("ALTER TABLE activity_logs ATTACH PARTITION activity_logs_default DEFAULT"))
+        await db.commit()
+        return {"partitions": names, "moved_rows": moved}
+
+    @staticmethod
+    async def purge(db: AsyncSession, before: datetime, batch_size: int = None) -> dict:
+        """Delete entries older than `before`.
+
+        Monthly partitions that end on or before the cutoff are detached and
+        dropped whole. Older rows left in the boundary month or the default
+        partition are deleted in batches of `batch_size`, one transaction
+        each, so locks stay short.
+        """
+        batch_size = batch_size or settings.ACTIVITY_LOG_PURGE_BATCH_SIZE
+        await db.execute(text(PARTITION_LOCK))
+        result = await db.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'activity_logs'::regclass"
+        ))
+        dropped = []
+        for name in sorted(result.scalars().all()):
+            match = PARTITION_NAME.fullmatch(name)
+            if not match:
+                continue
+            end = _add_months(date(int(match[1]), int(match[2]), 1), 1)
+            if datetime(end.year, end.month, end.day, tzinfo=timezone.utc) <= before:
+                await db.execute(text(f'ALTER TABLE activity_logs DETACH PARTITION "{name}"'))
+                await db.execute(text(f'DROP TABLE "{name}"'))
+                dropped.append(name)
+        await db.commit()
+
+        table = ActivityLog.__table__
+        deleted = 0
+        while True:
+            oldest = select(table.c.id, table.c.timestamp).where(table.c.timestamp < before).limit(batch_size)
+            result = await db.execute(delete(table).where(tuple_(table.c.id, table.c.timestamp).in_(oldest)))
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+        return {"dropped_partitions": dropped, "deleted_rows": deleted}
+
+
+class ActivityLogWriter:
+    """Background task that writes committed activity entries in batches.
+
+    Requests only append to a bounded in-process queue. The writer takes up
+    to ACTIVITY_LOG_BATCH_SIZE entries, waiting at most
+    ACTIVITY_LOG_FLUSH_INTERVAL seconds after the first one, and inserts them
+    with one multi-row INSERT. Entries are dropped (and counted) when the
+    queue is full or a batch fails, so logging never slows down or fails a
+    request. On shutdown the batch in progress and the rest of the queue are
+    flushed; the insert ignores rows already written. It also creates
+    upcoming monthly partitions on start and once a day; failed attempts
+    are retried when it next wakes and reported in `stats`.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ACTIVITY_LOG_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[dict] = []
+        self._closing = False
+        self._maintained: Optional[date] = None
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failures = 0
+        self.moved_from_default = 0
+        self.partition_failures = 0
+        self.partition_error: Optional[str] = None
+
+    def enqueue(self, entries: List[dict]):
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    async def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the writer and flush what is still queued."""
+        if self._task is not None:
+            # The flag also ends the loop if wait_for swallows the cancellation
+            self._closing = True
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        batch, self._batch = self._batch, []
+        while batch or not self._queue.empty():
+            while len(batch) < settings.ACTIVITY_LOG_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self.write(batch)
+            batch = []
+
+    async def write(self, batch: List[dict]):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    postgresql.insert(ActivityLog.__table__).values(batch).on_conflict_do_nothing()
+                )
+                await db.commit()
+        except Exception as e:
+            print(f"Activity log writer error, dropping {len(batch)} entries: {e}")
+            self.failures += 1
+            self.dropped += len(batch)
+            return
+        self.written += len(batch)
+        self.batches += 1
+
+    async def _fill(self, batch: List[dict]):
+        """Collect entries into `batch` until it is full or the flush interval ends."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.ACTIVITY_LOG_FLUSH_INTERVAL
+        size = settings.ACTIVITY_LOG_BATCH_SIZE
+        while len(batch) < size:
+            while len(batch) < size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _maintain(self):
+        today = datetime.now(timezone.utc).date()
+        if self._maintained == today:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await ActivityLogService.ensure_partitions(db)
+            self._maintained = today
+            self.moved_from_default += result["moved_rows"]
+            self.partition_error = None
+        except Exception as e:
+            print(f"Activity log partition maintenance error: {e}")
+            self.partition_failures += 1
+            self.partition_error = str(e)
+
+    async def _run(self):
+        while not self._closing:
+            await self._maintain()
+            try:
+                # Wake at least hourly so partitions are maintained while idle
+                first = await asyncio.wait_for(self._queue.get(), timeout=timedelta(hours=1).total_seconds())
+            except asyncio.TimeoutError:
+                continue
+            self._batch = [first]
+            await self._fill(self._batch)
+            await self.write(self._batch)
+            self._batch = []
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failures": self.failures,
+            "moved_from_default": self.moved_from_default,
+            "partition_failures": self.partition_failures,
+            "partition_error": self.partition_error,
+        }
+
+
+# Global activity log writer instance
+activity_log_writer = ActivityLogWriter()
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _ship_activity(session):
+    entries = session.info.pop("activity", None)
+    if entries:
+        activity_log_writer.enqueue(entries)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _forget_activity(session):
+    session.info.pop("activity", None)
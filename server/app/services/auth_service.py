@@ -5,9 +5,10 @@ from typing import Optional
 
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin
-from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token
+from app.core.security import hash_password, verify_and_update_password, create_access_token, create_refresh_token
 from datetime import timedelta
 from app.core.config import settings
+from app.core.token_cache import token_cache
 
 
 class AuthService:
@@ -27,7 +28,7 @@ class AuthService:
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         user = User(
             name=user_data.name,
             email=user_data.email,
@@ -65,13 +66,21 @@ class AuthService:
         result = await db.execute(select(User).where(User.email == email))
         user = result.scalar_one_or_none()
         
-        if not user or not verify_password(password, user.password_hash):
+        valid, new_hash = (False, None)
+        if user:
+            valid, new_hash = await verify_and_update_password(password, user.password_hash)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Upgrade the stored hash when the cost factor has changed
+        if new_hash:
+            user.password_hash = new_hash
+            await db.commit()
+        
         # Generate tokens
         access_token = create_access_token(
             data={"id" :  str(user.id) ,"email": user.email, "role": user.role}
@@ -114,6 +123,12 @@ class AuthService:
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
+        # Logged out, or issued before a role/password change or deletion
+        if await token_cache.is_revoked(refresh_token, payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
  
         
         # Generate new access token
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.models.project import project_members
+
+# Admins all see the same org-wide dashboard, so they share one snapshot.
+ADMIN_KEY = "dashboard:admin"
+
+
+class DashboardCache:
+    """Short-lived per-user dashboard snapshots in Redis."""
+
+    @staticmethod
+    def key_for(current_user: dict) -> str:
+        if current_user['role'] == "admin":
+            return ADMIN_KEY
+        return f"dashboard:user:{current_user['id']}"
+
+    @staticmethod
+    async def get(current_user: dict) -> Optional[Dict[str, Any]]:
+        if settings.DASHBOARD_CACHE_TTL <= 0:
+            return None
+        try:
+            cached = await redis_client.get(DashboardCache.key_for(current_user))
+        except Exception as e:
+            print(f"Dashboard cache read failed: {e}")
+            return None
+        return json.loads(cached) if cached else None
+
+    @staticmethod
+    async def set(current_user: dict, data: Dict[str, Any]):
+        if settings.DASHBOARD_CACHE_TTL <= 0:
+            return
+        try:
+            await redis_client.set(DashboardCache.key_for(current_user), data, expire=settings.DASHBOARD_CACHE_TTL)
+        except Exception as e:
+            print(f"Dashboard cache write failed: {e}")
+
+    @staticmethod
+    async def invalidate_users(user_ids: Iterable[Optional[UUID]]):
+        """Drop the snapshots of the given users and the shared admin snapshot."""
+        keys = {ADMIN_KEY} | {f"dashboard:user:{u}" for u in user_ids if u}
+        try:
+            await redis_client.delete(*keys)
+        except Exception as e:
+            print(f"Dashboard cache invalidation failed: {e}")
+
+    @staticmethod
+    async def project_member_ids(db: AsyncSession, project_id: UUID) -> List[UUID]:
+        result = await db.execute(
+            select(project_members.c.user_id).where(project_members.c.project_id == project_id)
+        )
+        return list(result.scalars().all())
+
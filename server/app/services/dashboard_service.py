@@ -1,32 +1,61 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from fastapi.encoders import jsonable_encoder
 from typing import Dict, Any
+from app.core.config import settings
 from app.models.user import User
+from app.models.project import Project, project_members
+from app.models.task_counter import ProjectStatusCount, AssigneeStatusCount
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
+from app.services.dashboard_cache import DashboardCache
 
 class DashboardService:
+    @staticmethod
+    async def get_stats(db: AsyncSession, current_user: User) -> Dict[str, int]:
+        """Task and project totals from SQL aggregates over the counter tables."""
+        if current_user['role'] == "admin":
+            projects_query = select(func.count(Project.id))
+            status_query = select(ProjectStatusCount.status, func.sum(ProjectStatusCount.count)).group_by(ProjectStatusCount.status)
+        else:
+            projects_query = select(func.count()).select_from(project_members).where(project_members.c.user_id == current_user['id'])
+            status_query = select(AssigneeStatusCount.status, AssigneeStatusCount.count).where(AssigneeStatusCount.user_id == current_user['id'])
+        
+        total_projects = (await db.execute(projects_query)).scalar() or 0
+        by_status = {status.value: count or 0 for status, count in (await db.execute(status_query)).all()}
+        
+        return {
+            "total_projects": total_projects,
+            "total_tasks": sum(by_status.values()),
+            "completed_tasks": by_status.get("done", 0),
+            "in_progress_tasks": by_status.get("in_progress", 0),
+            "todo_tasks": by_status.get("todo", 0),
+        }
+
     @staticmethod
     async def get_dashboard_data(db: AsyncSession, current_user: User) -> Dict[str, Any]:
-        # Get user's projects
-        projects = await ProjectService.get_projects(db, current_user)
+        cached = await DashboardCache.get(current_user)
+        if cached is not None:
+            return cached
         
-        # Get user's tasks
-        tasks = await TaskService.get_tasks(db, current_user=current_user)
+        # The three reads are independent; an AsyncSession can only run one
+        # statement at a time, so the extra two get their own sessions on the
+        # same engine (primary or replica) as `db`.
+        async def with_session(fn, *args, **kwargs):
+            async with AsyncSession(db.bind, expire_on_commit=False) as session:
+                return await fn(session, *args, **kwargs)
         
-        # Calculate stats
-        total_tasks = len(tasks)
-        completed_tasks = sum(1 for task in tasks if task.status == "done")
-        in_progress_tasks = sum(1 for task in tasks if task.status == "in_progress")
-        todo_tasks = sum(1 for task in tasks if task.status == "todo")
+        projects, tasks, stats = await asyncio.gather(
+            ProjectService.get_projects(db, current_user),
+            with_session(TaskService.get_tasks, current_user=current_user, limit=settings.DASHBOARD_TASK_LIMIT),
+            with_session(DashboardService.get_stats, current_user),
+        )
         
-        return {
+        data = jsonable_encoder({
             "projects": projects,
             "tasks": tasks,
-            "stats": {
-                "total_projects": len(projects),
-                "total_tasks": total_tasks,
-                "completed_tasks": completed_tasks,
-                "in_progress_tasks": in_progress_tasks,
-                "todo_tasks": todo_tasks,
-            }
-        }
+            "stats": stats,
+        })
+        await DashboardCache.set(current_user, data)
+        return data
@@ -1,91 +1,339 @@
-from typing import Any, Dict
+from typing import Any, List, Optional, Set
 from fastapi import WebSocket
+from sqlalchemy import select
 import json
 import asyncio
 
+from app.core.config import settings
 from app.core.redis import redis_client
+from app.database import ReadSessionLocal
+from app.models.project import project_members
+from app.services.presence_service import PresenceRegistry, worker_channel
+from app.websockets.connection_manager import ClientConnection, ConnectionManager, event_id_key
+
+# Admins can see every project, so project events also go to this topic
+ADMIN_TOPIC = "admins"
+
+# Every event on every channel goes to this one stream; the entry id is the
+# event id clients resume from
+EVENT_STREAM = "events"
+
+RESYNC_REQUIRED = {"type": "resync_required"}
+
+
+def project_topic(project_id: Any) -> str:
+    return f"project:{project_id}"
+
+
+def user_topic(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def task_topics(user_ids) -> List[str]:
+    """Topics of a task event: like task listings, only the assignees and admins see it."""
+    return [ADMIN_TOPIC] + [user_topic(u) for u in user_ids]
+
+
+def append_event(client, channel: str, message: Any):
+    """XADD an event to the bounded stream; `client` may be a pipeline."""
+    data = message if isinstance(message, str) else json.dumps(message)
+    return client.xadd(
+        EVENT_STREAM,
+        {"channel": channel, "data": data},
+        maxlen=settings.EVENT_STREAM_MAXLEN,
+        approximate=True,
+    )
 
 
 class NotificationService:
-    """Service for managing real-time notifications via WebSocket and Redis Pub/Sub."""
+    """Service for managing real-time notifications via WebSocket and Redis Streams.
+
+    Events from all channels are appended to one Redis stream capped at
+    about EVENT_STREAM_MAXLEN entries, and each is delivered with its stream
+    id as `event_id`. Each worker runs a single reader task that tails the
+    stream and fans messages out to its local sockets through the in-memory
+    routing table, instead of one subscription and polling loop per
+    connected client. A client reconnecting with the last id it saw is
+    replayed what it missed while the stream still holds it.
+
+    Direct messages to one user go through the presence registry: they are
+    published only on the channels of the workers holding that user's
+    sockets, so any worker can reach any user.
+
+    Messages are routed by topic: one carrying `project_id` goes to that
+    project's members (and admins), one carrying `user_id` to that user, so
+    delivery costs O(recipients) rather than O(connections). Messages with
+    neither are broadcast. Explicit `topics` override both; task events use
+    them so they reach only the assignees and admins (see `task_topics`).
+    """
 
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.subscribed_channels = ["task_updates", "project_updates", "kanban_updates", "notifications"]
+        self.manager = ConnectionManager()
+        self.presence = PresenceRegistry(lambda: self.manager.active_connections.keys())
+        self._listener: Optional[asyncio.Task] = None
+        self._direct_listener: Optional[asyncio.Task] = None
+        self.direct_sent = 0
+        self.direct_received = 0
+
+    async def start(self):
+        """Start this worker's stream reader, direct channel and presence heartbeat."""
+        if self._listener is None and redis_client.redis is not None:
+            self._listener = asyncio.create_task(self._listen())
+            self._direct_listener = asyncio.create_task(self._listen_direct())
+            await self.presence.start()
 
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Connect a WebSocket client."""
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
+    async def stop(self):
+        """Stop the Redis readers and withdraw this worker's presence."""
+        for task in (self._listener, self._direct_listener):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener = self._direct_listener = None
+        await self.presence.stop()
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        current_user: dict,
+        batch: bool = False,
+        last_event_id: Optional[str] = None,
+    ):
+        """Connect a WebSocket client and subscribe it to its topics.
+
+        With `batch`, the client receives batched frames every
+        WS_BATCH_WINDOW_MS instead of one frame per event. With
+        `last_event_id`, the events after it that the user can see are
+        replayed before live ones.
+        """
+        user_id = str(current_user['id'])
+        topics = await self._load_topics(current_user)
+        batch_window = settings.WS_BATCH_WINDOW_MS / 1000 if batch else 0
+        connection = await self.manager.connect(
+            websocket, user_id, batch_window=batch_window, hold=last_event_id is not None
+        )
+        for topic in topics:
+            self.manager.subscribe(user_id, topic)
+        if len(self.manager.user_connections(user_id)) == 1:
+            try:
+                await self.presence.register(user_id)
+            except Exception as e:
+                print(f"Error registering presence for {user_id}: {e}")
+        if last_event_id is not None:
+            connection.release(await self.replay(last_event_id, set(topics)))
         print(f"✅ WebSocket connected: User {user_id}")
 
-    def disconnect(self, user_id: str):
+    async def replay(self, last_event_id: str, topics: Set[str]) -> List[dict]:
+        """Events after `last_event_id` addressed to `topics` (or broadcast).
+
+        Returns a single resync_required message instead when the id is not
+        usable: malformed, already trimmed from the stream, or more than
+        WS_REPLAY_LIMIT events behind.
+        """
+        try:
+            since = event_id_key(last_event_id)
+            redis = redis_client.redis
+            oldest = await redis.xrange(EVENT_STREAM, count=1)
+            # An empty stream was flushed or recreated since the client's id
+            if not oldest or event_id_key(oldest[0][0]) > since:
+                return [RESYNC_REQUIRED]
+            limit = settings.WS_REPLAY_LIMIT
+            entries = await redis.xrange(EVENT_STREAM, min=f"({last_event_id}", count=limit + 1)
+        except Exception as e:
+            print(f"Cannot replay events after {last_event_id}: {e}")
+            return [RESYNC_REQUIRED]
+        if len(entries) > limit:
+            return [RESYNC_REQUIRED]
+
+        missed = []
+        for entry_id, fields in entries:
+            message = self._decode_entry(entry_id, fields)
+            addressed = self.topics_for(message)
+            if addressed is None or addressed & topics:
+                missed.append(message)
+        return missed
+
+    @staticmethod
+    async def _load_topics(current_user: dict) -> List[str]:
+        """The user's own topic, the admin topic if admin, and one per project membership."""
+        topics = [user_topic(current_user['id'])]
+        if current_user['role'] == "admin":
+            topics.append(ADMIN_TOPIC)
+        async with ReadSessionLocal() as db:
+            result = await db.execute(
+                select(project_members.c.project_id).where(project_members.c.user_id == current_user['id'])
+            )
+            topics += [project_topic(pid) for pid in result.scalars().all()]
+        return topics
+
+    async def disconnect(self, websocket: WebSocket, user_id: str):
         """Disconnect a WebSocket client."""
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-            print(f"❌ WebSocket disconnected: User {user_id}")
-
-    async def send_personal_message(self, user_id: str, message: dict):
-        """Send a message to a specific user."""
-        if user_id in self.active_connections:
-            websocket = self.active_connections[user_id]
+        self.manager.disconnect(websocket, user_id)
+        if not self.manager.user_connections(user_id):
             try:
-                await websocket.send_json(message)
+                await self.presence.unregister(user_id)
             except Exception as e:
-                print(f"Error sending message to {user_id}: {e}")
-                self.disconnect(user_id)
+                print(f"Error clearing presence for {user_id}: {e}")
+        print(f"❌ WebSocket disconnected: User {user_id}")
+
+    def stats(self) -> dict:
+        return {
+            **self.manager.stats(),
+            "presence": self.presence.stats(),
+            "direct_sent": self.direct_sent,
+            "direct_received": self.direct_received,
+        }
+
+    @staticmethod
+    def _send(targets: List[ClientConnection], message: dict):
+        """Queue a message on each connection; their writer tasks do the sending."""
+        for connection in targets:
+            connection.enqueue(message)
+
+    async def send_personal_message(self, user_id: str, message: dict) -> int:
+        """Send a message to a user's sockets on whichever workers hold them.
+
+        Returns the number of workers the message was routed to; 0 means the
+        user is not connected anywhere. Without Redis only local sockets are
+        reached.
+        """
+        user_id = str(user_id)
+        if not self.presence.enabled:
+            local = self.manager.user_connections(user_id)
+            self._send(local, message)
+            return 1 if local else 0
+        try:
+            workers = await self.presence.workers_for(user_id)
+            remote = [w for w in workers if w != self.presence.worker_id]
+            if remote:
+                data = json.dumps({"user_id": user_id, "message": message})
+                pipe = redis_client.redis.pipeline(transaction=False)
+                for worker_id in remote:
+                    pipe.publish(worker_channel(worker_id), data)
+                await pipe.execute()
+                self.direct_sent += len(remote)
+        except Exception as e:
+            print(f"Error routing message to {user_id}: {e}")
+            remote = []
+        # Local sockets are reached directly, even if the registry lags
+        local = self.manager.user_connections(user_id)
+        self._send(local, message)
+        return len(remote) + (1 if local else 0)
 
     async def broadcast(self, message: dict):
-        """Broadcast a message to all connected clients."""
-        disconnected = []
-        for user_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                print(f"Error broadcasting to {user_id}: {e}")
-                disconnected.append(user_id)
+        """Broadcast a message to all locally connected clients."""
+        self._send(list(self.manager.all_connections()), message)
+
+    @staticmethod
+    def topics_for(message: dict) -> Optional[Set[str]]:
+        """Topics a message is addressed to, or None to broadcast it."""
+        if message.get("topics"):
+            return set(message["topics"])
+        topics = set()
+        if message.get("project_id") is not None:
+            topics |= {project_topic(message["project_id"]), ADMIN_TOPIC}
+        if message.get("user_id") is not None:
+            topics.add(user_topic(message["user_id"]))
+        for user_id in message.get("user_ids") or ():
+            topics.add(user_topic(user_id))
+        return topics or None
+
+    def _apply_membership(self, message: dict):
+        """Keep local project subscriptions in step with membership changes."""
+        topic = project_topic(message["project_id"])
+        for user_id in map(str, message.get("user_ids") or ()):
+            if not self.manager.user_connections(user_id):
+                continue
+            if message["type"] == "members_added":
+                self.manager.subscribe(user_id, topic)
+            else:
+                self.manager.unsubscribe(user_id, topic)
+
+    async def dispatch(self, channel: str, message: dict):
+        """Route a message received on a Redis channel to local sockets."""
+        if message.get("type") in ("members_added", "members_removed") and message.get("project_id"):
+            self._apply_membership(message)
         
-        # Clean up disconnected clients
-        for user_id in disconnected:
-            self.disconnect(user_id)
-
-    
-    async def listen_to_redis(self, websocket: WebSocket, user_id: str):
-        """Listen to Redis Pub/Sub and forward messages to WebSocket client."""
-        # Subscribe to all channels
-        pubsub = await redis_client.subscribe(*self.subscribed_channels)
+        topics = self.topics_for(message)
+        if topics is None:
+            await self.broadcast(message)
+        else:
+            self._send(self.manager.topic_connections(topics), message)
         
+        if message.get("type") == "project_deleted" and message.get("project_id"):
+            self.manager.drop_topic(project_topic(message["project_id"]))
+
+    @staticmethod
+    def _decode(data: Any) -> dict:
         try:
-            while True:
-                # Use pubsub to get messages from subscribed channels
-                message = await pubsub.get_message(timeout=1.0)
-                
-                if message and message.get('type') == 'message':
+            message = json.loads(data)
+        except (TypeError, json.JSONDecodeError):
+            message = None
+        if not isinstance(message, dict):
+            # If not a JSON object, send as plain text
+            return {"type": "notification", "message": data}
+        return message
+
+    @classmethod
+    def _decode_entry(cls, entry_id: str, fields: dict) -> dict:
+        message = cls._decode(fields.get("data"))
+        message["event_id"] = entry_id
+        return message
+
+    async def _listen(self):
+        """Tail the event stream and dispatch; resume after the last id on errors."""
+        last_id = "$"
+        while True:
+            try:
+                streams = await redis_client.redis.xread(
+                    {EVENT_STREAM: last_id}, count=settings.OUTBOX_BATCH_SIZE, block=5000
+                )
+                for _, entries in streams or ():
+                    for entry_id, fields in entries:
+                        last_id = entry_id
+                        try:
+                            await self.dispatch(fields.get("channel"), self._decode_entry(entry_id, fields))
+                        except Exception as e:
+                            print(f"Error dispatching event {entry_id}: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis stream reader error, retrying: {e}")
+                await asyncio.sleep(1)
+
+    async def _listen_direct(self):
+        """Deliver messages other workers route to this worker's local users."""
+        channel = worker_channel(self.presence.worker_id)
+        while True:
+            pubsub = redis_client.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(channel)
+                async for item in pubsub.listen():
+                    if item.get('type') != 'message':
+                        continue
                     try:
-                        data = json.loads(message['data'])
-                        await self.send_personal_message(user_id, data)
-                    except json.JSONDecodeError:
-                        # If not JSON, send as plain text
-                        await self.send_personal_message(user_id, {
-                            "type": "notification",
-                            "message": message['data']
-                        })
-                
-                # Small delay to prevent CPU spinning
-                await asyncio.sleep(0.1)
-                
-        except Exception as e:
-            print(f"Error in Redis listener for user {user_id}: {e}")
-        finally:
-            # Cleanup
-            await pubsub.unsubscribe(*self.subscribed_channels)
-            self.disconnect(user_id)
-    
-    
+                        envelope = json.loads(item['data'])
+                        self._send(self.manager.user_connections(str(envelope["user_id"])), envelope["message"])
+                        self.direct_received += 1
+                    except Exception as e:
+                        print(f"Error delivering direct message: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Redis direct channel error, reconnecting: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
     async def publish_notification(self, channel: str, message: dict):
-        """Publish a notification to a Redis channel."""
-        await redis_client.publish(channel, message)
+        """Append a notification to the event stream."""
+        try:
+            await append_event(redis_client.redis, channel, message)
+        except Exception as e:
+            print(f"Error publishing to {channel}: {e}")
 
 
 # Global notification service instance
-notification_service = NotificationService()
\ No newline at end of file
+notification_service = NotificationService()
@@ -0,0 +1,121 @@
+import asyncio
+from typing import Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, delete, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.database import AsyncSessionLocal, TrackedSession
+from app.models.outbox import OutboxEvent
+from app.services.notification_service import append_event
+
+
+class OutboxService:
+    """Records domain events in the caller's transaction."""
+
+    @staticmethod
+    def add(db: AsyncSession, channel: str, event: dict):
+        """Queue an event for `channel`; it is written when the session commits."""
+        db.add(OutboxEvent(channel=channel, payload=jsonable_encoder(event)))
+        db.info["outbox"] = True
+
+    @staticmethod
+    def add_many(db: AsyncSession, channel: str, events: Iterable[dict]):
+        for e in events:
+            OutboxService.add(db, channel, e)
+
+
+class OutboxRelay:
+    """Background task that publishes committed outbox events to Redis.
+
+    Each pass claims a batch with FOR UPDATE SKIP LOCKED (so every worker can
+    run a relay), appends it to the event stream through one pipeline and
+    deletes the rows in
+    the same transaction. A crash between publish and commit republishes the
+    batch: delivery is at least once. The relay wakes immediately when this
+    process commits events and polls for events committed by other workers.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self.published = 0
+        self.failures = 0
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def start(self):
+        if self._task is None and redis_client.redis is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def drain(self, limit: int) -> int:
+        """Publish up to `limit` pending events; return how many were sent."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxEvent.id, OutboxEvent.channel, OutboxEvent.payload)
+                .order_by(OutboxEvent.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            pipe = redis_client.redis.pipeline(transaction=False)
+            for row in rows:
+                append_event(pipe, row.channel, row.payload)
+            await pipe.execute()
+
+            await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+            await db.commit()
+        self.published += len(rows)
+        return len(rows)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                sent = await self.drain(settings.OUTBOX_BATCH_SIZE)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Outbox relay error: {e}")
+                self.failures += 1
+                sent = 0
+                await asyncio.sleep(settings.OUTBOX_POLL_INTERVAL)
+            if sent >= settings.OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {"published": self.published, "failures": self.failures}
+
+
+# Global outbox relay instance
+outbox_relay = OutboxRelay()
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _wake_relay(session):
+    if session.info.pop("outbox", False):
+        outbox_relay.notify()
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _forget_events(session):
+    session.info.pop("outbox", None)
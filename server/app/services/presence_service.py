@@ -0,0 +1,121 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Callable, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+
+def presence_key(user_id: str) -> str:
+    return f"presence:{user_id}"
+
+
+def worker_channel(worker_id: str) -> str:
+    """Pub/Sub channel a worker listens on for messages to its local users."""
+    return f"worker:{worker_id}"
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class PresenceRegistry:
+    """Redis registry of which workers hold sockets for which users.
+
+    Each user has a hash `presence:<user_id>` mapping worker id to that
+    worker's last heartbeat. Workers add themselves when a user's first local
+    socket opens, remove themselves when the last one closes, and refresh
+    every local user every PRESENCE_HEARTBEAT_INTERVAL seconds. Entries older
+    than PRESENCE_TTL are ignored (and pruned), so a crashed worker drops out
+    of the registry on its own; the key also expires once no worker refreshes
+    it.
+    """
+
+    def __init__(self, local_users: Callable[[], Iterable[str]], worker_id: Optional[str] = None):
+        self.worker_id = worker_id or new_worker_id()
+        self._local_users = local_users
+        self._task: Optional[asyncio.Task] = None
+        self.heartbeats = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return redis_client.redis is not None
+
+    async def start(self):
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.enabled:
+            try:
+                pipe = redis_client.redis.pipeline(transaction=False)
+                for user_id in list(self._local_users()):
+                    pipe.hdel(presence_key(user_id), self.worker_id)
+                await pipe.execute()
+            except Exception as e:
+                print(f"Error clearing presence for worker {self.worker_id}: {e}")
+
+    async def register(self, user_id: str):
+        """Record that this worker holds a socket for `user_id`."""
+        if self.enabled:
+            pipe = redis_client.redis.pipeline(transaction=False)
+            self._touch(pipe, user_id, time.time())
+            await pipe.execute()
+
+    async def unregister(self, user_id: str):
+        """Record that this worker no longer holds a socket for `user_id`."""
+        if self.enabled:
+            await redis_client.redis.hdel(presence_key(user_id), self.worker_id)
+
+    def _touch(self, pipe, user_id: str, now: float):
+        key = presence_key(user_id)
+        pipe.hset(key, self.worker_id, now)
+        pipe.expire(key, settings.PRESENCE_TTL)
+
+    async def heartbeat(self):
+        """Refresh every local user's entry in one pipeline."""
+        users = list(self._local_users())
+        if not users:
+            return
+        now = time.time()
+        pipe = redis_client.redis.pipeline(transaction=False)
+        for user_id in users:
+            self._touch(pipe, user_id, now)
+        await pipe.execute()
+        self.heartbeats += 1
+
+    async def workers_for(self, user_id: str) -> List[str]:
+        """Workers with a live entry for `user_id`; stale entries are pruned."""
+        entries = await redis_client.redis.hgetall(presence_key(user_id))
+        cutoff = time.time() - settings.PRESENCE_TTL
+        live, stale = [], []
+        for worker_id, seen in entries.items():
+            (live if float(seen) >= cutoff else stale).append(worker_id)
+        if stale:
+            await redis_client.redis.hdel(presence_key(user_id), *stale)
+        return live
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.PRESENCE_HEARTBEAT_INTERVAL)
+            try:
+                await self.heartbeat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Presence heartbeat error: {e}")
+                self.failures += 1
+
+    def stats(self) -> dict:
+        return {"worker_id": self.worker_id, "heartbeats": self.heartbeats, "failures": self.failures}
@@ -1,17 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete, any_, bindparam
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import joinedload
+from pydantic import TypeAdapter
 from uuid import UUID
 from typing import List, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException
 
 from app.models.user import User
-from app.models.project import Project
-from app.models.task import Task
+from app.models.project import Project, project_members
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.models.task_counter import ProjectStatusCount
+from app.core.pagination import apply_keyset
+from app.services.task_counter_service import TaskCounterService
+from app.services.dashboard_cache import DashboardCache
+from app.core.cache import response_cache
+from app.services.outbox_service import OutboxService
+from app.services.activity_log_service import ActivityLogService
+
+# Columns a ProjectResponse is built from, with the creator's name joined in SQL
+PROJECT_RESPONSE_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.deadline,
+    Project.status,
+    Project.created_by,
+    User.name.label("creator_name"),
+    Project.created_at,
+    Project.updated_at,
+)
+
+project_list_adapter = TypeAdapter(List[ProjectResponse])
+
+
+def project_response_query():
+    return select(*PROJECT_RESPONSE_COLUMNS).join(User, User.id == Project.created_by)
+
+
+def member_projects(user_id):
+    """Ids of the projects `user_id` belongs to, for an IN filter.
+
+    Reads `project_members` alone; `Project.members.any(...)` also joins
+    `users` inside its EXISTS.
+    """
+    return select(project_members.c.project_id).where(project_members.c.user_id == user_id)
+
 
 class ProjectService:
+    @staticmethod
+    async def _invalidate_caches(project_id: Optional[UUID], member_ids: List[UUID], tasks: bool = False):
+        """Drop cached reads affected by a write to a project or its membership."""
+        await DashboardCache.invalidate_users(member_ids)
+        tags = ["projects"]
+        if project_id:
+            tags.append(f"project:{project_id}")
+            if tasks:
+                tags += ["tasks", f"project:{project_id}:tasks"] + [f"user:{u}:tasks" for u in member_ids]
+        await response_cache.invalidate(*tags)
+
+    @staticmethod
+    def _event_fields(project: Project) -> dict:
+        """Project fields carried by websocket events."""
+        return {
+            "project_id": project.id,
+            "project": {
+                "id": project.id,
+                "name": project.name,
+                "description": project.description,
+                "deadline": project.deadline,
+                "status": project.status,
+                "created_by": project.created_by,
+            },
+        }
+
     @staticmethod
     async def get_projects(
         db: AsyncSession,
@@ -19,9 +82,10 @@ class ProjectService:
         skip: int = 0,
         limit: int = 100,
         status: Optional[str] = None,
-        query: Optional[str] = None
+        query: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[ProjectResponse]:
-        query_stmt = select(Project).options(joinedload(Project.creator))
+        query_stmt = project_response_query()
         if status:
             query_stmt = query_stmt.where(Project.status == status)
         if query:
@@ -29,86 +93,79 @@ class ProjectService:
         
         # Filter for non-admin users: only projects where user is a member
         if current_user['role'] != "admin":
-            query_stmt = query_stmt.where(Project.members.any(User.id == current_user['id']))  # Assuming many-to-many relationship
+            query_stmt = query_stmt.where(Project.id.in_(member_projects(current_user['id'])))
         
-        query_stmt = query_stmt.offset(skip).limit(limit)
+        # Keyset pagination when a cursor is given ("" = first page), offset otherwise
+        if cursor is not None:
+            query_stmt = apply_keyset(query_stmt, Project, cursor, limit)
+        else:
+            query_stmt = query_stmt.offset(skip).limit(limit)
         result = await db.execute(query_stmt)
-        projects = result.unique().scalars().all()
-        return [
-            ProjectResponse(
-                id=p.id,
-                name=p.name,
-                description=p.description,
-                deadline=p.deadline,
-                status=p.status,
-                created_by=p.created_by,
-                creator_name=p.creator.name,
-                created_at=p.created_at,
-                updated_at=p.updated_at
-            ) for p in projects
-        ]
+        return project_list_adapter.validate_python(result.all(), from_attributes=True)
 
     @staticmethod
     async def get_project(db: AsyncSession, project_id: UUID, current_user: User) -> Optional[ProjectResponse]:
-        query = select(Project).options(joinedload(Project.creator)).where(Project.id == project_id)
+        query = project_response_query().where(Project.id == project_id)
         
         # Filter for non-admin users
         if current_user['role'] != "admin":
-            query = query.where(Project.members.any(User.id == current_user['id']))
+            query = query.where(Project.id.in_(member_projects(current_user['id'])))
         
         result = await db.execute(query)
-        project = result.unique().scalar_one_or_none()
-        if not project:
+        row = result.one_or_none()
+        if row is None:
             return None
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            deadline=project.deadline,
-            status=project.status,
-            created_by=project.created_by,
-            creator_name=project.creator.name,
-            created_at=project.created_at,
-            updated_at=project.updated_at
-        )
+        return ProjectResponse.model_validate(row, from_attributes=True)
 
     @staticmethod
-    async def get_project_progress(db: AsyncSession, project_id: UUID, current_user: User) -> Optional[dict]:
-        # First check access
-        project = await ProjectService.get_project(db, project_id, current_user)
-        if not project:
-            return None
-        
-        # Calculate progress based on tasks
-        total_tasks = await db.execute(
-            select(func.count(Task.id)).where(Task.project_id == project_id)
-        )
-        total = total_tasks.scalar() or 0
-        
-        completed_tasks = await db.execute(
-            select(func.count(Task.id)).where(Task.project_id == project_id).where(Task.status == "done")
-        )
-        completed = completed_tasks.scalar() or 0
-        
-        in_progress_tasks = await db.execute(
-            select(func.count(Task.id)).where(Task.project_id == project_id).where(Task.status == "in_progress")
-        )
-        in_progress = in_progress_tasks.scalar() or 0
+    async def get_projects_progress(db: AsyncSession, project_ids: List[UUID], current_user: User) -> List[dict]:
+        """Progress for many projects in one grouped aggregate.
+
+        Reads the per-(project, status) counter rows rather than the tasks
+        table. Projects the user cannot access are silently omitted.
+        """
+        if not project_ids:
+            return []
         
-        todo_tasks = await db.execute(
-            select(func.count(Task.id)).where(Task.project_id == project_id).where(Task.status == "todo")
+        count = ProjectStatusCount.count
+        query = (
+            select(
+                Project.id,
+                Project.name,
+                func.coalesce(func.sum(count), 0).label("total"),
+                func.coalesce(func.sum(count).filter(ProjectStatusCount.status == "done"), 0).label("completed"),
+                func.coalesce(func.sum(count).filter(ProjectStatusCount.status == "in_progress"), 0).label("in_progress"),
+                func.coalesce(func.sum(count).filter(ProjectStatusCount.status == "todo"), 0).label("todo"),
+            )
+            .outerjoin(ProjectStatusCount, ProjectStatusCount.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+            .group_by(Project.id, Project.name)
         )
-        todo = todo_tasks.scalar() or 0
         
-        progress_percentage = (completed / total * 100) if total > 0 else 0
+        # Filter for non-admin users
+        if current_user['role'] != "admin":
+            query = query.where(Project.members.any(User.id == current_user['id']))
         
-        return {
-            "total_tasks": total,
-            "completed_tasks": completed,
-            "in_progress_tasks": in_progress,
-            "todo_tasks": todo,
-            "progress_percentage": round(progress_percentage, 2)
-        }
+        result = await db.execute(query)
+        progress = []
+        for row in result.all():
+            progress_percentage = (row.completed / row.total * 100) if row.total > 0 else 0
+            progress.append({
+                "project_id": row.id,
+                "project_name": row.name,
+                "total_tasks": row.total,
+                "completed_tasks": row.completed,
+                "in_progress_tasks": row.in_progress,
+                "todo_tasks": row.todo,
+                "progress_percentage": round(progress_percentage, 2)
+            })
+        return progress
+
+    @staticmethod
+    async def get_project_progress(db: AsyncSession, project_id: UUID, current_user: User) -> Optional[dict]:
+        # Access check and task counts in a single round trip
+        progress = await ProjectService.get_projects_progress(db, [project_id], current_user)
+        return progress[0] if progress else None
 
     @staticmethod
     async def create_project(db: AsyncSession, project_data: ProjectCreate, current_user: User) -> dict:
@@ -117,8 +174,12 @@ class ProjectService:
         
         project = Project(**project_data.dict(), created_by=current_user['id'])
         db.add(project)
+        await db.flush()
+        OutboxService.add(db, "project_updates", {"type": "project_created", **ProjectService._event_fields(project)})
+        ActivityLogService.add(db, current_user, "project_created", "project", project.id, project.id)
         await db.commit()
         await db.refresh(project)
+        await ProjectService._invalidate_caches(project.id, [])
         return {'message' : "Project Created"}
 
     @staticmethod
@@ -139,12 +200,16 @@ class ProjectService:
         if not project:
             return None
         
-        for key, value in project_data.dict(exclude_unset=True).items():
+        changes = project_data.dict(exclude_unset=True)
+        for key, value in changes.items():
             setattr(project, key, value)
         project.updated_at = datetime.now(timezone.utc)
+        OutboxService.add(db, "project_updates", {"type": "project_updated", **ProjectService._event_fields(project)})
+        ActivityLogService.add(db, current_user, "project_updated", "project", project.id, project.id, {"changes": changes})
         
         await db.commit()
         await db.refresh(project)
+        await ProjectService._invalidate_caches(project_id, await DashboardCache.project_member_ids(db, project_id))
         return ProjectResponse(
             id=project.id,
             name=project.name,
@@ -168,49 +233,106 @@ class ProjectService:
         if not project:
             return False
         
+        member_ids = await DashboardCache.project_member_ids(db, project_id)
+        await TaskCounterService.remove_project(db, project_id)
+        OutboxService.add(db, "project_updates", {"type": "project_deleted", "project_id": project_id})
+        ActivityLogService.add(db, current_user, "project_deleted", "project", project_id, project_id)
         await db.delete(project)
         await db.commit()
+        await ProjectService._invalidate_caches(project_id, member_ids, tasks=True)
         return True
 
     @staticmethod
-    async def add_member_to_project(db: AsyncSession, project_id: UUID, user_id: UUID, current_user: User) -> bool:
+    def _user_ids_param(user_ids: List[UUID]):
+        """Bind a list of user ids as a single uuid[] parameter for `= ANY(...)`."""
+        return bindparam("user_ids", list(user_ids), type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True)))
+
+    @staticmethod
+    async def _existing_user_ids(db: AsyncSession, user_ids: List[UUID]) -> set:
+        result = await db.execute(select(User.id).where(User.id == any_(ProjectService._user_ids_param(user_ids))))
+        return set(result.scalars().all())
+
+    @staticmethod
+    async def add_members(db: AsyncSession, project_id: UUID, user_ids: List[UUID], current_user: User) -> Optional[dict]:
+        """Add many users to a project with one INSERT ... ON CONFLICT DO NOTHING.
+
+        Works on `project_members` directly instead of loading the member
+        collection. Returns None when the project does not exist.
+        """
         if current_user['role'] != "admin":
             raise HTTPException(status_code=403, detail="Only admins can assign members to projects")
         
-        result = await db.execute(select(Project).options(joinedload(Project.members)).where(Project.id == project_id))
-        project = result.unique().scalar_one_or_none()
-        if not project:
-            return False
+        if not await db.scalar(select(Project.id).where(Project.id == project_id)):
+            return None
         
-        user = await db.get(User, user_id)
-        if not user:
-            return False
+        user_ids = list(dict.fromkeys(user_ids))
+        existing = await ProjectService._existing_user_ids(db, user_ids)
+        added = []
+        if existing:
+            stmt = (
+                postgresql.insert(project_members)
+                .values([{"project_id": project_id, "user_id": u} for u in user_ids if u in existing])
+                .on_conflict_do_nothing()
+                .returning(project_members.c.user_id)
+            )
+            result = await db.execute(stmt)
+            added = list(result.scalars().all())
         
-        if user not in project.members:
-            project.members.append(user)
+        if added:
+            OutboxService.add(db, "project_updates", {"type": "members_added", "project_id": project_id, "user_ids": added})
+            ActivityLogService.add(db, current_user, "members_added", "project", project_id, project_id, {"user_ids": added})
             await db.commit()
-        
-        return True
+            await ProjectService._invalidate_caches(project_id, added)
+        changed = set(added)
+        return {
+            "added": added,
+            "already_members": [u for u in user_ids if u in existing and u not in changed],
+            "not_found": [u for u in user_ids if u not in existing],
+        }
 
     @staticmethod
-    async def remove_member_from_project(db: AsyncSession, project_id: UUID, user_id: UUID, current_user: User) -> bool:
+    async def remove_members(db: AsyncSession, project_id: UUID, user_ids: List[UUID], current_user: User) -> Optional[dict]:
+        """Remove many users from a project with one DELETE ... WHERE user_id = ANY(...).
+
+        Returns None when the project does not exist.
+        """
         if current_user['role'] != "admin":
             raise HTTPException(status_code=403, detail="Only admins can remove members from projects")
         
-        result = await db.execute(select(Project).options(joinedload(Project.members)).where(Project.id == project_id))
-        project = result.unique().scalar_one_or_none()
-        if not project:
-            return False
+        if not await db.scalar(select(Project.id).where(Project.id == project_id)):
+            return None
         
-        user = await db.get(User, user_id)
-        if not user:
-            return False
+        user_ids = list(dict.fromkeys(user_ids))
+        existing = await ProjectService._existing_user_ids(db, user_ids)
+        result = await db.execute(
+            delete(project_members)
+            .where(project_members.c.project_id == project_id)
+            .where(project_members.c.user_id == any_(ProjectService._user_ids_param(user_ids)))
+            .returning(project_members.c.user_id)
+        )
+        removed = list(result.scalars().all())
         
-        if user in project.members:
-            project.members.remove(user)
+        if removed:
+            OutboxService.add(db, "project_updates", {"type": "members_removed", "project_id": project_id, "user_ids": removed})
+            ActivityLogService.add(db, current_user, "members_removed", "project", project_id, project_id, {"user_ids": removed})
             await db.commit()
-        
-        return True
+            await ProjectService._invalidate_caches(project_id, removed)
+        changed = set(removed)
+        return {
+            "removed": removed,
+            "not_members": [u for u in user_ids if u in existing and u not in changed],
+            "not_found": [u for u in user_ids if u not in existing],
+        }
+
+    @staticmethod
+    async def add_member_to_project(db: AsyncSession, project_id: UUID, user_id: UUID, current_user: User) -> bool:
+        result = await ProjectService.add_members(db, project_id, [user_id], current_user)
+        return bool(result) and not result["not_found"]
+
+    @staticmethod
+    async def remove_member_from_project(db: AsyncSession, project_id: UUID, user_id: UUID, current_user: User) -> bool:
+        result = await ProjectService.remove_members(db, project_id, [user_id], current_user)
+        return bool(result) and not result["not_found"]
 
     @staticmethod
     async def get_project_members(db: AsyncSession, project_id: UUID, current_user: User, search: Optional[str] = None) -> List[dict]:
@@ -0,0 +1,230 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, delete, func, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal, utcnow
+from app.models.enums import TaskStatus
+from app.models.project import Project
+from app.models.report_snapshot import AssigneeCycleDaily, ProjectStatusDaily
+from app.models.task import Task
+from app.models.task_counter import ProjectStatusCount
+from app.models.user import User
+from app.services.project_service import member_projects
+
+# Serializes snapshots taken by several workers and the script
+SNAPSHOT_LOCK = "SELECT pg_advisory_xact_lock(hashtext('report_snapshots'))"
+
+
+def today() -> date:
+    return utcnow().date()
+
+
+def _hours(seconds: Optional[float], count: Optional[int]) -> Optional[float]:
+    return round(seconds / count / 3600, 2) if count else None
+
+
+class ReportService:
+    """Daily report series: written by snapshots, read by the burndown and cycle-time reports."""
+
+    @staticmethod
+    async def take_snapshot(db: AsyncSession, cycle_days: int = 2) -> dict:
+        """Record today's per-project status counts and refresh recent cycle times.
+
+        Status counts are copied from the task counter table, so a snapshot
+        costs one row per project and status however many tasks there are.
+        Taking it again the same day overwrites that day's rows; past days
+        cannot be re-taken. Cycle times are recomputed from the tasks'
+        `completed_at` for the last `cycle_days` days (including today).
+        """
+        day = today()
+        await db.execute(text(SNAPSHOT_LOCK))
+        # Replaced rather than upserted: a counter that dropped to zero may
+        # have no row any more (see TaskCounterService.rebuild)
+        await db.execute(delete(ProjectStatusDaily).where(ProjectStatusDaily.day == day))
+        counts = select(
+            literal(day, Date), ProjectStatusCount.project_id, ProjectStatusCount.status, ProjectStatusCount.count
+        ).where(ProjectStatusCount.count != 0)
+        result = await db.execute(
+            insert(ProjectStatusDaily).from_select(["day", "project_id", "status", "count"], counts)
+        )
+        status_rows = result.rowcount
+
+        first = day - timedelta(days=max(cycle_days, 1) - 1)
+        await db.execute(delete(AssigneeCycleDaily).where(AssigneeCycleDaily.day >= first))
+        # Inlined so the GROUP BY expression matches the selected one
+        completed_on = func.date(func.timezone(literal_column("'UTC'"), Task.completed_at))
+        cycle = select(
+            completed_on,
+            Task.project_id,
+            Task.assigned_to,
+            func.count(),
+            func.sum(func.extract("epoch", Task.completed_at - Task.created_at)),
+            func.count(Task.started_at),
+            func.coalesce(func.sum(func.extract("epoch", Task.completed_at - Task.started_at)), 0),
+        ).where(
+            Task.completed_at >= datetime.combine(first, time.min, tzinfo=timezone.utc),
+            Task.assigned_to.isnot(None),
+        ).group_by(completed_on, Task.project_id, Task.assigned_to)
+        result = await db.execute(insert(AssigneeCycleDaily).from_select(
+            ["day", "project_id", "user_id", "completed", "cycle_seconds", "active_completed", "active_seconds"],
+            cycle,
+        ))
+        await db.commit()
+        return {"day": day, "project_status_rows": status_rows, "cycle_time_rows": result.rowcount}
+
+    @staticmethod
+    async def get_burndown(db: AsyncSession, project_id: UUID, current_user: dict, days: int = 30) -> Optional[dict]:
+        """Daily task counts by status for the last `days` days, or None without access.
+
+        Past days come from the snapshots (days without one are left out);
+        today comes from the live counters.
+        """
+        query = select(Project.id, Project.name).where(Project.id == project_id)
+        if current_user['role'] != "admin":
+            query = query.where(Project.id.in_(member_projects(current_user['id'])))
+        project = (await db.execute(query)).one_or_none()
+        if project is None:
+            return None
+
+        day = today()
+        series = defaultdict(dict)
+        result = await db.execute(
+            select(ProjectStatusDaily.day, ProjectStatusDaily.status, ProjectStatusDaily.count)
+            .where(ProjectStatusDaily.project_id == project_id)
+            .where(ProjectStatusDaily.day >= day - timedelta(days=days - 1), ProjectStatusDaily.day < day)
+        )
+        for row in result.all():
+            series[row.day][row.status] = row.count
+        result = await db.execute(
+            select(ProjectStatusCount.status, ProjectStatusCount.count)
+            .where(ProjectStatusCount.project_id == project_id)
+        )
+        series[day] = {row.status: row.count for row in result.all()}
+
+        points = []
+        for point_day in sorted(series):
+            counts = series[point_day]
+            todo = counts.get(TaskStatus.todo, 0)
+            in_progress = counts.get(TaskStatus.in_progress, 0)
+            done = counts.get(TaskStatus.done, 0)
+            points.append({
+                "day": point_day,
+                "todo": todo,
+                "in_progress": in_progress,
+                "done": done,
+                "total": todo + in_progress + done,
+                "remaining": todo + in_progress,
+            })
+        return {"project_id": project.id, "project_name": project.name, "points": points}
+
+    @staticmethod
+    async def get_cycle_times(
+        db: AsyncSession,
+        current_user: dict,
+        days: int = 30,
+        project_id: Optional[UUID] = None
+    ) -> List[dict]:
+        """Average todo→done and in_progress→done time per assignee over the last `days` days.
+
+        Admins see every assignee; other users only their own row.
+        """
+        daily = AssigneeCycleDaily
+        query = (
+            select(
+                User.id,
+                User.name,
+                func.sum(daily.completed).label("completed"),
+                func.sum(daily.cycle_seconds).label("cycle_seconds"),
+                func.sum(daily.active_completed).label("active_completed"),
+                func.sum(daily.active_seconds).label("active_seconds"),
+            )
+            .join(daily, daily.user_id == User.id)
+            .where(daily.day >= today() - timedelta(days=days - 1))
+            .group_by(User.id, User.name)
+            .order_by(User.name)
+        )
+        if project_id:
+            query = query.where(daily.project_id == project_id)
+        if current_user['role'] != "admin":
+            query = query.where(daily.user_id == current_user['id'])
+
+        result = await db.execute(query)
+        return [
+            {
+                "user_id": str(row.id),
+                "user_name": row.name,
+                "completed_tasks": row.completed,
+                "avg_cycle_hours": _hours(row.cycle_seconds, row.completed),
+                "avg_active_hours": _hours(row.active_seconds, row.active_completed),
+            }
+            for row in result.all()
+        ]
+
+
+class SnapshotScheduler:
+    """Background task taking the report snapshot every REPORT_SNAPSHOT_INTERVAL seconds.
+
+    The first snapshot is taken on start, and one at 23:59 UTC closes each
+    day. Every worker runs one; the advisory lock serializes them and the
+    snapshot is idempotent within a day.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.snapshots = 0
+        self.failures = 0
+        self.last_snapshot: Optional[datetime] = None
+
+    async def start(self):
+        if self._task is None and settings.REPORT_SNAPSHOT_INTERVAL > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @staticmethod
+    def _next_delay() -> float:
+        now = utcnow()
+        close = datetime.combine(now.date(), time(23, 59), tzinfo=timezone.utc)
+        delay = settings.REPORT_SNAPSHOT_INTERVAL
+        if now < close:
+            delay = min(delay, (close - now).total_seconds())
+        return delay
+
+    async def _run(self):
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await ReportService.take_snapshot(db)
+                self.snapshots += 1
+                self.last_snapshot = utcnow()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Report snapshot error: {e}")
+                self.failures += 1
+            await asyncio.sleep(self._next_delay())
+
+    def stats(self) -> dict:
+        return {
+            "snapshots": self.snapshots,
+            "failures": self.failures,
+            "last_snapshot": self.last_snapshot.isoformat() if self.last_snapshot else None,
+        }
+
+
+# Global report snapshot scheduler instance
+snapshot_scheduler = SnapshotScheduler()
@@ -0,0 +1,159 @@
+import re
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import Float, cast, func, literal, literal_column, null, or_, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_rank_cursor
+from app.models.project import Project, project_members
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.search import SearchResult
+from app.services.project_service import member_projects
+
+# Text search configuration of the stored search documents (see the
+# Computed columns on Task and Project). Inlined: a bound parameter would be
+# sent as varchar, which does not cast to regconfig.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# Substring matching uses the trigram indexes, which need at least three
+# characters to narrow anything down
+MIN_SUBSTRING_LENGTH = 3
+
+search_result_adapter = TypeAdapter(List[SearchResult])
+
+
+def prefix_tsquery(q: str) -> Optional[str]:
+    """Build a tsquery matching every word of `q` as a prefix: 'api ref' -> 'api:* & ref:*'."""
+    words = re.findall(r"\w+", q.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def contains_pattern(q: str) -> str:
+    """ILIKE pattern matching `q` anywhere; wildcards are escaped with backslash, the default escape."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _match(q: str, tsquery: Optional[str], document=None, names=()):
+    """The filter and rank for one table, or None if the query can't use its indexes.
+
+    Matches the full-text `document` by word prefix and the `names` columns
+    by substring. The rank is the best of the full-text rank (normalized to
+    0..1) and the trigram similarity of each name, so both kinds of match
+    sort together.
+    """
+    conditions, ranks = [], []
+    if document is not None and tsquery:
+        ts = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        conditions.append(document.op("@@")(ts))
+        ranks.append(func.ts_rank_cd(document, ts, 32))
+    if len(q) >= MIN_SUBSTRING_LENGTH:
+        for column in names:
+            conditions.append(column.ilike(contains_pattern(q)))
+            ranks.append(func.similarity(column, q))
+    if not conditions:
+        return None
+    return or_(*conditions), cast(func.greatest(*ranks), Float)
+
+
+class SearchService:
+    @staticmethod
+    def _task_query(current_user: dict, q: str, tsquery: Optional[str]):
+        match = _match(q, tsquery, Task.search_vector, [Task.title])
+        if match is None:
+            return None
+        condition, rank = match
+        query = select(
+            literal("task").label("type"),
+            Task.id.label("id"),
+            Task.title.label("title"),
+            Task.description.label("description"),
+            Task.project_id.label("project_id"),
+            rank.label("rank"),
+        ).where(condition)
+        # Same rule as task listings: non-admins see only their own tasks
+        if current_user['role'] != "admin":
+            query = query.where(Task.assigned_to == current_user['id'])
+        return query
+
+    @staticmethod
+    def _project_query(current_user: dict, q: str, tsquery: Optional[str]):
+        match = _match(q, tsquery, Project.search_vector, [Project.name])
+        if match is None:
+            return None
+        condition, rank = match
+        query = select(
+            literal("project").label("type"),
+            Project.id.label("id"),
+            Project.name.label("title"),
+            Project.description.label("description"),
+            Project.id.label("project_id"),
+            rank.label("rank"),
+        ).where(condition)
+        if current_user['role'] != "admin":
+            query = query.where(Project.id.in_(member_projects(current_user['id'])))
+        return query
+
+    @staticmethod
+    def _user_query(current_user: dict, q: str, tsquery: Optional[str]):
+        match = _match(q, tsquery, names=[User.name, User.email])
+        if match is None:
+            return None
+        condition, rank = match
+        query = select(
+            literal("user").label("type"),
+            User.id.label("id"),
+            User.name.label("title"),
+            User.email.label("description"),
+            cast(null(), PGUUID(as_uuid=True)).label("project_id"),
+            rank.label("rank"),
+        ).where(condition)
+        # Non-admins find the people they share a project with
+        if current_user['role'] != "admin":
+            query = query.where(User.id.in_(
+                select(project_members.c.user_id)
+                .where(project_members.c.project_id.in_(member_projects(current_user['id'])))
+            ))
+        return query
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        current_user: dict,
+        q: str,
+        type: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Ranked search over tasks, projects and users the caller can see.
+
+        Tasks and projects match on their full-text documents (each word of
+        `q` as a prefix) and on a substring of the task title or project
+        name; users on a substring of their name or email. All matches are
+        merged into one list ordered by rank, then type and id, and paged
+        with a cursor on that key.
+        """
+        q = q.strip()
+        tsquery = prefix_tsquery(q)
+        builders = {
+            "task": SearchService._task_query,
+            "project": SearchService._project_query,
+            "user": SearchService._user_query,
+        }
+        parts = [
+            query for kind, build in builders.items()
+            if type in (None, kind) and (query := build(current_user, q, tsquery)) is not None
+        ]
+        if not parts:
+            return []
+
+        results = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("results")
+        query = select(results).order_by(results.c.rank.desc(), results.c.type.desc(), results.c.id.desc())
+        if cursor:
+            rank, kind, id = decode_rank_cursor(cursor)
+            query = query.where(tuple_(results.c.rank, results.c.type, results.c.id) < tuple_(rank, kind, id))
+        result = await db.execute(query.limit(limit))
+        return search_result_adapter.validate_python(result.all(), from_attributes=True)
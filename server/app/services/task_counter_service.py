@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.models.task_counter import ProjectStatusCount, AssigneeStatusCount, AssigneePriorityCount
+from app.models.enums import TaskStatus, TaskPriority
+
+# (project_id, assigned_to, status, priority)
+TaskCounterKey = Tuple[UUID, Optional[UUID], TaskStatus, TaskPriority]
+
+# (counter model, key columns, function mapping a task key to a counter key or None)
+COUNTERS = [
+    (ProjectStatusCount, ("project_id", "status"), lambda k: (k[0], k[2])),
+    (AssigneeStatusCount, ("user_id", "status"), lambda k: (k[1], k[2]) if k[1] else None),
+    (AssigneePriorityCount, ("user_id", "priority"), lambda k: (k[1], k[3]) if k[1] else None),
+]
+
+
+class TaskCounterService:
+    """Keeps the denormalized task counter tables in step with task writes."""
+
+    @staticmethod
+    def snapshot(task: Task) -> TaskCounterKey:
+        """Capture the counted attributes of a task."""
+        return (
+            task.project_id,
+            task.assigned_to,
+            TaskStatus(task.status or TaskStatus.todo),
+            TaskPriority(task.priority or TaskPriority.medium),
+        )
+
+    @staticmethod
+    async def apply(
+        db: AsyncSession,
+        before: List[TaskCounterKey],
+        after: List[TaskCounterKey],
+    ) -> None:
+        """Move counts from the `before` task states to the `after` states.
+
+        Pass `before=[]` for inserts and `after=[]` for deletes. Issues at
+        most one additive upsert per counter table, in the caller's
+        transaction.
+        """
+        for model, columns, key_of in COUNTERS:
+            deltas = Counter()
+            for key in after:
+                if key_of(key):
+                    deltas[key_of(key)] += 1
+            for key in before:
+                if key_of(key):
+                    deltas[key_of(key)] -= 1
+            rows = [
+                {columns[0]: k[0], columns[1]: k[1], "count": n}
+                for k, n in deltas.items() if n
+            ]
+            if not rows:
+                continue
+            stmt = insert(model).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(columns),
+                set_={"count": model.count + stmt.excluded.count},
+            )
+            await db.execute(stmt)
+
+    @staticmethod
+    async def remove_project(db: AsyncSession, project_id: UUID) -> None:
+        """Subtract a project's tasks from the counters before it is deleted."""
+        result = await db.execute(
+            select(Task.project_id, Task.assigned_to, Task.status, Task.priority)
+            .where(Task.project_id == project_id)
+            .with_for_update()
+        )
+        keys = [tuple(row) for row in result.all()]
+        await TaskCounterService.apply(db, keys, [])
+        await db.execute(delete(ProjectStatusCount).where(ProjectStatusCount.project_id == project_id))
+
+    @staticmethod
+    def _source_query(columns: Tuple[str, str]):
+        """GROUP BY over tasks that yields the rows of one counter table."""
+        source = Task.project_id if columns[0] == "project_id" else Task.assigned_to
+        if columns[1] == "status":
+            dimension = func.coalesce(Task.status, literal_column("'todo'"))
+        else:
+            dimension = func.coalesce(Task.priority, literal_column("'medium'"))
+        return (
+            select(source, dimension, func.count(Task.id))
+            .where(source.isnot(None))
+            .group_by(source, dimension)
+        )
+
+    @staticmethod
+    async def rebuild(db: AsyncSession) -> None:
+        """Recompute every counter from the tasks table.
+
+        Takes a SHARE lock on tasks so concurrent writes wait for the rebuild
+        to commit instead of racing it.
+        """
+        await db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+        for model, columns, _ in COUNTERS:
+            await db.execute(delete(model))
+            await db.execute(
+                insert(model).from_select(
+                    [columns[0], columns[1], "count"],
+                    TaskCounterService._source_query(columns),
+                )
+            )
+
+    @staticmethod
+    async def verify(db: AsyncSession) -> List[str]:
+        """Compare counters with the tasks table and describe any drift."""
+        problems = []
+        for model, columns, _ in COUNTERS:
+            result = await db.execute(TaskCounterService._source_query(columns))
+            expected = {(a, b): n for a, b, n in result.all()}
+            result = await db.execute(
+                select(getattr(model, columns[0]), getattr(model, columns[1]), model.count)
+            )
+            actual = {(a, b): n for a, b, n in result.all() if n}
+            for key in set(actual) | set(expected):
+                if actual.get(key, 0) != expected.get(key, 0):
+                    problems.append(
+                        f"{model.__tablename__} {key[0]}/{key[1].value}: "
+                        f"stored {actual.get(key, 0)}, actual {expected.get(key, 0)}"
+                    )
+        return problems
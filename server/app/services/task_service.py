@@ -1,26 +1,124 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from uuid import UUID
-from typing import List, Optional
+from sqlalchemy import select, insert, update, delete, tuple_, func
+from pydantic import TypeAdapter
+from uuid import UUID, uuid4
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from app.models.user import User
+from app.database import utcnow
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.models.enums import TaskStatus
+from app.models.project import Project, project_members
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskBulkUpdateItem
+from app.core.config import settings
+from app.core.export import encode_rows
+from app.core.pagination import apply_keyset
+from app.services.task_counter_service import TaskCounterService
+from app.services.dashboard_cache import DashboardCache
+from app.core.cache import response_cache
+from app.services.outbox_service import OutboxService
+from app.services.notification_service import task_topics
+from app.services.activity_log_service import ActivityLogService
+
+# Columns a TaskResponse is built from. Listings select only these and join
+# the assignee's name in SQL instead of loading whole User rows.
+TASK_RESPONSE_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.priority,
+    Task.status,
+    Task.deadline,
+    Task.project_id,
+    Task.assigned_to,
+    User.name.label("assigned_to_name"),
+    Task.created_at,
+    Task.updated_at,
+)
+
+# Every stored column but the search document, for INSERT/UPDATE ... RETURNING
+TASK_ROW_COLUMNS = tuple(c for c in Task.__table__.c if c.key != "search_vector")
+
+# Validates a whole result set in one call
+task_list_adapter = TypeAdapter(List[TaskResponse])
+
+
+def task_response_query():
+    return select(*TASK_RESPONSE_COLUMNS).outerjoin(User, User.id == Task.assigned_to)
+
 
 class TaskService:
     @staticmethod
-    async def get_tasks(
-        db: AsyncSession,
+    async def _invalidate_caches(task_ids: Iterable[UUID], project_ids: Iterable[UUID], assignees: Iterable[Optional[UUID]]):
+        """Drop cached reads affected by writes to tasks."""
+        assignees = {u for u in assignees if u}
+        await DashboardCache.invalidate_users(assignees)
+        await response_cache.invalidate(
+            "tasks",
+            *{f"task:{t}" for t in task_ids},
+            *{f"project:{p}:tasks" for p in project_ids},
+            *{f"user:{u}:tasks" for u in assignees}
+        )
+
+    @staticmethod
+    def _status_times(status, started_at=None, completed_at=None) -> dict:
+        """Transition timestamps for a task that is now in `status`.
+
+        `started_at` is set on the first move to in_progress and kept after
+        that; `completed_at` is set on the move to done and cleared when the
+        task leaves done.
+        """
+        status = TaskStatus(status or TaskStatus.todo)
+        now = utcnow()
+        if started_at is None and status == TaskStatus.in_progress:
+            started_at = now
+        completed_at = (completed_at or now) if status == TaskStatus.done else None
+        return {"started_at": started_at, "completed_at": completed_at}
+
+    @staticmethod
+    def _status_time_values(status) -> dict:
+        """`_status_times` as UPDATE values, for rows whose current times are not loaded."""
+        status = TaskStatus(status)
+        now = utcnow()
+        values = {"completed_at": func.coalesce(Task.completed_at, now) if status == TaskStatus.done else None}
+        if status == TaskStatus.in_progress:
+            values["started_at"] = func.coalesce(Task.started_at, now)
+        return values
+
+    @staticmethod
+    def _stamp_status(task: Task):
+        for key, value in TaskService._status_times(task.status, task.started_at, task.completed_at).items():
+            setattr(task, key, value)
+
+    @staticmethod
+    def _record_events(db: AsyncSession, event_type: str, task, before=None):
+        """Queue websocket events for a created/updated task in the outbox.
+
+        `before` is the counter snapshot taken before the change; a status
+        change also emits `task_moved` on the kanban channel.
+        """
+        users = {task.assigned_to, before[1] if before else None} - {None}
+        event = {
+            "type": event_type,
+            "project_id": task.project_id,
+            "user_ids": list(users),
+            "topics": task_topics(users),
+            "task": TaskResponse.model_validate(task),
+        }
+        OutboxService.add(db, "task_updates", event)
+        if before and TaskCounterService.snapshot(task)[2] != before[2]:
+            OutboxService.add(db, "kanban_updates", {**event, "type": "task_moved", "from_status": before[2]})
+
+    @staticmethod
+    def _visible_tasks_query(
         current_user: User,
-        skip: int = 0,
-        limit: int = 100,
         project_id: Optional[UUID] = None,
         status: Optional[str] = None,
         priority: Optional[str] = None,
         assigned_to: Optional[UUID] = None
-    ) -> List[TaskResponse]:
-        query = select(Task).options(selectinload(Task.assignee))
+    ):
+        """Task listing query with the caller's filters and visibility rules."""
+        query = task_response_query()
         if project_id:
             query = query.where(Task.project_id == project_id)
         if status:
@@ -33,32 +131,69 @@ class TaskService:
         # Filter for non-admin users: only tasks assigned to them
         if current_user['role'] != "admin":
             query = query.where(Task.assigned_to == current_user['id'])
+        return query
+
+    @staticmethod
+    async def get_tasks(
+        db: AsyncSession,
+        current_user: User,
+        skip: int = 0,
+        limit: int = 100,
+        project_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        assigned_to: Optional[UUID] = None,
+        cursor: Optional[str] = None
+    ) -> List[TaskResponse]:
+        query = TaskService._visible_tasks_query(current_user, project_id, status, priority, assigned_to)
         
-        query = query.offset(skip).limit(limit)
+        # Keyset pagination when a cursor is given ("" = first page), offset otherwise
+        if cursor is not None:
+            query = apply_keyset(query, Task, cursor, limit)
+        else:
+            query = query.offset(skip).limit(limit)
         result = await db.execute(query)
-        tasks = result.scalars().all()
-        responses = []
-        for t in tasks:
-            response = TaskResponse.from_orm(t)
-            response.assigned_to_name = t.assignee.name if t.assignee else None
-            responses.append(response)
-        return responses
+        return task_list_adapter.validate_python(result.all(), from_attributes=True)
+
+    @staticmethod
+    async def export_tasks(
+        session_factory: Callable[[], AsyncSession],
+        current_user: User,
+        fmt: str = "ndjson",
+        project_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        assigned_to: Optional[UUID] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream every visible task as NDJSON or CSV chunks.
+
+        Rows come from a server-side cursor, EXPORT_CHUNK_SIZE at a time.
+        The generator opens its own session because it runs after the
+        request's dependencies have been closed.
+        """
+        query = (
+            TaskService._visible_tasks_query(current_user, project_id, status, priority, assigned_to)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        )
+        async with session_factory() as db:
+            result = await db.stream(query)
+            async for chunk in encode_rows(result.partitions(), task_list_adapter, TaskResponse, fmt):
+                yield chunk
 
     @staticmethod
     async def get_task(db: AsyncSession, task_id: UUID, current_user: User) -> Optional[TaskResponse]:
-        query = select(Task).options(selectinload(Task.assignee)).where(Task.id == task_id)
+        query = task_response_query().where(Task.id == task_id)
         
         # Filter for non-admin users
         if current_user['role'] != "admin":
             query = query.where(Task.assigned_to == current_user['id'])
         
         result = await db.execute(query)
-        task = result.scalar_one_or_none()
-        if task:
-            response = TaskResponse.from_orm(task)
-            response.assigned_to_name = task.assignee.name if task.assignee else None
-            return response
-        return None
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return TaskResponse.model_validate(row, from_attributes=True)
 
     @staticmethod
     async def create_task(db: AsyncSession, task_data: TaskCreate, current_user: dict) -> TaskResponse:
@@ -89,17 +224,24 @@ class TaskService:
             assigned_to=task_data.assigned_to,
             created_by=current_user['id']
         )
+        TaskService._stamp_status(task)
         db.add(task)
+        await db.flush()
+        await TaskCounterService.apply(db, [], [TaskCounterService.snapshot(task)])
+        TaskService._record_events(db, "task_created", task)
+        ActivityLogService.add(db, current_user, "task_created", "task", task.id, task.project_id)
         await db.commit()
         await db.refresh(task)
-        return TaskResponse.from_orm(task)
+        await TaskService._invalidate_caches([task.id], [task.project_id], [task.assigned_to])
+        return TaskResponse.model_validate(task)
 
     @staticmethod
     async def update_task(db: AsyncSession, task_id: UUID, task_data: TaskUpdate, current_user: User) -> Optional[TaskResponse]:
         from app.models.project import Project
         from fastapi import HTTPException
         
-        query = select(Task).where(Task.id == task_id)
+        # Locked so the counter snapshot below is the state this update replaces
+        query = select(Task).where(Task.id == task_id).with_for_update()
         if current_user['role'] != "admin":
             query = query.where(Task.assigned_to == current_user['id'])
         
@@ -119,16 +261,24 @@ class TaskService:
                 if not assigned_result.scalar_one_or_none():
                     raise HTTPException(status_code=400, detail="Assigned user is not a member of the project")
         
-        for key, value in task_data.dict(exclude_unset=True).items():
+        before = TaskCounterService.snapshot(task)
+        changes = task_data.dict(exclude_unset=True)
+        for key, value in changes.items():
             setattr(task, key, value)
+        TaskService._stamp_status(task)
+        await db.flush()
+        await TaskCounterService.apply(db, [before], [TaskCounterService.snapshot(task)])
+        TaskService._record_events(db, "task_updated", task, before)
+        ActivityLogService.add(db, current_user, "task_updated", "task", task.id, task.project_id, {"changes": changes})
         
         await db.commit()
         await db.refresh(task)
-        return TaskResponse.from_orm(task)
+        await TaskService._invalidate_caches([task.id], [task.project_id], [before[1], task.assigned_to])
+        return TaskResponse.model_validate(task)
 
     @staticmethod
     async def delete_task(db: AsyncSession, task_id: UUID, current_user: User) -> bool:
-        query = select(Task).where(Task.id == task_id)
+        query = select(Task).where(Task.id == task_id).with_for_update()
         if current_user['role'] != "admin":
             query = query.where(Task.assigned_to == current_user['id'])
         
@@ -137,13 +287,28 @@ class TaskService:
         if not task:
             return False
         
-        await db.delete(task)
+        # Only count the delete if this transaction removed the row
+        result = await db.execute(delete(Task).where(Task.id == task.id))
+        if not result.rowcount:
+            await db.rollback()
+            return False
+        await TaskCounterService.apply(db, [TaskCounterService.snapshot(task)], [])
+        users = [task.assigned_to] if task.assigned_to else []
+        OutboxService.add(db, "task_updates", {
+            "type": "task_deleted",
+            "project_id": task.project_id,
+            "user_ids": users,
+            "topics": task_topics(users),
+            "task_id": task.id,
+        })
+        ActivityLogService.add(db, current_user, "task_deleted", "task", task.id, task.project_id)
         await db.commit()
+        await TaskService._invalidate_caches([task.id], [task.project_id], [task.assigned_to])
         return True
 
     @staticmethod
     async def move_task(db: AsyncSession, task_id: UUID, new_status: str, current_user: User) -> Optional[TaskResponse]:
-        query = select(Task).where(Task.id == task_id)
+        query = select(Task).where(Task.id == task_id).with_for_update()
         if current_user['role'] != "admin":
             query = query.where(Task.assigned_to == current_user['id'])
         
@@ -152,7 +317,170 @@ class TaskService:
         if not task:
             return None
         
+        before = TaskCounterService.snapshot(task)
         task.status = new_status
+        TaskService._stamp_status(task)
+        await db.flush()
+        await TaskCounterService.apply(db, [before], [TaskCounterService.snapshot(task)])
+        TaskService._record_events(db, "task_updated", task, before)
+        ActivityLogService.add(
+            db, current_user, "task_moved", "task", task.id, task.project_id,
+            {"from_status": before[2], "to_status": task.status}
+        )
         await db.commit()
         await db.refresh(task)
-        return TaskResponse.from_orm(task)
\ No newline at end of file
+        await TaskService._invalidate_caches([task.id], [task.project_id], [task.assigned_to])
+        return TaskResponse.model_validate(task)
+
+    @staticmethod
+    async def _member_pairs(db: AsyncSession, pairs: Set[Tuple[UUID, UUID]]) -> Set[Tuple[UUID, UUID]]:
+        """Return the (project_id, user_id) pairs that are project memberships, in one query."""
+        if not pairs:
+            return set()
+        result = await db.execute(
+            select(project_members.c.project_id, project_members.c.user_id)
+            .where(tuple_(project_members.c.project_id, project_members.c.user_id).in_(list(pairs)))
+        )
+        return {tuple(row) for row in result.all()}
+
+    @staticmethod
+    async def bulk_create_tasks(db: AsyncSession, items: List[TaskCreate], current_user: dict) -> dict:
+        """Create many tasks with one multi-row INSERT ... RETURNING.
+
+        Membership is checked once per distinct project and (project, assignee)
+        pair. Invalid items are reported in `errors` and skipped; the rest are
+        written in a single transaction.
+        """
+        user_id = UUID(str(current_user['id']))
+        project_ids = {t.project_id for t in items}
+        result = await db.execute(select(Project.id).where(Project.id.in_(project_ids)))
+        existing = set(result.scalars().all())
+        if current_user['role'] == "admin":
+            allowed = existing
+        else:
+            allowed = {p for p, _ in await TaskService._member_pairs(db, {(p, user_id) for p in existing})}
+        assignable = await TaskService._member_pairs(
+            db, {(t.project_id, t.assigned_to) for t in items if t.assigned_to and t.project_id in allowed}
+        )
+        
+        rows, errors = [], []
+        for index, t in enumerate(items):
+            if t.project_id not in existing:
+                errors.append({"index": index, "detail": "Project not found"})
+            elif t.project_id not in allowed:
+                errors.append({"index": index, "detail": "You are not a member of this project"})
+            elif t.assigned_to and (t.project_id, t.assigned_to) not in assignable:
+                errors.append({"index": index, "detail": "Assigned user is not a member of the project"})
+            else:
+                rows.append({
+                    **t.dict(), **TaskService._status_times(t.status), "id": uuid4(), "created_by": user_id
+                })
+        
+        created = []
+        if rows:
+            result = await db.execute(
+                insert(Task.__table__).values(rows).returning(*TASK_ROW_COLUMNS)
+            )
+            by_id = {row.id: row for row in result.all()}
+            created = [by_id[r["id"]] for r in rows]
+            await TaskCounterService.apply(db, [], [TaskCounterService.snapshot(t) for t in created])
+            for t in created:
+                TaskService._record_events(db, "task_created", t)
+                ActivityLogService.add(db, current_user, "task_created", "task", t.id, t.project_id)
+            await db.commit()
+            await TaskService._invalidate_caches(
+                [t.id for t in created], {t.project_id for t in created}, {t.assigned_to for t in created}
+            )
+        
+        return {
+            "tasks": [TaskResponse.model_validate(t) for t in created],
+            "errors": errors
+        }
+
+    @staticmethod
+    async def bulk_update_tasks(db: AsyncSession, items: List[TaskBulkUpdateItem], current_user: dict) -> dict:
+        """Apply many task updates (including status moves) in one transaction.
+
+        Items with identical changes share one UPDATE ... WHERE id IN (...)
+        RETURNING, so moving N cards to one column is a single statement.
+        Same visibility and reassignment rules as `update_task`.
+        """
+        is_admin = current_user['role'] == "admin"
+        # Lock the rows (in id order, so concurrent bulk updates can't
+        # deadlock) for the counter snapshots taken from them
+        query = select(Task.id, Task.project_id, Task.assigned_to, Task.status, Task.priority).where(
+            Task.id.in_({item.id for item in items})
+        ).order_by(Task.id).with_for_update()
+        if not is_admin:
+            query = query.where(Task.assigned_to == current_user['id'])
+        result = await db.execute(query)
+        current = {row.id: row for row in result.all()}
+        
+        reassigned = lambda item: (
+            "assigned_to" in item.model_fields_set
+            and item.assigned_to is not None
+            and item.assigned_to != current[item.id].assigned_to
+        )
+        assignable = set()
+        if is_admin:
+            assignable = await TaskService._member_pairs(
+                db, {(current[i.id].project_id, i.assigned_to) for i in items if i.id in current and reassigned(i)}
+            )
+        
+        groups: Dict[tuple, List[UUID]] = {}
+        order: Dict[UUID, int] = {}
+        errors = []
+        for index, item in enumerate(items):
+            changes = item.dict(exclude_unset=True, exclude={"id"})
+            if item.id in order:
+                errors.append({"index": index, "id": item.id, "detail": "Duplicate task id in request"})
+            elif item.id not in current:
+                errors.append({"index": index, "id": item.id, "detail": "Task not found or access denied"})
+            elif not changes:
+                errors.append({"index": index, "id": item.id, "detail": "No fields to update"})
+            elif reassigned(item) and not is_admin:
+                errors.append({"index": index, "id": item.id, "detail": "Only admins can reassign tasks"})
+            elif reassigned(item) and (current[item.id].project_id, item.assigned_to) not in assignable:
+                errors.append({"index": index, "id": item.id, "detail": "Assigned user is not a member of the project"})
+            else:
+                order[item.id] = index
+                groups.setdefault(tuple(sorted(changes.items())), []).append(item.id)
+        
+        updated = {}
+        changes_by_id = {}
+        for changes, ids in groups.items():
+            values = dict(changes)
+            if values.get("status"):
+                values.update(TaskService._status_time_values(values["status"]))
+            result = await db.execute(
+                update(Task.__table__)
+                .where(Task.id.in_(ids))
+                .values(**values)
+                .returning(*TASK_ROW_COLUMNS)
+            )
+            for row in result.all():
+                updated[row.id] = row
+                changes_by_id[row.id] = dict(changes)
+        
+        if updated:
+            await TaskCounterService.apply(
+                db,
+                [TaskCounterService.snapshot(current[i]) for i in updated],
+                [TaskCounterService.snapshot(t) for t in updated.values()],
+            )
+            for i, t in updated.items():
+                TaskService._record_events(db, "task_updated", t, TaskCounterService.snapshot(current[i]))
+                ActivityLogService.add(
+                    db, current_user, "task_updated", "task", t.id, t.project_id, {"changes": changes_by_id[i]}
+                )
+            await db.commit()
+            await TaskService._invalidate_caches(
+                updated,
+                {t.project_id for t in updated.values()},
+                {current[i].assigned_to for i in updated} | {t.assigned_to for t in updated.values()},
+            )
+        
+        return {
+            "tasks": [TaskResponse.model_validate(updated[i]) for i in sorted(updated, key=order.get)],
+            "errors": errors
+        }
@@ -1,22 +1,53 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, union
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from uuid import UUID
 
+from app.models.project import Project, project_members
+from app.models.task import Task
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.security import hash_password
+from app.core.token_cache import token_cache
+from app.core.pagination import apply_keyset
+from app.core.cache import response_cache
+from app.services.dashboard_cache import DashboardCache
 
 
 class UserService:
     """Service for user-related operations."""
 
+    @staticmethod
+    async def _invalidate_name_caches(db: AsyncSession, user_id: UUID):
+        """Drop cached reads that show the user's name.
+
+        Task reads carry it as `assigned_to_name`, project reads as
+        `creator_name` and member lists per member.
+        """
+        projects = union(
+            select(Project.id).where(Project.created_by == user_id),
+            select(project_members.c.project_id).where(project_members.c.user_id == user_id),
+            select(Task.project_id).where(Task.assigned_to == user_id),
+        )
+        project_ids = list((await db.execute(projects)).scalars().all())
+        result = await db.execute(
+            select(project_members.c.user_id).where(project_members.c.project_id.in_(project_ids))
+        )
+        await DashboardCache.invalidate_users({user_id, *result.scalars().all()})
+        await response_cache.invalidate(
+            "tasks",
+            "projects",
+            f"user:{user_id}:tasks",
+            *[f"project:{p}" for p in project_ids],
+            *[f"project:{p}:tasks" for p in project_ids]
+        )
+
     @staticmethod
     async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         """Create a new user."""
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         
         user = User(
             name=user_data.name,
@@ -50,14 +81,17 @@ class UserService:
         return result.scalar_one_or_none()
 
     @staticmethod
-    async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, search: Optional[str] = None, role: Optional[str] = None) -> List[User]:
-        """Get all users with pagination and optional search and role filter."""
+    async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, search: Optional[str] = None, role: Optional[str] = None, cursor: Optional[str] = None) -> List[User]:
+        """Get all users with offset or keyset pagination and optional search and role filter."""
         query = select(User)
         if search:
             query = query.where(User.name.ilike(f"%{search}%") | User.email.ilike(f"%{search}%"))
         if role:
             query = query.where(User.role == role)
-        query = query.offset(skip).limit(limit)
+        if cursor is not None:
+            query = apply_keyset(query, User, cursor, limit)
+        else:
+            query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return list(result.scalars().all())
 
@@ -69,6 +103,7 @@ class UserService:
         if not user:
             return None
         
+        renamed = user_data.name is not None and user_data.name != user.name
         if user_data.name is not None:
             user.name = user_data.name
         if user_data.email is not None:
@@ -76,11 +111,16 @@ class UserService:
         if user_data.role is not None:
             user.role = user_data.role
         if user_data.password is not None:
-            user.password_hash = get_password_hash(user_data.password)
+            user.password_hash = await hash_password(user_data.password)
         
         try:
             await db.commit()
             await db.refresh(user)
+            # Cached claims carry the old role; force re-verification
+            if user_data.role is not None or user_data.password is not None:
+                await token_cache.revoke_user(user_id)
+            if renamed:
+                await UserService._invalidate_name_caches(db, user_id)
             return user
         except IntegrityError:
             await db.rollback()
@@ -99,4 +139,5 @@ class UserService:
         
         await db.delete(user)
         await db.commit()
+        await token_cache.revoke_user(user_id)
         return True
@@ -1,35 +1,316 @@
-from typing import List, Dict, Any
-from fastapi import WebSocket, WebSocketDisconnect
-from collections import defaultdict
+import asyncio
+import itertools
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from fastapi import WebSocket, status
+from collections import OrderedDict, defaultdict
+
+from app.core.config import settings
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+def entity_key(message: dict) -> Optional[Tuple[Any, Any]]:
+    """(event type, entity id) used to coalesce messages about the same entity."""
+    entity = message.get("task") or message.get("project") or {}
+    entity_id = entity.get("id") or message.get("task_id") or message.get("project_id")
+    if entity_id is None:
+        return None
+    return message.get("type"), entity_id
+
+
+def event_id_key(event_id: Any) -> Tuple[int, int]:
+    """Sortable form of a Redis stream id ("<ms>-<seq>"); ValueError if malformed."""
+    ms, _, seq = str(event_id).partition("-")
+    return int(ms), int(seq or 0)
+
+
+def merge_update(old: dict, new: dict) -> dict:
+    """Collapse two updates to one entity into the latest state.
+
+    A collapsed `task_moved` keeps the first `from_status`, so the client
+    still moves the card out of the column it was in.
+    """
+    if "from_status" in old:
+        return {**new, "from_status": old["from_status"]}
+    return new
+
+
+class ClientConnection:
+    """One websocket with its own bounded outbound queue and writer task.
+
+    Producers only enqueue, so a slow client never delays delivery to the
+    others. When the queue is full the slow-consumer policy decides:
+    `drop_oldest` discards the oldest queued message and `disconnect` closes
+    the socket. `coalesce` keeps at most one queued message per entity (a
+    newer update replaces the queued one in place), so it only has to drop
+    the oldest message once the queue holds that many distinct entities.
+
+    With a `batch_window` (seconds) the writer waits that long after the
+    first queued message and sends everything queued by then as one
+    `{"type": "batch", "events": [...]}` frame, collapsing updates to the
+    same entity to the latest state.
+
+    A connection created with `hold` buffers live messages instead of
+    queueing them until `release` is called with the replayed backlog, so
+    replayed events are delivered first and none is sent twice.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        on_close: Callable[["ClientConnection"], None],
+        max_size: int = None,
+        policy: str = None,
+        batch_window: float = 0,
+        hold: bool = False,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.max_size = max(1, max_size or settings.WS_SEND_QUEUE_SIZE)
+        self.policy = policy or settings.WS_SLOW_CONSUMER_POLICY
+        if self.policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.policy}")
+        self.batch_window = batch_window
+        self._on_close = on_close
+        self._pending: "OrderedDict[int, Tuple[Optional[tuple], dict]]" = OrderedDict()
+        self._by_entity: Dict[tuple, int] = {}
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._closer: Optional[asyncio.Task] = None
+        self._held: Optional[List[dict]] = [] if hold else None
+        self.closed = False
+        self.sent = 0
+        self.frames = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, message: dict) -> bool:
+        """Queue a message for this client; returns False if it was refused."""
+        if self.closed:
+            return False
+        if self._held is not None:
+            self._held.append(message)
+            return True
+        key = entity_key(message) if self.policy == "coalesce" else None
+        if key is not None and key in self._by_entity:
+            # Latest state wins, in the queued message's place
+            seq = self._by_entity[key]
+            self._pending[seq] = (key, merge_update(self._pending[seq][1], message))
+            self.coalesced += 1
+            return True
+        if len(self._pending) >= self.max_size:
+            if self.policy == "disconnect":
+                self.dropped += 1
+                self.close(status.WS_1013_TRY_AGAIN_LATER)
+                return False
+            self._pop()
+            self.dropped += 1
+        seq = next(self._seq)
+        self._pending[seq] = (key, message)
+        if key is not None:
+            self._by_entity[key] = seq
+        self._ready.set()
+        return True
+
+    def release(self, replayed: List[dict]):
+        """Queue the replayed messages, then the live ones held meanwhile.
+
+        A held message already covered by the replay (same or older event
+        id) is skipped.
+        """
+        held, self._held = self._held or [], None
+        last = max((event_id_key(m["event_id"]) for m in replayed if "event_id" in m), default=None)
+        for message in replayed:
+            self.enqueue(message)
+        for message in held:
+            if last is not None and "event_id" in message and event_id_key(message["event_id"]) <= last:
+                continue
+            self.enqueue(message)
+
+    def _pop(self) -> dict:
+        _, (key, message) = self._pending.popitem(last=False)
+        if key is not None:
+            self._by_entity.pop(key, None)
+        return message
+
+    def _pop_batch(self) -> List[dict]:
+        """Take everything queued, one event per entity, in first-seen order."""
+        batch: "OrderedDict[Any, dict]" = OrderedDict()
+        while self._pending:
+            seq = next(iter(self._pending))
+            message = self._pop()
+            key = entity_key(message) or seq
+            if key in batch:
+                batch[key] = merge_update(batch[key], message)
+                self.coalesced += 1
+            else:
+                batch[key] = message
+        return list(batch.values())
+
+    async def _write_loop(self):
+        try:
+            while True:
+                if not self._pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                if self.batch_window > 0:
+                    await asyncio.sleep(self.batch_window)
+                    events = self._pop_batch()
+                    await self.websocket.send_json({"type": "batch", "events": events})
+                    self.sent += len(events)
+                else:
+                    await self.websocket.send_json(self._pop())
+                    self.sent += 1
+                self.frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sending message to {self.user_id}: {e}")
+            # Deregister, then close the socket so the endpoint's receive
+            # loop ends and the rest of the disconnect runs
+            self.close()
+            await self._close_socket(status.WS_1011_INTERNAL_ERROR)
+
+    def close(self, code: Optional[int] = None):
+        """Stop the writer and deregister; with `code`, also close the socket."""
+        if self.closed:
+            return
+        self.closed = True
+        self._pending.clear()
+        self._by_entity.clear()
+        self._held = None
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        if code is not None:
+            # Kept so the task is not garbage-collected before it runs
+            self._closer = asyncio.create_task(self._close_socket(code))
+        self._on_close(self)
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "user_id": self.user_id,
+            "depth": self.depth,
+            "sent": self.sent,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
 
 class ConnectionManager:
+    """In-memory routing table of this worker's websocket connections.
+
+    A user can hold several sockets (tabs, devices); each is tracked
+    separately so closing one does not drop the others. Topics map to sets
+    of user ids, with a reverse index so a user's subscriptions are dropped
+    in O(their topics) when their last socket closes.
+    """
+
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.topic_subscribers: Dict[str, List[str]] = defaultdict(list)
+        self.active_connections: Dict[str, Dict[WebSocket, ClientConnection]] = defaultdict(dict)
+        self.topic_subscribers: Dict[str, Set[str]] = defaultdict(set)
+        self.user_topics: Dict[str, Set[str]] = defaultdict(set)
+        # Totals from connections that have already closed
+        self.closed_totals = {"sent": 0, "frames": 0, "dropped": 0, "coalesced": 0, "slow_disconnects": 0}
 
-    async def connect(self, websocket: WebSocket, user_id: str):
+    async def connect(
+        self, websocket: WebSocket, user_id: str, batch_window: float = 0, hold: bool = False
+    ) -> ClientConnection:
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        connection = ClientConnection(
+            websocket, user_id, on_close=self._remove, batch_window=batch_window, hold=hold
+        )
+        self.active_connections[user_id][websocket] = connection
+        connection.start()
+        return connection
+
+    def disconnect(self, websocket: WebSocket, user_id: str):
+        connection = self.active_connections.get(user_id, {}).get(websocket)
+        if connection is not None:
+            connection.close()
+
+    def _remove(self, connection: ClientConnection):
+        for key in ("sent", "frames", "dropped", "coalesced"):
+            self.closed_totals[key] += getattr(connection, key)
+        if connection.policy == "disconnect" and connection.dropped:
+            self.closed_totals["slow_disconnects"] += 1
 
-    def disconnect(self, user_id: str):
-        if user_id in self.active_connections:
+        user_id = connection.user_id
+        sockets = self.active_connections.get(user_id)
+        if sockets is None:
+            return
+        sockets.pop(connection.websocket, None)
+        if not sockets:
             del self.active_connections[user_id]
+            for topic in list(self.user_topics.get(user_id, ())):
+                self.unsubscribe(user_id, topic)
 
-    async def send_message(self, user_id: str, message: str):
-        websocket = self.active_connections.get(user_id)
-        if websocket:
-            await websocket.send_text(message)
+    def user_connections(self, user_id: str) -> List[ClientConnection]:
+        return list(self.active_connections.get(user_id, {}).values())
 
-    async def broadcast(self, message: str, topic: str):
-        for user_id in self.topic_subscribers[topic]:
-            websocket = self.active_connections.get(user_id)
-            if websocket:
-                await websocket.send_text(message)
+    def all_connections(self) -> Iterator[ClientConnection]:
+        for sockets in list(self.active_connections.values()):
+            yield from list(sockets.values())
+
+    def connection_count(self) -> int:
+        return sum(len(sockets) for sockets in self.active_connections.values())
 
     def subscribe(self, user_id: str, topic: str):
-        if user_id not in self.topic_subscribers[topic]:
-            self.topic_subscribers[topic].append(user_id)
+        self.topic_subscribers[topic].add(user_id)
+        self.user_topics[user_id].add(topic)
 
     def unsubscribe(self, user_id: str, topic: str):
-        if user_id in self.topic_subscribers[topic]:
-            self.topic_subscribers[topic].remove(user_id)
\ No newline at end of file
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(user_id)
+            if not subscribers:
+                del self.topic_subscribers[topic]
+        topics = self.user_topics.get(user_id)
+        if topics is not None:
+            topics.discard(topic)
+            if not topics:
+                del self.user_topics[user_id]
+
+    def drop_topic(self, topic: str):
+        for user_id in list(self.topic_subscribers.get(topic, ())):
+            self.unsubscribe(user_id, topic)
+
+    def topic_connections(self, topics: Iterable[str]) -> List[ClientConnection]:
+        """Connections of every user subscribed to any of the topics, each once."""
+        users = set()
+        for topic in topics:
+            users |= self.topic_subscribers.get(topic, set())
+        return [c for user_id in users for c in self.active_connections.get(user_id, {}).values()]
+
+    def stats(self, top: int = 20) -> dict:
+        """Queue depth and drop counters, with the `top` deepest connections."""
+        connections = list(self.all_connections())
+        totals = dict(self.closed_totals)
+        for key in ("sent", "frames", "dropped", "coalesced"):
+            totals[key] += sum(getattr(c, key) for c in connections)
+        deepest = sorted(connections, key=lambda c: c.depth, reverse=True)[:top]
+        return {
+            "connections": len(connections),
+            "queued": sum(c.depth for c in connections),
+            "max_depth": deepest[0].depth if deepest else 0,
+            "policy": settings.WS_SLOW_CONSUMER_POLICY,
+            "queue_size": settings.WS_SEND_QUEUE_SIZE,
+            **totals,
+            "deepest": [c.stats() for c in deepest],
+        }
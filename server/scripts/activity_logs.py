@@ -0,0 +1,45 @@
+"""Maintain the partitioned activity log: create partitions or purge old entries.
+
+`partitions` creates the monthly partitions through
+ACTIVITY_LOG_PARTITIONS_AHEAD months ahead (the API's writer also does this
+daily). `purge` drops whole partitions older than the retention and deletes
+the remaining old rows in batches; run it from cron, e.g. nightly.
+
+Usage (from server/):
+    python -m scripts.activity_logs partitions
+    python -m scripts.activity_logs purge --days 365
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal, engine
+from app.services.activity_log_service import ActivityLogService
+
+
+async def main(args) -> int:
+    async with AsyncSessionLocal() as db:
+        if args.command == "partitions":
+            result = await ActivityLogService.ensure_partitions(db, args.months_ahead)
+            if result["moved_rows"]:
+                print(f"📦 Moved {result['moved_rows']} row(s) out of the default partition")
+            print(f"✅ Partitions present: {', '.join(result['partitions'])}")
+        else:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+            result = await ActivityLogService.purge(db, cutoff, args.batch_size)
+            for name in result["dropped_partitions"]:
+                print(f"🗑️  Dropped {name}")
+            print(f"✅ Purged entries before {cutoff:%Y-%m-%d}: {result['deleted_rows']} row(s) deleted in batches")
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["partitions", "purge"])
+    parser.add_argument("--days", type=int, default=settings.ACTIVITY_LOG_RETENTION_DAYS, help="retention for purge")
+    parser.add_argument("--batch-size", type=int, default=settings.ACTIVITY_LOG_PURGE_BATCH_SIZE)
+    parser.add_argument("--months-ahead", type=int, default=settings.ACTIVITY_LOG_PARTITIONS_AHEAD)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,98 @@
+"""Microbenchmark the auth dependency with and without the token cache.
+
+Calls `get_current_user` directly with a signed access token, first with the
+verified-token cache disabled (full `jwt.decode` per call) and then enabled.
+
+By default Redis is not connected, so revocation checks are local. With
+--redis the same pair is repeated against REDIS_URL with the revocation feed
+in sync, followed by a cached run with the feed stopped, where every check
+reads the revocation records from Redis.
+
+Usage (from server/):
+    python -m scripts.auth_benchmark --calls 50000
+    python -m scripts.auth_benchmark --calls 50000 --redis
+"""
+import argparse
+import asyncio
+import sys
+import time
+from uuid import uuid4
+
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from app.core.redis import redis_client
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.dependencies import get_current_user
+
+
+async def run(label: str, calls: int, tokens: list) -> float:
+    credentials = [HTTPAuthorizationCredentials(scheme="Bearer", credentials=t) for t in tokens]
+    started = time.perf_counter()
+    for i in range(calls):
+        request = Request({"type": "http", "headers": []})
+        await get_current_user(request, credentials[i % len(credentials)])
+    elapsed = time.perf_counter() - started
+    print(f"{label:>9}: {calls / elapsed:10.0f} calls/s  {elapsed / calls * 1e6:7.1f} µs/call")
+    return elapsed
+
+
+async def compare(label: str, calls: int, tokens: list) -> float:
+    """Run without and then with the cache; return the cached time."""
+    max_size = token_cache.max_size
+    token_cache.max_size = 0
+    uncached = await run("no cache", calls, tokens)
+
+    token_cache.max_size = max_size
+    token_cache.clear()
+    cached = await run("cache", calls, tokens)
+    print(f"{label} speedup: {uncached / cached:.1f}x  {token_cache.stats()}")
+    return cached
+
+
+async def main(args) -> int:
+    tokens = [
+        create_access_token({"id": str(uuid4()), "email": f"bench{i}@example.com", "role": "member"})
+        for i in range(args.users)
+    ]
+    print("local (no Redis):")
+    await compare("local", args.calls, tokens)
+    if not args.redis:
+        return 0
+
+    await redis_client.connect()
+    try:
+        try:
+            await redis_client.redis.ping()
+        except Exception as e:
+            print(f"Redis is not reachable: {e}")
+            return 1
+        await token_cache.start()
+        for _ in range(50):
+            if token_cache.in_sync:
+                break
+            await asyncio.sleep(0.1)
+        else:
+            print("revocation feed did not sync")
+            return 1
+        print("redis, feed in sync:")
+        cached = await compare("redis", args.calls, tokens)
+
+        await token_cache.stop()
+        token_cache.clear()
+        print("redis, feed down:")
+        direct = await run("cache", args.calls, tokens)
+        print(f"per-request Redis check costs {direct / cached:.1f}x  {token_cache.stats()}")
+    finally:
+        await token_cache.stop()
+        await redis_client.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=100, help="distinct tokens to rotate through")
+    parser.add_argument("--redis", action="store_true", help="also run with REDIS_URL connected")
+    sys.exit(asyncio.run(main(parser.parse_args())))
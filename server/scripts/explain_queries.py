@@ -0,0 +1,182 @@
+"""Run EXPLAIN over the service-layer queries against a seeded dataset.
+
+Seeds users, projects, memberships and tasks inside a transaction on the
+configured DATABASE_URL, calls the real service methods while capturing the
+SQL they emit, EXPLAINs each statement and rolls everything back. Exits
+non-zero when a hot table is read with a sequential scan, so index
+regressions show up in CI.
+
+Usage (from server/, against a migrated database):
+    python -m scripts.explain_queries --tasks 100000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine, init_db
+from app.models.project import Project, project_members
+from app.models.task import Task
+from app.models.user import User
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from app.services.search_service import SearchService
+
+# Tables that must never be sequentially scanned by the hot queries
+WATCHED_TABLES = {"tasks", "project_members"}
+
+
+async def seed(conn, users: int, projects: int, tasks: int, members_per_project: int):
+    """Insert a synthetic dataset and return (admin, member, project_id)."""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+
+    user_rows = [
+        {
+            "id": uuid4(),
+            "name": f"User {i}",
+            "email": f"explain-{i}-{uuid4().hex[:8]}@example.com",
+            "password_hash": "x",
+            "role": "admin" if i == 0 else "member",
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        }
+        for i in range(users)
+    ]
+    await conn.execute(insert(User.__table__), user_rows)
+    admin = user_rows[0]
+
+    project_rows = [
+        {
+            "id": uuid4(),
+            "name": f"Project {i}",
+            "description": f"Seeded project {i}",
+            "status": "in_progress",
+            "created_by": admin["id"],
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        }
+        for i in range(projects)
+    ]
+    await conn.execute(insert(Project.__table__), project_rows)
+
+    members = {}
+    member_rows = []
+    for p in project_rows:
+        chosen = rng.sample(user_rows[1:], min(members_per_project, users - 1))
+        members[p["id"]] = chosen
+        member_rows.extend({"project_id": p["id"], "user_id": u["id"]} for u in chosen)
+    await conn.execute(insert(project_members), member_rows)
+
+    statuses = ["todo", "in_progress", "done"]
+    priorities = ["low", "medium", "high"]
+    batch = []
+    for i in range(tasks):
+        p = rng.choice(project_rows)
+        batch.append({
+            "id": uuid4(),
+            "title": f"Task {i}",
+            "description": None,
+            "status": rng.choice(statuses),
+            "priority": rng.choice(priorities),
+            "project_id": p["id"],
+            "assigned_to": rng.choice(members[p["id"]])["id"],
+            "created_by": admin["id"],
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+        })
+        if len(batch) == 5000:
+            await conn.execute(insert(Task.__table__), batch)
+            batch = []
+    if batch:
+        await conn.execute(insert(Task.__table__), batch)
+
+    for table in ("users", "projects", "project_members", "tasks"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+    project_id = project_rows[0]["id"]
+    member = members[project_id][0]
+    as_user = lambda u: {"id": str(u["id"]), "email": u["email"], "role": u["role"]}
+    return as_user(admin), as_user(member), project_id
+
+
+def scans(plan: dict):
+    """Yield (node type, relation) for every scan node in a JSON plan tree."""
+    if "Relation Name" in plan:
+        yield plan["Node Type"], plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from scans(child)
+
+
+async def main(args) -> int:
+    await init_db()
+
+    captured = []
+    capturing = False
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((label, statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+    failures = 0
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            admin, member, project_id = await seed(
+                conn, args.users, args.projects, args.tasks, args.members_per_project
+            )
+            db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+
+            cases = [
+                ("tasks: admin, first keyset page", TaskService.get_tasks(db, admin, cursor="")),
+                ("tasks: member, own tasks", TaskService.get_tasks(db, member, cursor="")),
+                ("tasks: member, by status", TaskService.get_tasks(db, member, status="todo")),
+                ("tasks: project board", TaskService.get_tasks(db, admin, project_id=project_id, status="in_progress")),
+                ("projects: member list", ProjectService.get_projects(db, member, cursor="")),
+                ("projects: member get", ProjectService.get_project(db, project_id, member)),
+                ("projects: progress", ProjectService.get_project_progress(db, project_id, member)),
+                ("projects: members", ProjectService.get_project_members(db, project_id, member)),
+                ("search: admin, tasks", SearchService.search(db, admin, "task 4213", type="task")),
+                ("search: member, everything", SearchService.search(db, member, "task 42")),
+            ]
+            for label, call in cases:
+                capturing = True
+                await call
+                capturing = False
+
+            for label, statement, parameters in captured:
+                result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                plan = result.scalar()
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+                seq = [rel for node, rel in scans(plan) if node == "Seq Scan" and rel in WATCHED_TABLES]
+                marker = "FAIL" if seq else "ok  "
+                print(f"{marker} {label}: cost={plan['Total Cost']} scans={sorted(set(r for _, r in scans(plan)))}")
+                if seq:
+                    failures += 1
+                    print(f"     seq scan on {', '.join(sorted(set(seq)))}")
+                    if args.verbose:
+                        print("     " + statement.replace("\n", "\n     "))
+        finally:
+            await trans.rollback()
+
+    await engine.dispose()
+    print(f"\n{len(captured)} statements explained, {failures} regression(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--members-per-project", type=int, default=15)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,132 @@
+"""Measure websocket fan-out latency with many simulated clients.
+
+Registers fake websocket connections with the notification service, spread
+round-robin over --projects project topics, and times how long messages for
+one project take to reach each of its members. By default
+messages are handed straight to the dispatcher; with --redis they are
+appended to the Redis event stream and travel through the worker's shared
+stream reader, which needs a reachable REDIS_URL.
+
+`--legacy` additionally simulates the previous design: one polling loop per
+client that sleeps 100ms between reads.
+
+Usage (from server/):
+    python -m scripts.fanout_benchmark --clients 5000 --messages 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from app.core.redis import redis_client
+from app.services.notification_service import NotificationService, project_topic
+
+
+class FakeWebSocket:
+    """Records the delivery latency of every message it receives."""
+
+    def __init__(self, latencies: list):
+        self.latencies = latencies
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message: dict):
+        self.latencies.append(time.perf_counter() - message["sent_at"])
+
+
+def report(label: str, latencies: list, expected: int, elapsed: float):
+    latencies = sorted(latencies)
+    q = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    print(
+        f"{label:>8}: delivered {len(latencies)}/{expected} in {elapsed:.2f}s "
+        f"({len(latencies) / elapsed:,.0f} msg/s)  p50={q(0.5):.1f}ms  p99={q(0.99):.1f}ms  "
+        f"max={latencies[-1] * 1000:.1f}ms  mean={statistics.mean(latencies) * 1000:.1f}ms"
+    )
+
+
+async def wait_for(latencies: list, expected: int, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while len(latencies) < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def run_shared(args) -> list:
+    service = NotificationService()
+    latencies = []
+    for i in range(args.clients):
+        user_id = f"user-{i}"
+        await service.manager.connect(FakeWebSocket(latencies), user_id)
+        service.manager.subscribe(user_id, project_topic(i % args.projects))
+    members = len(service.manager.topic_subscribers[project_topic(0)])
+
+    if args.redis:
+        await redis_client.connect()
+        await service.start()
+        await asyncio.sleep(0.5)  # let the reader start tailing the stream
+
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        message = {"type": "task_updated", "project_id": 0, "sent_at": time.perf_counter()}
+        if args.redis:
+            await service.publish_notification("task_updates", message)
+        else:
+            await service.dispatch("task_updates", message)
+        await asyncio.sleep(args.interval)
+    await wait_for(latencies, members * args.messages)
+    elapsed = time.perf_counter() - started
+
+    if args.redis:
+        await service.stop()
+        await redis_client.disconnect()
+    report("shared", latencies, members * args.messages, elapsed)
+    return latencies
+
+
+async def run_legacy(args) -> list:
+    """One queue and polling loop per client, as the old listener did."""
+    latencies = []
+    queues = [asyncio.Queue() for _ in range(args.clients)]
+
+    async def client(queue: asyncio.Queue, websocket: FakeWebSocket):
+        while True:
+            while not queue.empty():
+                await websocket.send_json(queue.get_nowait())
+            await asyncio.sleep(0.1)
+
+    tasks = [asyncio.create_task(client(q, FakeWebSocket(latencies))) for q in queues]
+    started = time.perf_counter()
+    for _ in range(args.messages):
+        message = {"type": "task_updated", "sent_at": time.perf_counter()}
+        for queue in queues:
+            queue.put_nowait(message)
+        await asyncio.sleep(args.interval)
+    await wait_for(latencies, args.clients * args.messages)
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    report("legacy", latencies, args.clients * args.messages, elapsed)
+    return latencies
+
+
+async def main(args) -> int:
+    print(
+        f"clients={args.clients} projects={args.projects} messages={args.messages} "
+        f"interval={args.interval * 1000:.0f}ms"
+    )
+    await run_shared(args)
+    if args.legacy:
+        await run_legacy(args)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=1, help="project topics to spread clients over")
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.02, help="seconds between published messages")
+    parser.add_argument("--redis", action="store_true", help="publish through the Redis stream and the shared reader")
+    parser.add_argument("--legacy", action="store_true", help="also simulate one polling loop per client")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,113 @@
+"""Measure task listing throughput: ORM loading vs column projection.
+
+The legacy path loads full Task rows plus their assignees with
+`selectinload` and builds each response with `TaskResponse.from_orm`. The
+projected path is `TaskService.get_tasks`: only response columns, the
+assignee name joined in SQL and one `TypeAdapter` validation for the page.
+
+By default only the Python side is measured, on --rows synthetic rows. With
+--db both paths list up to --rows existing tasks (as an admin) from
+DATABASE_URL, so the query and transfer are included.
+
+Usage (from server/):
+    python -m scripts.list_benchmark --rows 10000
+    python -m scripts.list_benchmark --rows 10000 --db
+"""
+import argparse
+import asyncio
+import sys
+import time
+import warnings
+from collections import namedtuple
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.database import AsyncSessionLocal
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskResponse
+from app.services.task_service import TASK_RESPONSE_COLUMNS, TaskService, task_list_adapter
+
+ADMIN = {"id": str(uuid4()), "email": "bench@example.com", "role": "admin"}
+
+
+def legacy_responses(tasks) -> list:
+    responses = []
+    for t in tasks:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            response = TaskResponse.from_orm(t)
+        response.assigned_to_name = t.assignee.name if t.assignee else None
+        responses.append(response)
+    return responses
+
+
+def synthetic(rows: int):
+    """The same data as ORM objects (with assignees) and as projected rows."""
+    Row = namedtuple("Row", [c.key for c in TASK_RESPONSE_COLUMNS])
+    now = datetime.now(timezone.utc)
+    users = [User(id=uuid4(), name=f"User {i}", email=f"u{i}@example.com", password_hash="x" * 60) for i in range(50)]
+    tasks, projected = [], []
+    for i in range(rows):
+        user = users[i % len(users)]
+        task = Task(
+            id=uuid4(), title=f"Task {i}", description="Benchmark task", status="todo", priority="medium",
+            deadline=None, project_id=uuid4(), assigned_to=user.id, created_at=now, updated_at=now,
+        )
+        task.assignee = user
+        tasks.append(task)
+        projected.append(Row(
+            task.id, task.title, task.description, task.priority, task.status, task.deadline,
+            task.project_id, task.assigned_to, user.name, task.created_at, task.updated_at,
+        ))
+    return tasks, projected
+
+
+async def legacy_query(rows: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Task).options(selectinload(Task.assignee)).limit(rows))
+        return legacy_responses(result.scalars().all())
+
+
+async def projected_query(rows: int) -> list:
+    async with AsyncSessionLocal() as db:
+        return await TaskService.get_tasks(db, current_user=ADMIN, limit=rows)
+
+
+async def timed(label: str, repeat: int, fn) -> float:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            result = await result
+        best = min(best, time.perf_counter() - started)
+        count = len(result)
+    print(f"{label:>10}: {count} rows in {best * 1000:8.1f}ms  {count / best:12,.0f} rows/s")
+    return best
+
+
+async def main(args) -> int:
+    print(f"rows={args.rows} repeat={args.repeat} mode={'db' if args.db else 'serialization'}")
+    if args.db:
+        before = await timed("legacy", args.repeat, lambda: legacy_query(args.rows))
+        after = await timed("projected", args.repeat, lambda: projected_query(args.rows))
+    else:
+        tasks, projected = synthetic(args.rows)
+        before = await timed("legacy", args.repeat, lambda: legacy_responses(tasks))
+        after = await timed(
+            "projected", args.repeat, lambda: task_list_adapter.validate_python(projected, from_attributes=True)
+        )
+    print(f"speedup: {before / after:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path; the best is reported")
+    parser.add_argument("--db", action="store_true", help="query DATABASE_URL instead of synthetic rows")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,107 @@
+"""Measure login throughput and event-loop stalls caused by bcrypt.
+
+Without --url, runs password verification in-process twice: inline on the
+event loop (the old behaviour) and through the bcrypt thread pool. A ticker
+task measures how long the loop is blocked in each mode.
+
+With --url, fires concurrent logins at a running server instead:
+    python -m scripts.login_benchmark --url http://localhost:8000 \\
+        --email admin@example.com --password secret --requests 200
+
+Usage (from server/):
+    python -m scripts.login_benchmark --logins 64 --concurrency 16
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import get_password_hash, pwd_context, verify_and_update_password
+
+
+async def ticker(stop: asyncio.Event, interval: float = 0.005):
+    """Return the worst delay between scheduled and actual wakeups."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_local(mode: str, hashed: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                pwd_context.verify("benchmark-password", hashed)
+            else:
+                await verify_and_update_password("benchmark-password", hashed)
+
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(ticker(stop))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    stall = await watcher
+    print(f"{mode:>6}: {logins / elapsed:8.1f} logins/s  total={elapsed:.2f}s  max loop stall={stall * 1000:.0f}ms")
+
+
+async def run_remote(args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, failures = [], 0
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        async def login():
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/auth/login", json={"email": args.email, "password": args.password}
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(
+        f"{args.requests / elapsed:.1f} logins/s  p50={p(0.5):.0f}ms  p95={p(0.95):.0f}ms  "
+        f"p99={p(0.99):.0f}ms  failures={failures}"
+    )
+    return 1 if failures else 0
+
+
+async def main(args) -> int:
+    if args.url:
+        return await run_remote(args)
+
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS} pool={settings.PASSWORD_HASH_CONCURRENCY} "
+        f"logins={args.logins} concurrency={args.concurrency}"
+    )
+    hashed = get_password_hash("benchmark-password")
+    for mode in ("inline", "pool"):
+        await run_local(mode, hashed, args.logins, args.concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--url", help="benchmark a running server instead of in-process hashing")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--requests", type=int, default=200)
+    sys.exit(asyncio.run(main(parser.parse_args())))
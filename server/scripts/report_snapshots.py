@@ -0,0 +1,36 @@
+"""Take the daily report snapshot behind the burndown and cycle-time reports.
+
+Records today's per-project status counts and recomputes the per-assignee
+cycle times of tasks completed in the last --cycle-days days. The API takes
+it every REPORT_SNAPSHOT_INTERVAL seconds; with the interval set to 0, run
+this from cron instead, e.g. hourly and at 23:59 UTC. A large --cycle-days
+backfills cycle times after the upgrade; status history starts with the
+first snapshot.
+
+Usage (from server/):
+    python -m scripts.report_snapshots
+    python -m scripts.report_snapshots --cycle-days 365
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database import AsyncSessionLocal, engine
+from app.services.report_service import ReportService
+
+
+async def main(args) -> int:
+    async with AsyncSessionLocal() as db:
+        result = await ReportService.take_snapshot(db, args.cycle_days)
+    print(
+        f"✅ Snapshot for {result['day']}: {result['project_status_rows']} project status row(s), "
+        f"{result['cycle_time_rows']} cycle time row(s) over {args.cycle_days} day(s)"
+    )
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycle-days", type=int, default=2, help="days of cycle times to recompute")
+    sys.exit(asyncio.run(main(parser.parse_args())))
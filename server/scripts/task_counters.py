@@ -0,0 +1,35 @@
+"""Rebuild or verify the denormalized task counter tables.
+
+Usage (from server/):
+    python -m scripts.task_counters verify
+    python -m scripts.task_counters rebuild
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database import AsyncSessionLocal, engine
+from app.services.task_counter_service import TaskCounterService
+
+
+async def main(args) -> int:
+    async with AsyncSessionLocal() as db:
+        if args.command == "rebuild":
+            await TaskCounterService.rebuild(db)
+            await db.commit()
+            print("✅ Task counters rebuilt")
+            status = 0
+        else:
+            problems = await TaskCounterService.verify(db)
+            for problem in problems:
+                print(f"❌ {problem}")
+            print(f"{len(problems)} mismatched counter(s)")
+            status = 1 if problems else 0
+    await engine.dispose()
+    return status
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    sys.exit(asyncio.run(main(parser.parse_args())))
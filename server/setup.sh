@@ -101,7 +101,6 @@ fi
 echo ""
 echo "📊 Database migrations..."
 echo "After setting up PostgreSQL, run:"
-echo "  alembic revision --autogenerate -m 'Initial migration'"
 echo "  alembic upgrade head"
 
 echo ""
@@ -1,8 +1,20 @@
+from uuid import uuid4
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
 from pytest import fixture
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, insert, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
-from app.database import Base
-from app.config import DATABASE_URL
+from app.database import Base, AsyncSessionLocal, engine, init_db
+from app.core.config import settings
+from app.models.project import Project, project_members
+from app.models.task import Task
+from app.models.user import User
+from app.services.task_counter_service import TaskCounterService
+
+DATABASE_URL = settings.DATABASE_URL
 
 @fixture(scope='session')
 def db_engine():
@@ -22,4 +34,61 @@ def db_session(db_engine):
 
     session.close()
     transaction.rollback()
-    connection.close()
\ No newline at end of file
+    connection.close()
+
+
+@pytest_asyncio.fixture
+async def pg():
+    """Session factory on DATABASE_URL migrated to head; skips without PostgreSQL.
+
+    Sessions commit for real (concurrency tests need separate transactions),
+    so tests clean up what they create; see `seed`.
+    """
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL not available at DATABASE_URL: {e}")
+    await init_db()
+    yield AsyncSessionLocal
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+def _claims(user: User) -> dict:
+    return {"id": str(user.id), "email": user.email, "role": user.role}
+
+
+@pytest_asyncio.fixture
+async def seed(pg):
+    """An admin, two members and a project with the first member; removed afterwards."""
+    tag = uuid4().hex[:8]
+    admin = User(id=uuid4(), name=f"Admin {tag}", email=f"admin-{tag}@example.com", password_hash="x", role="admin")
+    member = User(id=uuid4(), name=f"Member {tag}", email=f"member-{tag}@example.com", password_hash="x", role="member")
+    outsider = User(id=uuid4(), name=f"Outsider {tag}", email=f"outsider-{tag}@example.com", password_hash="x", role="member")
+    project = Project(id=uuid4(), name=f"Seed project {tag}", created_by=admin.id)
+    async with pg() as db:
+        db.add_all([admin, member, outsider])
+        await db.flush()
+        db.add(project)
+        await db.flush()
+        await db.execute(insert(project_members).values(project_id=project.id, user_id=member.id))
+        await db.commit()
+
+    yield SimpleNamespace(
+        tag=tag,
+        admin=_claims(admin),
+        member=_claims(member),
+        outsider=_claims(outsider),
+        project_id=project.id,
+        user_ids=[admin.id, member.id, outsider.id],
+    )
+
+    async with pg() as db:
+        await TaskCounterService.remove_project(db, project.id)
+        await db.execute(delete(Task).where(Task.project_id == project.id))
+        await db.execute(delete(project_members).where(project_members.c.project_id == project.id))
+        await db.execute(delete(Project).where(Project.id == project.id))
+        await db.execute(delete(User).where(User.id.in_([admin.id, member.id, outsider.id])))
+        await db.commit()
@@ -0,0 +1,89 @@
+from uuid import uuid4
+
+import pytest
+
+from app.models.enums import TaskStatus
+from app.schemas.task import TaskBulkUpdateItem, TaskCreate
+from app.services.task_service import TaskService
+
+
+def _details(result) -> dict:
+    return {e["index"]: e["detail"] for e in result["errors"]}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_invalid_items_and_writes_the_rest(pg, seed):
+    items = [
+        TaskCreate(title="Valid", project_id=seed.project_id, assigned_to=seed.member["id"]),
+        TaskCreate(title="No project", project_id=uuid4()),
+        TaskCreate(title="Outsider assignee", project_id=seed.project_id, assigned_to=seed.outsider["id"]),
+        TaskCreate(title="Also valid", project_id=seed.project_id),
+    ]
+    async with pg() as db:
+        result = await TaskService.bulk_create_tasks(db, items, seed.member)
+
+    assert [t.title for t in result["tasks"]] == ["Valid", "Also valid"]
+    assert _details(result) == {
+        1: "Project not found",
+        2: "Assigned user is not a member of the project",
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_non_member(pg, seed):
+    async with pg() as db:
+        result = await TaskService.bulk_create_tasks(
+            db, [TaskCreate(title="Not mine", project_id=seed.project_id)], seed.outsider
+        )
+
+    assert result["tasks"] == []
+    assert _details(result) == {0: "You are not a member of this project"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_reports_invalid_items_and_applies_the_rest(pg, seed):
+    async with pg() as db:
+        created = await TaskService.bulk_create_tasks(db, [
+            TaskCreate(title="First", project_id=seed.project_id, assigned_to=seed.member["id"]),
+            TaskCreate(title="Second", project_id=seed.project_id, assigned_to=seed.member["id"]),
+        ], seed.admin)
+    first, second = (t.id for t in created["tasks"])
+
+    items = [
+        TaskBulkUpdateItem(id=first, status=TaskStatus.done),
+        TaskBulkUpdateItem(id=first, status=TaskStatus.in_progress),
+        TaskBulkUpdateItem(id=uuid4(), status=TaskStatus.done),
+        TaskBulkUpdateItem(id=second),
+        TaskBulkUpdateItem(id=second, assigned_to=seed.outsider["id"]),
+    ]
+    async with pg() as db:
+        result = await TaskService.bulk_update_tasks(db, items, seed.admin)
+
+    assert [(t.id, t.status) for t in result["tasks"]] == [(first, TaskStatus.done)]
+    assert _details(result) == {
+        1: "Duplicate task id in request",
+        2: "Task not found or access denied",
+        3: "No fields to update",
+        4: "Assigned user is not a member of the project",
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_members_cannot_reassign(pg, seed):
+    async with pg() as db:
+        created = await TaskService.bulk_create_tasks(db, [
+            TaskCreate(title="Mine", project_id=seed.project_id, assigned_to=seed.member["id"]),
+        ], seed.admin)
+    task_id = created["tasks"][0].id
+
+    async with pg() as db:
+        result = await TaskService.bulk_update_tasks(db, [
+            TaskBulkUpdateItem(id=task_id, assigned_to=seed.admin["id"]),
+            TaskBulkUpdateItem(id=uuid4(), title="Someone else's"),
+        ], seed.member)
+
+    assert result["tasks"] == []
+    assert _details(result) == {
+        0: "Only admins can reassign tasks",
+        1: "Task not found or access denied",
+    }
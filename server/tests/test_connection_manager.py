@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from fastapi import status
+
+from app.websockets.connection_manager import ClientConnection, ConnectionManager
+
+
+class _FakeWebSocket:
+    """Records frames; `stalled` holds every send until it is set."""
+
+    def __init__(self, fail: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self.fail = fail
+        self.stalled = asyncio.Event()
+        self.stalled.set()
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        await self.stalled.wait()
+        if self.fail:
+            raise RuntimeError("connection reset")
+        self.sent.append(message)
+
+    async def close(self, code: int):
+        self.closed_with = code
+
+
+def _task_moved(task_id, to, frm):
+    return {"type": "task_moved", "task": {"id": task_id, "status": to}, "from_status": frm}
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _queued(policy, max_size, messages, batch_window=0):
+    """A connection whose writer is stalled after it has taken one message."""
+    websocket = _FakeWebSocket()
+    websocket.stalled.clear()
+    closed = []
+    connection = ClientConnection(
+        websocket, "u1", on_close=closed.append, max_size=max_size, policy=policy, batch_window=batch_window
+    )
+    connection.start()
+    connection.enqueue({"type": "ping", "n": 0})
+    await _drain()
+    for message in messages:
+        connection.enqueue(message)
+    return connection, websocket, closed
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_newest_messages():
+    connection, websocket, _ = await _queued("drop_oldest", 2, [{"type": "ping", "n": n} for n in (1, 2, 3)])
+    websocket.stalled.set()
+    await _drain()
+
+    assert [m["n"] for m in websocket.sent] == [0, 2, 3]
+    assert connection.dropped == 1
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_replaces_queued_update_in_place():
+    connection, websocket, _ = await _queued("coalesce", 2, [
+        _task_moved("a", "in_progress", "todo"),
+        {"type": "ping", "n": 1},
+        _task_moved("a", "done", "in_progress"),
+    ])
+    websocket.stalled.set()
+    await _drain()
+
+    assert websocket.sent[1:] == [_task_moved("a", "done", "todo"), {"type": "ping", "n": 1}]
+    assert (connection.coalesced, connection.dropped) == (1, 0)
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_slow_consumer():
+    connection, websocket, closed = await _queued("disconnect", 1, [{"type": "ping", "n": n} for n in (1, 2)])
+    await _drain()
+
+    assert connection.closed and closed == [connection]
+    assert connection._closer is not None and connection._closer.done()
+    assert websocket.closed_with == status.WS_1013_TRY_AGAIN_LATER
+    assert not connection.enqueue({"type": "ping", "n": 3})
+
+
+@pytest.mark.asyncio
+async def test_batch_window_sends_one_frame_per_window():
+    websocket = _FakeWebSocket()
+    connection = ClientConnection(websocket, "u1", on_close=lambda c: None, batch_window=0.01)
+    connection.start()
+    connection.enqueue(_task_moved("a", "in_progress", "todo"))
+    connection.enqueue(_task_moved("a", "done", "in_progress"))
+    connection.enqueue({"type": "ping"})
+    await asyncio.sleep(0.05)
+
+    assert websocket.sent == [{"type": "batch", "events": [_task_moved("a", "done", "todo"), {"type": "ping"}]}]
+    assert (connection.frames, connection.sent) == (1, 2)
+    connection.close()
+
+
+@pytest.mark.asyncio
+async def test_send_failure_closes_socket_and_unregisters():
+    manager = ConnectionManager()
+    websocket = _FakeWebSocket(fail=True)
+    connection = await manager.connect(websocket, "u1")
+    manager.subscribe("u1", "project:p1")
+
+    connection.enqueue({"type": "ping"})
+    await _drain()
+
+    assert connection.closed
+    assert websocket.closed_with == status.WS_1011_INTERNAL_ERROR
+    assert manager.connection_count() == 0
+    assert manager.topic_connections(["project:p1"]) == []
+    assert "u1" not in manager.user_topics
+
+
+@pytest.mark.asyncio
+async def test_release_skips_held_messages_covered_by_replay():
+    websocket = _FakeWebSocket()
+    connection = ClientConnection(websocket, "u1", on_close=lambda c: None, hold=True)
+    connection.start()
+    connection.enqueue({"type": "ping", "event_id": "5-0"})
+    connection.enqueue({"type": "ping", "event_id": "7-0"})
+
+    connection.release([{"type": "ping", "event_id": "4-0"}, {"type": "ping", "event_id": "5-0"}])
+    await _drain()
+
+    assert [m["event_id"] for m in websocket.sent] == ["4-0", "5-0", "7-0"]
+    connection.close()
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        ClientConnection(None, "u1", on_close=lambda c: None, policy="block")
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.database import InstrumentedAsyncQueuePool
+
+
+class _Connection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _pool(**kwargs) -> InstrumentedAsyncQueuePool:
+    return InstrumentedAsyncQueuePool(_Connection, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_opening_connections_is_not_a_wait():
+    def checkout():
+        pool = _pool(pool_size=2, max_overflow=1)
+        connections = [pool.connect() for _ in range(3)]
+        for connection in connections:
+            connection.close()
+        return pool.snapshot()
+
+    snapshot = await greenlet_spawn(checkout)
+
+    assert snapshot["checkouts"] == 3
+    assert snapshot["waits"] == 0
+    assert snapshot["avg_wait_ms"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_records_wait_and_timeout():
+    def checkout():
+        pool = _pool(pool_size=1, max_overflow=0, timeout=0.05)
+        held = pool.connect()
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+        held.close()
+        return pool.snapshot()
+
+    snapshot = await greenlet_spawn(checkout)
+
+    assert (snapshot["checkouts"], snapshot["waits"], snapshot["timeouts"]) == (2, 1, 1)
+    assert snapshot["max_wait_ms"] >= 40
+    assert snapshot["wait_histogram"]["le_100ms"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_ends_when_a_connection_is_returned():
+    pool = _pool(pool_size=1, max_overflow=0, timeout=5)
+    held = await greenlet_spawn(pool.connect)
+
+    async def release_later():
+        await asyncio.sleep(0.03)
+        await greenlet_spawn(held.close)
+
+    waiter = asyncio.ensure_future(greenlet_spawn(pool.connect))
+    await release_later()
+    connection = await waiter
+    await greenlet_spawn(connection.close)
+
+    snapshot = pool.snapshot()
+    assert snapshot["waits"] == 1 and snapshot["timeouts"] == 0
+    assert 20 <= snapshot["max_wait_ms"] < 1000
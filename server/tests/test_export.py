@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from datetime import date
+from types import SimpleNamespace
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.export import encode_rows
+from app.models.enums import TaskStatus
+
+
+class Row(BaseModel):
+    id: UUID
+    title: str
+    status: TaskStatus
+    deadline: Optional[date] = None
+
+
+adapter = TypeAdapter(List[Row])
+
+
+async def _partitions(*partitions):
+    for rows in partitions:
+        yield rows
+
+
+async def _collect(chunks) -> List[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+def _rows(n, start=0):
+    return [
+        SimpleNamespace(id=uuid4(), title=f'Task {i}, "quoted"', status=TaskStatus.todo, deadline=date(2026, 1, i + 1))
+        for i in range(start, start + n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_one_chunk_per_partition():
+    first, second = _rows(2), _rows(1, start=2)
+
+    chunks = await _collect(encode_rows(_partitions(first, second), adapter, Row, "ndjson"))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": str(r.id), "title": r.title, "status": "todo", "deadline": r.deadline.isoformat()}
+        for r in first + second
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_header_then_rows_with_quoting():
+    rows = _rows(3)
+
+    chunks = await _collect(encode_rows(_partitions(rows[:2], rows[2:]), adapter, Row, "csv"))
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith(b"id,title,status,deadline\r\n")
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert parsed[0] == ["id", "title", "status", "deadline"]
+    assert parsed[1:] == [[str(r.id), r.title, "todo", r.deadline.isoformat()] for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_csv_without_rows_is_just_the_header():
+    chunks = await _collect(encode_rows(_partitions(), adapter, Row, "csv"))
+
+    assert chunks == [b"id,title,status,deadline\r\n"]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_without_rows_is_empty():
+    assert await _collect(encode_rows(_partitions(), adapter, Row, "ndjson")) == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_row_raises():
+    bad = [SimpleNamespace(id="not-a-uuid", title="x", status="todo", deadline=None)]
+
+    with pytest.raises(ValueError):
+        await _collect(encode_rows(_partitions(bad), adapter, Row, "ndjson"))
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.models.enums import TaskPriority, TaskStatus
+from app.services.notification_service import (
+    ADMIN_TOPIC, NotificationService, project_topic, user_topic,
+)
+from app.services.task_service import TaskService
+
+
+class _OutboxSession:
+    """Stands in for AsyncSession; keeps the outbox payloads added to it."""
+
+    def __init__(self):
+        self.info = {}
+        self.payloads = []
+
+    def add(self, event):
+        self.payloads.append(event.payload)
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+def _task(project_id, assigned_to, status=TaskStatus.done):
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=uuid4(), title="Private", description="Only for the assignee", priority=TaskPriority.medium,
+        status=status, deadline=None, project_id=project_id, assigned_to=assigned_to,
+        assigned_to_name=None, created_at=now, updated_at=now,
+    )
+
+
+def test_task_events_address_assignees_and_admins_only():
+    project_id, old, new = uuid4(), uuid4(), uuid4()
+    task = _task(project_id, new)
+    db = _OutboxSession()
+
+    TaskService._record_events(db, "task_updated", task, (project_id, old, TaskStatus.todo, TaskPriority.medium))
+
+    assert [p["type"] for p in db.payloads] == ["task_updated", "task_moved"]
+    for payload in db.payloads:
+        assert NotificationService.topics_for(payload) == {ADMIN_TOPIC, user_topic(old), user_topic(new)}
+
+
+def test_unassigned_task_events_reach_admins_only():
+    db = _OutboxSession()
+
+    TaskService._record_events(db, "task_created", _task(uuid4(), None))
+
+    assert NotificationService.topics_for(db.payloads[0]) == {ADMIN_TOPIC}
+
+
+@pytest.mark.asyncio
+async def test_project_members_do_not_receive_other_members_tasks():
+    project_id, assignee, member, admin = uuid4(), str(uuid4()), str(uuid4()), str(uuid4())
+    service = NotificationService()
+    sockets = {}
+    for user_id, topics in [
+        (assignee, [user_topic(assignee), project_topic(project_id)]),
+        (member, [user_topic(member), project_topic(project_id)]),
+        (admin, [user_topic(admin), ADMIN_TOPIC]),
+    ]:
+        sockets[user_id] = _FakeWebSocket()
+        await service.manager.connect(sockets[user_id], user_id)
+        for topic in topics:
+            service.manager.subscribe(user_id, topic)
+    db = _OutboxSession()
+    TaskService._record_events(db, "task_created", _task(project_id, assignee))
+
+    await service.dispatch("task_updates", db.payloads[0])
+    await asyncio.sleep(0)
+
+    assert [len(sockets[u].sent) for u in (assignee, member, admin)] == [1, 0, 1]
+    for connection in list(service.manager.all_connections()):
+        connection.close()
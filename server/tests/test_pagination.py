@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import (
+    apply_keyset, decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor,
+    next_cursor, next_rank_cursor,
+)
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+from app.services.task_service import TaskService
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 18, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    id = uuid4()
+    cursor = encode_cursor(created_at, id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, id)
+
+
+def test_rank_cursor_round_trip():
+    id = uuid4()
+    assert decode_rank_cursor(encode_rank_cursor(0.25, "task", id)) == (0.25, "task", id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WzFd", encode_rank_cursor(0.5, "task", uuid4())])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid cursor"
+
+
+def test_decode_rank_cursor_rejects_malformed():
+    with pytest.raises(HTTPException):
+        decode_rank_cursor(encode_cursor(datetime.now(timezone.utc), uuid4()))
+
+
+def test_apply_keyset_first_page_only_orders():
+    sql = _sql(apply_keyset(select(Task.id), Task, None, 20))
+    assert "ORDER BY tasks.created_at, tasks.id" in sql
+    assert "LIMIT" in sql
+    assert "WHERE" not in sql
+
+
+def test_apply_keyset_seeks_past_cursor():
+    created_at, id = datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4()
+    query = apply_keyset(select(Task.id), Task, encode_cursor(created_at, id), 20)
+    sql = _sql(query)
+    assert "(tasks.created_at, tasks.id) > (" in sql
+    assert "ORDER BY tasks.created_at, tasks.id" in sql
+    params = query.compile(dialect=postgresql.dialect()).params
+    assert created_at in params.values() and id in params.values()
+
+
+def test_next_cursor_points_at_last_item_of_full_page():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = [SimpleNamespace(created_at=start + timedelta(seconds=i), id=uuid4()) for i in range(3)]
+    assert decode_cursor(next_cursor(items, 3)) == (items[-1].created_at, items[-1].id)
+    assert next_cursor(items, 4) is None
+    assert next_cursor([], 3) is None
+
+
+def test_next_rank_cursor():
+    items = [SimpleNamespace(rank=0.9, type="project", id=uuid4()), SimpleNamespace(rank=0.4, type="task", id=uuid4())]
+    assert decode_rank_cursor(next_rank_cursor(items, 2)) == (0.4, "task", items[-1].id)
+    assert next_rank_cursor(items, 3) is None
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_break_ties_by_id(pg, seed):
+    async with pg() as db:
+        for i in range(5):
+            await TaskService.create_task(db, TaskCreate(title=f"Page {i}", project_id=seed.project_id), seed.admin)
+        # Same created_at everywhere, so only the id orders the pages
+        await db.execute(
+            update(Task).where(Task.project_id == seed.project_id).values(created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        )
+        await db.commit()
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            page = await TaskService.get_tasks(db, seed.admin, limit=2, project_id=seed.project_id, cursor=cursor)
+            seen += [t.id for t in page]
+            cursor = next_cursor(page, 2)
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
@@ -0,0 +1,56 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.models.project import project_members
+from app.services.project_service import ProjectService
+
+
+async def _member_ids(pg, project_id) -> set:
+    async with pg() as db:
+        result = await db.execute(select(project_members.c.user_id).where(project_members.c.project_id == project_id))
+        return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_add_members_requires_admin():
+    with pytest.raises(HTTPException) as exc:
+        await ProjectService.add_members(None, uuid4(), [uuid4()], {"id": str(uuid4()), "role": "member"})
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_add_members_splits_added_existing_and_unknown(pg, seed):
+    member, outsider, unknown = seed.user_ids[1], seed.user_ids[2], uuid4()
+    async with pg() as db:
+        result = await ProjectService.add_members(
+            db, seed.project_id, [member, outsider, outsider, unknown], seed.admin
+        )
+
+    assert result == {"added": [outsider], "already_members": [member], "not_found": [unknown]}
+    assert await _member_ids(pg, seed.project_id) == {member, outsider}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_add_members_insert_once(pg, seed):
+    outsider = seed.user_ids[2]
+
+    async def add():
+        async with pg() as db:
+            return await ProjectService.add_members(db, seed.project_id, [outsider], seed.admin)
+
+    results = await asyncio.gather(add(), add())
+
+    # ON CONFLICT DO NOTHING: the loser reports the row as already there
+    assert sorted(r["added"] for r in results) == [[], [outsider]]
+    assert sorted(r["already_members"] for r in results) == [[], [outsider]]
+    assert await _member_ids(pg, seed.project_id) == {seed.user_ids[1], outsider}
+
+
+@pytest.mark.asyncio
+async def test_add_members_unknown_project(pg, seed):
+    async with pg() as db:
+        assert await ProjectService.add_members(db, uuid4(), [seed.user_ids[1]], seed.admin) is None
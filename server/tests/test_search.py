@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.pagination import next_rank_cursor
+from app.schemas.task import TaskCreate
+from app.services.search_service import SearchService, contains_pattern, prefix_tsquery
+from app.services.task_service import TaskService
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("api ref", "api:* & ref:*"),
+    ("  API   Ref ", "api:* & ref:*"),
+    ("fix: a & b | !c", "fix:* & a:* & b:* & c:*"),
+    ("it's", "it:* & s:*"),
+    ("", None),
+    ("!&|:*()", None),
+])
+def test_prefix_tsquery_keeps_words_only(q, expected):
+    assert prefix_tsquery(q) == expected
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("report", "%report%"),
+    ("50%", "%50\\%%"),
+    ("snake_case", "%snake\\_case%"),
+    ("C:\\temp", "%C:\\\\temp%"),
+    ("\\%_", "%\\\\\\%\\_%"),
+])
+def test_contains_pattern_escapes_wildcards(q, expected):
+    assert contains_pattern(q) == expected
+
+
+@pytest.mark.asyncio
+async def test_search_without_usable_terms_skips_the_database():
+    assert await SearchService.search(None, {"id": str(uuid4()), "role": "member"}, "?!") == []
+
+
+def test_member_queries_are_scoped():
+    member = {"id": str(uuid4()), "role": "member"}
+    admin = {"id": str(uuid4()), "role": "admin"}
+
+    assert "tasks.assigned_to =" in _sql(SearchService._task_query(member, "roadmap", "roadmap:*"))
+    assert "tasks.assigned_to" not in _sql(SearchService._task_query(admin, "roadmap", "roadmap:*"))
+    assert "project_members" in _sql(SearchService._project_query(member, "roadmap", "roadmap:*"))
+    assert "project_members" in _sql(SearchService._user_query(member, "roadmap", "roadmap:*"))
+    assert "project_members" not in _sql(SearchService._user_query(admin, "roadmap", "roadmap:*"))
+
+
+def test_short_query_uses_full_text_only():
+    sql = _sql(SearchService._task_query({"id": "x", "role": "admin"}, "ab", "ab:*"))
+    assert "@@" in sql
+    assert "ILIKE" not in sql
+    assert SearchService._user_query({"id": "x", "role": "admin"}, "ab", "ab:*") is None
+
+
+async def _search(pg, current_user, q) -> set:
+    async with pg() as db:
+        results = await SearchService.search(db, current_user, q, limit=50)
+    return {(r.type, r.title) for r in results}
+
+
+@pytest.mark.asyncio
+async def test_search_respects_visibility(pg, seed):
+    async with pg() as db:
+        for title, assignee in [("Mine", seed.member["id"]), ("Unassigned", None)]:
+            await TaskService.create_task(
+                db, TaskCreate(title=f"{title} {seed.tag}", project_id=seed.project_id, assigned_to=assignee), seed.admin
+            )
+    project = ("project", f"Seed project {seed.tag}")
+    tasks = {("task", f"Mine {seed.tag}"), ("task", f"Unassigned {seed.tag}")}
+    users = {("user", f"{role} {seed.tag}") for role in ("Admin", "Member", "Outsider")}
+
+    assert await _search(pg, seed.admin, seed.tag) == {project} | tasks | users
+    assert await _search(pg, seed.member, seed.tag) == {project, ("task", f"Mine {seed.tag}"), ("user", f"Member {seed.tag}")}
+    assert await _search(pg, seed.outsider, seed.tag) == set()
+
+
+@pytest.mark.asyncio
+async def test_search_pages_do_not_overlap(pg, seed):
+    async with pg() as db:
+        for i in range(5):
+            await TaskService.create_task(
+                db, TaskCreate(title=f"Paged {seed.tag} {i}", project_id=seed.project_id), seed.admin
+            )
+
+    seen, cursor = [], None
+    async with pg() as db:
+        while True:
+            page = await SearchService.search(db, seed.admin, f"Paged {seed.tag}", type="task", limit=2, cursor=cursor)
+            seen += [r.id for r in page]
+            if len(page) < 2:
+                break
+            cursor = next_rank_cursor(page, 2)
+
+    assert len(seen) == len(set(seen)) == 5
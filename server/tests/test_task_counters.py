@@ -0,0 +1,150 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.task_counter import ProjectStatusCount
+from app.schemas.task import TaskCreate
+from app.services.task_counter_service import TaskCounterService
+from app.services.task_service import TaskService
+
+
+async def _drift(pg, seed) -> list:
+    """Counter problems that concern the seeded project or users."""
+    async with pg() as db:
+        problems = await TaskCounterService.verify(db)
+    ours = [str(seed.project_id)] + [str(u) for u in seed.user_ids]
+    return [p for p in problems if any(key in p for key in ours)]
+
+
+async def _create_task(pg, seed, status="todo"):
+    async with pg() as db:
+        return await TaskService.create_task(
+            db,
+            TaskCreate(title="Counted task", project_id=seed.project_id, assigned_to=seed.member["id"], status=status),
+            seed.admin,
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_moves_keep_counters_exact(pg, seed):
+    task = await _create_task(pg, seed)
+
+    async def move(status):
+        async with pg() as db:
+            return await TaskService.move_task(db, task.id, status, seed.admin)
+
+    await asyncio.gather(move("in_progress"), move("done"))
+
+    assert await _drift(pg, seed) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_deletes_count_once(pg, seed):
+    task = await _create_task(pg, seed, status="in_progress")
+
+    async def remove():
+        async with pg() as db:
+            return await TaskService.delete_task(db, task.id, seed.admin)
+
+    results = await asyncio.gather(remove(), remove())
+
+    assert sorted(results) == [False, True]
+    assert await _drift(pg, seed) == []
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession; keeps the statements `apply` issues."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+def _upserts(session) -> dict:
+    """{table: {counter key: delta}} from the recorded multi-row upserts."""
+    tables = {}
+    for stmt in session.statements:
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        columns = [c for c in ("project_id", "user_id") if f"{c}_m0" in params]
+        dimension = "status" if "status_m0" in params else "priority"
+        rows = {}
+        i = 0
+        while f"count_m{i}" in params:
+            rows[(params[f"{columns[0]}_m{i}"], params[f"{dimension}_m{i}"])] = params[f"count_m{i}"]
+            i += 1
+        tables[stmt.table.name] = rows
+    return tables
+
+
+@pytest.mark.asyncio
+async def test_apply_moves_counts_between_states():
+    project_id, user_id = uuid4(), uuid4()
+    before = (project_id, user_id, TaskStatus.todo, TaskPriority.high)
+    after = (project_id, user_id, TaskStatus.done, TaskPriority.high)
+    session = _RecordingSession()
+
+    await TaskCounterService.apply(session, [before], [after])
+
+    tables = _upserts(session)
+    # Priority did not change, so its table is not touched
+    assert set(tables) == {"task_counts_project_status", "task_counts_assignee_status"}
+    assert tables["task_counts_project_status"] == {
+        (project_id, TaskStatus.done): 1, (project_id, TaskStatus.todo): -1,
+    }
+    assert tables["task_counts_assignee_status"] == {
+        (user_id, TaskStatus.done): 1, (user_id, TaskStatus.todo): -1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_apply_aggregates_inserts_and_skips_unassigned():
+    project_id, user_id = uuid4(), uuid4()
+    keys = [
+        (project_id, user_id, TaskStatus.todo, TaskPriority.low),
+        (project_id, user_id, TaskStatus.todo, TaskPriority.low),
+        (project_id, None, TaskStatus.todo, TaskPriority.low),
+    ]
+    session = _RecordingSession()
+
+    await TaskCounterService.apply(session, [], keys)
+
+    tables = _upserts(session)
+    assert tables["task_counts_project_status"] == {(project_id, TaskStatus.todo): 3}
+    assert tables["task_counts_assignee_status"] == {(user_id, TaskStatus.todo): 2}
+    assert tables["task_counts_assignee_priority"] == {(user_id, TaskPriority.low): 2}
+
+
+@pytest.mark.asyncio
+async def test_apply_without_net_change_issues_nothing():
+    key = (uuid4(), uuid4(), TaskStatus.in_progress, TaskPriority.medium)
+    session = _RecordingSession()
+
+    await TaskCounterService.apply(session, [key], [key])
+
+    assert session.statements == []
+
+
+@pytest.mark.asyncio
+async def test_verify_reports_drift_and_rebuild_repairs_it(pg, seed):
+    await _create_task(pg, seed)
+    async with pg() as db:
+        await db.execute(
+            update(ProjectStatusCount)
+            .where(ProjectStatusCount.project_id == seed.project_id, ProjectStatusCount.status == TaskStatus.todo)
+            .values(count=5)
+        )
+        await db.commit()
+
+    assert await _drift(pg, seed) == [f"task_counts_project_status {seed.project_id}/todo: stored 5, actual 1"]
+
+    async with pg() as db:
+        await TaskCounterService.rebuild(db)
+        await db.commit()
+
+    assert await _drift(pg, seed) == []
@@ -0,0 +1,248 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from app import dependencies
+from app.core.redis import redis_client
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import TokenCache
+from app.dependencies import authenticate_token
+
+
+def _claims(user_id: str, ttl: float = 60) -> dict:
+    return {"id": user_id, "email": f"{user_id}@example.com", "role": "member", "exp": time.time() + ttl}
+
+
+class _FakeRedis:
+    """The commands the revocation records and feed use; `commands` logs each one."""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = []
+        self.commands = []
+        self.down = False
+
+    async def mget(self, *keys):
+        self.commands.append("mget")
+        if self.down:
+            raise ConnectionError("redis is down")
+        return [self.values.get(k) for k in keys]
+
+    async def scan_iter(self, match, count=None):
+        self.commands.append("scan")
+        for key in list(self.values):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return _FakePubSub(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append(lambda: self.redis.values.__setitem__(key, value))
+
+    def publish(self, channel, data):
+        self.ops.append(lambda: [q.put_nowait({"type": "message", "data": data}) for q in self.redis.subscribers])
+
+    async def execute(self):
+        self.redis.commands.append("pipeline")
+        for op in self.ops:
+            op()
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self.queue)
+
+    async def get_message(self, timeout=None):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.redis.subscribers.remove(self.queue)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(redis_client, "redis", fake)
+    return fake
+
+
+@pytest_asyncio.fixture
+async def shared_cache(monkeypatch, fake_redis):
+    """This worker's cache, listening to the revocation feed."""
+    cache = TokenCache(16)
+    monkeypatch.setattr(dependencies, "token_cache", cache)
+    await cache.start()
+    await _drain()
+    assert cache.in_sync
+    yield cache
+    await cache.stop()
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _token(user_id: str = "u1", role: str = "member") -> str:
+    return create_access_token({"id": user_id, "email": f"{user_id}@example.com", "role": role})
+
+
+def test_get_returns_cached_claims_until_exp(monkeypatch):
+    cache = TokenCache(4)
+    claims = _claims("u1", ttl=10)
+    cache.put("t1", claims)
+
+    assert cache.get("t1") == claims
+    monkeypatch.setattr(time, "time", lambda: claims["exp"] + 1)
+    assert cache.get("t1") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_put_without_exp_or_size_is_ignored():
+    cache = TokenCache(4)
+    cache.put("t1", {"id": "u1"})
+    assert cache.get("t1") is None
+
+    disabled = TokenCache(0)
+    disabled.put("t1", _claims("u1"))
+    assert disabled.get("t1") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TokenCache(2)
+    cache.put("t1", _claims("u1"))
+    cache.put("t2", _claims("u2"))
+    cache.get("t1")
+    cache.put("t3", _claims("u3"))
+
+    assert cache.get("t2") is None
+    assert cache.get("t1") is not None
+    assert cache.get("t3") is not None
+    assert "u2" not in cache._by_user
+
+
+@pytest.mark.asyncio
+async def test_revoke_user_evicts_every_token_of_the_user():
+    cache = TokenCache(4)
+    cache.put("a", _claims("u1"))
+    cache.put("b", _claims("u1"))
+    cache.put("c", _claims("u2"))
+
+    await cache.revoke_user("u1")
+
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_stay_in_process_while_in_sync(fake_redis, shared_cache):
+    token = _token()
+    fake_redis.commands.clear()
+
+    for _ in range(3):
+        assert await authenticate_token(token) is not None
+
+    assert fake_redis.commands == []
+    assert shared_cache.stats()["revocation_feed"] == "in_sync"
+
+
+@pytest.mark.asyncio
+async def test_revoked_user_is_rejected_by_every_worker(fake_redis, shared_cache):
+    token = _token()
+    assert await authenticate_token(token) is not None
+
+    # Another worker revokes; the feed evicts this worker's cached claims
+    await TokenCache(16).revoke_user("u1")
+    await _drain()
+
+    assert shared_cache.get(token) is None
+    assert await authenticate_token(token) is None
+    # Tokens issued after the revocation are accepted
+    assert await authenticate_token(_token(role="admin")) is not None
+    assert "mget" not in fake_redis.commands
+
+
+@pytest.mark.asyncio
+async def test_logged_out_token_is_denied_until_exp(fake_redis, shared_cache):
+    token, other = _token(), _token()
+    await TokenCache(16).revoke_token(token, decode_token(token))
+    await _drain()
+
+    assert await authenticate_token(token) is None
+    assert await authenticate_token(other) is not None
+
+
+@pytest.mark.asyncio
+async def test_sync_loads_revocations_made_before_subscribing(fake_redis):
+    token = _token()
+    await TokenCache(16).revoke_user("u1")
+    await TokenCache(16).revoke_token(_token("u2"), decode_token(_token("u2")))
+    cache = TokenCache(16)
+
+    await cache.sync()
+
+    assert await cache.is_revoked(token, decode_token(token))
+    assert cache.stats()["revoked_users"] == 1 and cache.stats()["denied_tokens"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_is_asked_while_the_feed_is_down(fake_redis, monkeypatch):
+    cache = TokenCache(16)
+    monkeypatch.setattr(dependencies, "token_cache", cache)
+    token = _token()
+    await TokenCache(16).revoke_user("u1")
+
+    assert await authenticate_token(token) is None
+    assert cache.stats()["revocation_feed"] == "down"
+    assert cache.direct_checks == 1
+
+
+@pytest.mark.asyncio
+async def test_token_is_refused_when_redis_cannot_answer(fake_redis, monkeypatch):
+    monkeypatch.setattr(dependencies, "token_cache", TokenCache(16))
+    fake_redis.down = True
+
+    assert await authenticate_token(_token()) is None
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_iat_count_as_issued_at_epoch():
+    cache = TokenCache(4)
+    claims = _claims("u1")
+    assert not await cache.is_revoked("t1", claims)
+    await cache.revoke_user("u1")
+    assert await cache.is_revoked("t1", claims)
+
+
+@pytest.mark.asyncio
+async def test_revocation_is_local_without_redis(monkeypatch):
+    monkeypatch.setattr(redis_client, "redis", None)
+    cache = TokenCache(4)
+    token = _token()
+    cache.put(token, decode_token(token))
+
+    await cache.revoke_user("u1")
+
+    assert cache.get(token) is None
+    assert await cache.is_revoked(token, decode_token(token))
+    assert cache.stats()["revocation_feed"] == "local"